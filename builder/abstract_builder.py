@@ -25,3 +25,9 @@ class AbstractBuilder:
 
     def produce_network(self):
         return self._graph.get_network()
+
+    def _view(self,graph):
+        # Views built mutable for post-processing are frozen afterwards when requested.
+        if self._graph.frozen_views:
+            return graph.freeze()
+        return graph
@@ -3,11 +3,13 @@ from rdflib import URIRef
 from graphs.knowledge_graph import KnowledgeGraph
 from builder.abstract_builder import AbstractBuilder
 from util.kg_identifiers import identifiers
+from util.names import get_name
 
 class KnowledgeBuilder(AbstractBuilder):
-    def __init__(self,graph):
+    def __init__(self,graph,frozen_views=False,literals_as_attributes=False):
         super().__init__()
-        self._graph = KnowledgeGraph(graph)
+        self._graph = KnowledgeGraph(graph,literals_as_attributes)
+        self._graph.frozen_views = frozen_views
 
     def produce_synonym_graph(self):
         synonym_edges = []
@@ -30,7 +32,7 @@ class KnowledgeBuilder(AbstractBuilder):
             n_id,n_data = n
             v_id,v_data = v
             key = (n_data["key"],e[1],v_data["key"])
-            edge = {"weight" : 1 ,"display_name": self.graph._get_name(e[1])}
+            edge = {"weight" : 1 ,"display_name": get_name(e[1])}
             interaction_edges.append((n_id,v_id,e))
             node_attrs[n_id] = n_data
             node_attrs[v_id] = v_data
@@ -40,53 +42,59 @@ class KnowledgeBuilder(AbstractBuilder):
     def produce_interaction_type_graph(self):
         interaction_edges = []
         node_attrs = {}
-        for n in self._graph.get_descriptors():
-            n_id,n_data = n
-            subjects = self._graph.get_subjects(n_id)
-            objects = self._graph.get_objects(n_id)
+        subject_pred = identifiers.predicates.interaction_subject
+        object_pred = identifiers.predicates.interaction_object
+        descriptors = self._graph.get_descriptors()
+        d_ids = [n_id for n_id,n_data in descriptors]
+        subjects = self._graph.get_batch_subjects(d_ids)
+        objects = self._graph.get_batch_objects(d_ids)
+        for n_id,n_data in descriptors:
             node_attrs[n_id] = n_data
-            for n1,v1,e1 in subjects:
-                v1_id,v1_data = v1
+            for v1_id,v1_data in subjects[n_id]:
                 node_attrs[v1_id] = v1_data
-                key = (n_data["key"],e1[1],v1_data["key"])
-                edge = {"weight" : 1,"display_name" : self._graph._get_name(e1[1])}
+                key = (n_data["key"],subject_pred,v1_data["key"])
+                edge = {"weight" : 1,"display_name" : get_name(subject_pred)}
                 interaction_edges.append((v1_id,n_id,key,edge))
-            for n2,v2,e1 in objects:
-                v2_id,v2_data = v2
+            for v2_id,v2_data in objects[n_id]:
                 node_attrs[v2_id] = v2_data
-                key = (n_data["key"],e1[1],v2_data["key"])
-                edge = {"weight" : 1,"display_name" : self._graph._get_name(e1[1])}
+                key = (n_data["key"],object_pred,v2_data["key"])
+                edge = {"weight" : 1,"display_name" : get_name(object_pred)}
                 interaction_edges.append((n_id,v2_id,key,edge))
-        interaction_graph = self._graph.sub_graph(interaction_edges,node_attrs)
+        interaction_graph = self._graph.sub_graph(interaction_edges,node_attrs,frozen=False)
         interaction_graph = self._swap_labels(interaction_graph)
         return interaction_graph
 
     def produce_entity_graph(self):
         entity_edges = []
         node_attrs = {}
-        for n in self._graph.get_entities():
-            n_id,n_data = n
+        entities = self._graph.get_entities()
+        e_ids = [n_id for n_id,n_data in entities]
+        descriptors = self._graph.get_batch_descriptors(e_ids)
+        aliases = self._graph.get_batch_aliases(e_ids)
+        for n_id,n_data in entities:
             node_attrs[n_id] = n_data
 
-            for v1_id,v1_data in self._graph.get_descriptors(n_id):
+            for v1_id,v1_data in descriptors[n_id]:
                 key = (n_data["key"],identifiers.predicates.role,v1_data["key"])
                 edge = {"weight" : 1,"display_name" : "Descriptor"}
                 entity_edges.append((n_id,v1_id,key,edge))
                 node_attrs[v1_id] = v1_data
 
-            for n2,v2,e2 in self._graph.get_aliases(n_id):
-                v2_id,v2_data = v2
-                key = (n_data["key"],e2[1],v2_data["key"])
+            for v2_id,v2_data in aliases[n_id]:
+                key = (n_data["key"],identifiers.predicates.alias,v2_data["key"])
                 edge = {"weight" : 1,"display_name" : "Alias"}
                 entity_edges.append((n_id,v2_id,key,edge))
                 node_attrs[v2_id] = v2_data
-        entity_graph = self._graph.sub_graph(entity_edges,node_attrs)
+        entity_graph = self._graph.sub_graph(entity_edges,node_attrs,frozen=False)
         entity_graph = self._swap_labels(entity_graph)
         return entity_graph
 
     def _swap_labels(self,graph):
+        unnamed = []
         for n1 in graph.nodes():
             d_n = graph.nodes[n1]["key"]
             if isinstance(d_n,int) or d_n.isdigit():
-                graph.nodes[n1]["key"] = self._graph.get_aliases(n1)[0][1][1]["key"]
-        return graph
\ No newline at end of file
+                unnamed.append(n1)
+        for n1,aliases in self._graph.get_batch_aliases(unnamed).items():
+            graph.set_node_attr(n1,{"key" : aliases[0][1]["key"]})
+        return self._view(graph)
\ No newline at end of file
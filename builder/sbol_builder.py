@@ -3,26 +3,25 @@ import os
 from graphs.sbol_graph import SBOLGraph
 from builder.abstract_builder import AbstractBuilder
 from util.sbol_identifiers import identifiers
+from util.names import get_name
 
 class SBOLBuilder(AbstractBuilder):
-    def __init__(self,graph):
+    def __init__(self,graph,frozen_views=False,literals_as_attributes=False):
         super().__init__()
-        self._graph = SBOLGraph(graph)
+        self._graph = SBOLGraph(graph,literals_as_attributes)
+        self._graph.frozen_views = frozen_views
 
 
     def produce_pruned_graph(self):
         final_edges = []
         node_attrs = {}
         remove_identities = []
+        pruned_predicates = {}
         for n,v,k,e in self._graph.edges(keys=True,data=True):
-            common_prefix_prune = False            
-            for namespace in identifiers.namespaces.prune:
-                if os.path.commonprefix([namespace,k[1]]) == namespace:
-                    common_prefix_prune = True
-                    break
-            if common_prefix_prune:
-                continue
-            if k[1] in identifiers.predicates.prune:
+            p_code = self._graph.terms.encode(k[1])
+            if p_code not in pruned_predicates:
+                pruned_predicates[p_code] = self._is_pruned_predicate(k[1])
+            if pruned_predicates[p_code]:
                 continue
             if k[1] == identifiers.predicates.rdf_type:
                 if k[2] in identifiers.objects.prune:
@@ -30,15 +29,21 @@ class SBOLBuilder(AbstractBuilder):
             node_attrs[n] = self._graph.nodes[n]
             node_attrs[v] = self._graph.nodes[v]
             final_edges.append((n,v,k,e))
-        pruned_graph = self._graph.sub_graph(final_edges,node_attrs)
+        literal_predicates = {p for p in self._graph.literal_predicates() if not self._is_pruned_predicate(p)}
+        if literal_predicates:
+            for n,literals in self._graph.nodes(data="literals"):
+                if literals and n not in node_attrs:
+                    node_attrs[n] = self._graph.nodes[n]
+        pruned_graph = self._graph.sub_graph(final_edges,node_attrs,frozen=False,
+                                             literal_predicates=literal_predicates)
         for node in remove_identities:
             pruned_graph.remove_node(node)
         pruned_graph.remove_isolated_nodes()
-        return pruned_graph
+        return self._view(pruned_graph)
          
     def produce_heirarchy_graph(self):
         edges,attrs = self._produce_heirachy_edges(self._graph.get_component_definitions,
-                                                    self._graph.get_components) 
+                                                    self._graph.get_batch_components) 
         heirarchy_graph = self._graph.sub_graph(edges,attrs)
         return heirarchy_graph
 
@@ -47,30 +52,39 @@ class SBOLBuilder(AbstractBuilder):
         node_attrs = {}
         type_pred = identifiers.predicates.type
         role_pred = identifiers.predicates.role
-        for identity,cd in self._graph.get_component_definitions():
-            for t_id,t_data in self._graph.get_types(identity):
+        cds = self._graph.get_component_definitions()
+        cd_ids = [identity for identity,cd in cds]
+        types = self._graph.get_batch_types(cd_ids)
+        roles = self._graph.get_batch_roles(cd_ids)
+        components = self._graph.get_batch_components(cd_ids)
+        for identity,cd in cds:
+            for t_id,t_data in types[identity]:
                 edge_key,edge = self._create_descriptor_edge(cd,t_data,type_pred)
                 component_edges.append((identity,t_id,edge_key,edge))
                 node_attrs[t_id] = t_data
 
-            for r_id,r_data in self._graph.get_roles(identity):
+            for r_id,r_data in roles[identity]:
                 edge_key,edge = self._create_descriptor_edge(cd,r_data,role_pred)
                 component_edges.append((identity,r_id,edge_key,edge))
                 node_attrs[r_id] = r_data
 
-            for c_id,c_data in self._graph.get_components(identity):
+            for c_id,c_data in components[identity]:
                 edge_key,edge = self._create_component_edge(cd,c_data)
                 component_edges.append((identity,c_id,edge_key,edge))
                 node_attrs[c_id] = c_data
             node_attrs[identity] = cd
 
-        for m_identity,md in self._graph.get_module_definitions():
-            for i_id,i_data in self._graph.get_interactions(m_identity):
+        mds = self._graph.get_module_definitions()
+        md_ids = [m_identity for m_identity,md in mds]
+        interactions = self._graph.get_batch_interactions(md_ids)
+        functional_components = self._graph.get_batch_functional_components(md_ids)
+        for m_identity,md in mds:
+            for i_id,i_data in interactions[m_identity]:
                 edge_key,edge = self._create_descriptor_edge(md,i_data,identifiers.predicates.interaction)
                 component_edges.append((m_identity,i_id,edge_key,edge))
                 node_attrs[i_id] = i_data
 
-            for fc_id,fc_data in self._graph.get_functional_components(m_identity):
+            for fc_id,fc_data in functional_components[m_identity]:
                 edge_key,edge = self._create_component_edge(md,fc_data)
                 component_edges.append((m_identity,fc_id,edge_key,edge))
                 node_attrs[fc_id] = fc_data
@@ -81,14 +95,15 @@ class SBOLBuilder(AbstractBuilder):
     def produce_interaction_verbose_graph(self):
         interaction_edges = []
         node_attrs = {}
-        for i_identity,i_data in self._graph.get_interactions():
-            i_type_data = self._graph.get_type(i_identity)[1]
-            participations = self._graph.get_participations(i_identity)
+        interactions,i_types,i_participations,roles,cds = self._interaction_facts()
+        for i_identity,i_data in interactions:
+            i_type_data = i_types[i_identity][0][1]
+            participations = i_participations[i_identity]
             node_attrs[i_identity] = i_data
             if len(participations) == 1:
                 p_id,p_data = participations[0]
-                cd = self._graph.get_component_definition(participation=p_id)
-                p_type_id,p_type_data = self._graph.get_role(p_id)
+                cd = cds[p_id]
+                p_type_id,p_type_data = roles[p_id][0]
                 i_edge = self._create_interaction_edge(cd,cd,p_type_data,p_type_data,i_type_data,True)
                 if i_edge is None:
                     continue
@@ -99,13 +114,13 @@ class SBOLBuilder(AbstractBuilder):
             i_type_data = i_type_data["key"]
             i_data = i_data["key"]
             for p_id,p_data in participations:
-                cd1 = self._graph.get_component_definition(participation=p_id)
-                p_type = self._graph.get_role(p_id)[1]["key"]
+                cd1 = cds[p_id]
+                p_type = roles[p_id][0][1]["key"]
                 node_attrs[cd1[0]] = cd1[1]
                 try:
                     paricipation_name = identifiers.external.inhibition_participants[p_type]
                 except KeyError:
-                    paricipation_name = self.graph._get_name(p_type)
+                    paricipation_name = get_name(p_type)
                 try:
                     p1_dir = identifiers.external.interaction_direction[p_type]
                 except KeyError:
@@ -128,13 +143,14 @@ class SBOLBuilder(AbstractBuilder):
     def produce_interaction_graph(self):
         interaction_edges = []
         node_attrs = {}
-        for i_identity,i_data in self._graph.get_interactions():
-            i_type_id,i_type_data = self._graph.get_type(i_identity)
-            participations = self._graph.get_participations(i_identity)
+        interactions,i_types,i_participations,roles,cds = self._interaction_facts()
+        for i_identity,i_data in interactions:
+            i_type_id,i_type_data = i_types[i_identity][0]
+            participations = i_participations[i_identity]
             if len(participations) == 1:
                 p_id,p_data = participations[0]
-                cd = self._graph.get_component_definition(participation=p_id)
-                p_type_id,p_type_data = self._graph.get_role(p_id)
+                cd = cds[p_id]
+                p_type_id,p_type_data = roles[p_id][0]
                 i_edge = self._create_interaction_edge(cd,cd,p_type_data,p_type_data,i_type_data,False)
                 if i_edge is None:
                     continue
@@ -144,8 +160,8 @@ class SBOLBuilder(AbstractBuilder):
             
             seen_combinations = []
             for p_id,p_data in participations:
-                cd1 = self._graph.get_component_definition(participation=p_id)
-                p1_type_id,p1_type_data = self._graph.get_role(p_id)
+                cd1 = cds[p_id]
+                p1_type_id,p1_type_data = roles[p_id][0]
                 node_attrs[cd1[0]] = cd1[1]
                 for p2_id,p2_data in participations:
                     if p2_id == p_id:
@@ -153,8 +169,8 @@ class SBOLBuilder(AbstractBuilder):
                     if {p_id,p2_id} in seen_combinations:
                         continue
                     
-                    p2_type_id,p2_type_data = self._graph.get_role(p2_id)
-                    cd2 = self._graph.get_component_definition(participation=p2_id)
+                    p2_type_id,p2_type_data = roles[p2_id][0]
+                    cd2 = cds[p2_id]
                     i_edge = self._create_interaction_edge(cd1,cd2,
                             p1_type_data,p2_type_data,i_type_data)
                     if i_edge is None:
@@ -179,36 +195,30 @@ class SBOLBuilder(AbstractBuilder):
 
     def produce_module_graph(self):
         edges,attrs = self._produce_heirachy_edges(self._graph.get_module_definitions,
-                                            self._graph.get_modules) 
+                                            self._graph.get_batch_modules) 
         module_graph = self._graph.sub_graph(edges,attrs)
         return module_graph
                                               
     def produce_maps_graph(self):
-        h_edges,h_attrs = self._produce_heirachy_edges(self._graph.get_component_definitions,self._graph.get_components)
-        m_edges,m_attrs = self._produce_heirachy_edges(self._graph.get_module_definitions,self._graph.get_modules)
+        h_edges,h_attrs = self._produce_heirachy_edges(self._graph.get_component_definitions,self._graph.get_batch_components)
+        m_edges,m_attrs = self._produce_heirachy_edges(self._graph.get_module_definitions,self._graph.get_batch_modules)
         node_attrs = {}
         node_attrs.update(h_attrs)
         node_attrs.update(m_attrs)
         map_edges = h_edges + m_edges
-        map_graph = self._graph.sub_graph(map_edges,node_attrs)
+        map_graph = self._graph.sub_graph(map_edges,node_attrs,frozen=False)
         to_merge = []
-        for identity,data in self._graph.get_module_definitions(): 
-            for fc_id,fc_data in self._graph.get_functional_components(identity):
+        mds = self._graph.get_module_definitions()
+        functional_components = self._graph.get_batch_functional_components([identity for identity,data in mds])
+        for identity,data in mds: 
+            for fc_id,fc_data in functional_components[identity]:
                 key = (data["key"],identifiers.predicates.functional_component,fc_data["key"])
                 map_graph.add_edge(identity,fc_id,key=key,weight=1,
                                 display_name="functional-component")
                 map_graph.set_node_attr(fc_id,fc_data)
             
             
-            for module_id,module_data in self._graph.get_modules(identity):
-                for map_id,map_data in self._graph.get_maps_to(module_id):
-                    map_local = self._graph.get_property(map_id,identifiers.predicates.local)
-                    map_remote = self._graph.get_property(map_id,identifiers.predicates.remote)
-                    if len(map_local) != 1 or len(map_remote) != 1:
-                        continue
-                    map_local_id,map_local_data = map_local[0]
-                    map_remote_id,map_remote_data = map_remote[0]
-                    to_merge.append((map_local_id,map_remote_id))
+            to_merge += self._graph.get_module_maps(identity)
             map_graph.set_node_attr(identity,data)
 
         for index,(n,v) in enumerate(to_merge):
@@ -218,23 +228,43 @@ class SBOLBuilder(AbstractBuilder):
                 if m[1] == n:
                     n = m[0]
             map_graph.merge_nodes(n,v)
-        return map_graph
+        return self._view(map_graph)
+
+
 
+    def _interaction_facts(self):
+        # Types and participations of every interaction then the roles and 
+        # definitions of every participation, one batched lookup each.
+        interactions = self._graph.get_interactions()
+        i_ids = [i_identity for i_identity,i_data in interactions]
+        i_types = self._graph.get_batch_types(i_ids)
+        i_participations = self._graph.get_batch_participations(i_ids)
+        p_ids = {p[0] : None for ps in i_participations.values() for p in ps}
+        roles = self._graph.get_batch_roles(p_ids)
+        cds = self._graph.get_batch_component_definitions(p_ids)
+        return interactions,i_types,i_participations,roles,cds
 
+    def _is_pruned_predicate(self,predicate):
+        for namespace in identifiers.namespaces.prune:
+            if os.path.commonprefix([namespace,predicate]) == namespace:
+                return True
+        return predicate in identifiers.predicates.prune
 
     def _produce_interaction_sub_graph(self,predicates,interaction_types=[],use_last=False):
         i_edges = []
         node_attrs = {}
         interaction_graph = self.produce_interaction_graph()
+        node_types = {n : types[0][1]["key"] for n,types in 
+                      self._graph.get_batch_types(interaction_graph.nodes).items() if types != []}
         for n1,n2,edge in interaction_graph.edges:
-            n1_type = self._graph.get_type(n1)
-            if n1_type is None or n1_type[1]["key"] not in predicates :
+            n1_type = node_types.get(n1)
+            if n1_type is None or n1_type not in predicates :
                 continue
             n1_data = interaction_graph.nodes[n1]
             interaction_type = edge[1]
 
             n2s = self._find_nearest_interaction(n2,interaction_graph,predicates,
-                                                interaction_type,interaction_types)
+                                                interaction_type,node_types,interaction_types)
             if n2s is None:
                 continue
             for n2,i_type in n2s:
@@ -257,11 +287,11 @@ class SBOLBuilder(AbstractBuilder):
         return i_graph
 
     def _find_nearest_interaction(self,node,graph,predicates,
-                    interaction_type,desired_interactions=[]):
-        node_type = self._graph.get_type(node)
+                    interaction_type,node_types,desired_interactions=[]):
+        node_type = node_types.get(node)
         if node_type is None:
             return None
-        if node_type[1]["key"] in predicates:
+        if node_type in predicates:
             return [(node,interaction_type)]
         else: 
             end_nodes = []
@@ -271,7 +301,7 @@ class SBOLBuilder(AbstractBuilder):
                 if n == v:
                     continue
                 end_node = self._find_nearest_interaction(v,graph,predicates,
-                                        interaction_type,desired_interactions)
+                                        interaction_type,node_types,desired_interactions)
                 if end_node is not None: 
                     end_nodes += end_node
             return end_nodes
@@ -299,7 +329,7 @@ class SBOLBuilder(AbstractBuilder):
         try:
             i_type_name = identifiers.external.interaction_type_names[i_type]
         except KeyError:
-            i_type_name = self.graph._get_name(i_type)
+            i_type_name = get_name(i_type)
         try:
             p1_dir = identifiers.external.interaction_direction[p1_type]
         except KeyError:
@@ -335,7 +365,7 @@ class SBOLBuilder(AbstractBuilder):
     def _create_descriptor_edge(self,entity,descriptor,predicate):
         edge_key = (entity["key"],predicate,descriptor["key"])
         edge = {"weight"  : 1,
-                "display_name" : self._graph._get_name(predicate)}
+                "display_name" : get_name(predicate)}
         return edge_key,edge
         
     def _create_component_edge(self,cd,component):
@@ -347,9 +377,11 @@ class SBOLBuilder(AbstractBuilder):
     def _produce_heirachy_edges(self,top_level_func,sub_func):
         edges = []
         node_attrs = {}
-        for identity,data in top_level_func():
-            components = sub_func(identity)
-            components = [self._graph.get_definition(c[0]) for c in components]
+        top_levels = top_level_func()
+        children = sub_func([identity for identity,data in top_levels])
+        definitions = self._graph.get_batch_definitions({c[0] : None for cs in children.values() for c in cs})
+        for identity,data in top_levels:
+            components = [definitions[c[0]][0] for c in children[identity]]
             for c_identity,component in components:
                 edge_key,edge = self._create_component_edge(data,component)
                 edges.append((identity,c_identity,edge_key,edge))
@@ -5,6 +5,6 @@ class KnowledgeDash(FullDash):
     def __init__(self,name,server):
         super().__init__(KnowledgeVisualiser(),name,server,"/knowledge_graph/")
 
-    def load_graph(self,filename):
-        self.visualiser = KnowledgeVisualiser(filename)
+    def load_graph(self,filename,literals_as_attributes=False):
+        self.visualiser = KnowledgeVisualiser(filename,literals_as_attributes)
         return super()._load_graph()
\ No newline at end of file
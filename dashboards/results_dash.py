@@ -3,6 +3,7 @@ import os
 from util.sbol_summarise import get_all_views
 from dashboards.abstract_dash import AbstractDash
 from visual.sbol_visual import SBOLVisualiser
+from builder.sbol_builder import SBOLBuilder
 
 
 button_class = "btn btn-light dash-toolbar"
@@ -20,12 +21,13 @@ class ResultDash(AbstractDash):
 
     def build_results(self,filename):
         '''
-        Seems silly to load the graph for each function...
+        Loads the graph once, the summaries and figures share it.
         '''
-        self.visualiser = SBOLVisualiser(filename)
+        builder = SBOLBuilder(filename)
+        self.visualiser = SBOLVisualiser(builder)
         download = os.path.basename(filename)
         name = download.split(".")[0]
-        s_view,t_view,f_view = get_all_views(filename) 
+        s_view,t_view,f_view = get_all_views(builder.graph)
         changelog = ""
 
         name_heading =  self.create_heading_1("title",name)
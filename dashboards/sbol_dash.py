@@ -5,6 +5,6 @@ class SBOLDash(FullDash):
     def __init__(self,name,server):
         super().__init__(SBOLVisualiser(),name,server,"/full_graph/")
 
-    def load_graph(self,filename):
-        self.visualiser = SBOLVisualiser(filename)
+    def load_graph(self,filename,literals_as_attributes=False):
+        self.visualiser = SBOLVisualiser(filename,literals_as_attributes)
         return super()._load_graph()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import json
+import time
+from itertools import chain
+
+from flask import Response,request
+from rdflib import Graph,URIRef,BNode,Literal
+from rdflib.plugins.sparql.processor import prepareQuery
+from rdflib.plugins.sparql.evaluate import evalQuery
+
+from graphs.graph_store import GraphStore
+
+default_timeout = 30
+default_row_limit = 10000
+results_type = "application/sparql-results+json"
+
+class SPARQLEndpoint:
+    '''
+    Answers SPARQL SELECT and ASK queries over a loaded graph at pathname
+    of a Flask server. Triple patterns are looked up through the graph
+    indexes, SELECT results are streamed as SPARQL JSON and stop after
+    row_limit rows or once the query has run for timeout seconds.
+    '''
+    def __init__(self,graph,server,pathname="/sparql",timeout=default_timeout,row_limit=default_row_limit):
+        self.graph = graph
+        self.timeout = timeout
+        self.row_limit = row_limit
+        server.add_url_rule(pathname,"sparql",self._handle,methods=["GET","POST"])
+
+    def execute(self,query):
+        '''
+        Returns ("ASK",answer) or ("SELECT",variables,rows) where rows is
+        a generator of bindings evaluated as it is consumed.
+        '''
+        deadline = time.monotonic() + self.timeout
+        rdf_graph = Graph(store=GraphStore(self.graph,deadline))
+        query = prepareQuery(query)
+        kind = query.algebra.name
+        if kind == "AskQuery":
+            return "ASK",evalQuery(rdf_graph,query,{})["askAnswer"]
+        if kind != "SelectQuery":
+            raise ValueError("Only SELECT and ASK queries are supported.")
+        result = evalQuery(rdf_graph,query,{})
+        return "SELECT",result["vars_"],self._limit(result["bindings"],deadline)
+
+    def _limit(self,rows,deadline):
+        for count,row in enumerate(rows):
+            if count >= self.row_limit:
+                return
+            if time.monotonic() > deadline:
+                raise TimeoutError("Query exceeded its time limit.")
+            yield row
+
+    def _handle(self):
+        query = request.values.get("query")
+        if query is None and request.mimetype == "application/sparql-query":
+            query = request.get_data(as_text=True)
+        if not query:
+            return Response("Missing query parameter.",status=400)
+        # Errors before the first row still get a status, later ones end the stream.
+        try:
+            result = self.execute(query)
+            if result[0] == "ASK":
+                body = json.dumps({"head" : {},"boolean" : result[1]})
+                return Response(body,mimetype=results_type)
+            kind,variables,rows = result
+            first = next(rows,None)
+        except TimeoutError as ex:
+            return Response(str(ex),status=503)
+        except Exception as ex:
+            return Response(f"Query failed: {ex}",status=400)
+        if first is not None:
+            rows = chain([first],rows)
+        return Response(_stream_select(variables,rows),mimetype=results_type)
+
+
+def _stream_select(variables,rows):
+    yield json.dumps({"head" : {"vars" : [str(v) for v in variables]}})[:-1]
+    yield ',"results":{"bindings":['
+    separator = ""
+    try:
+        for row in rows:
+            binding = {str(v) : _json_term(row.get(v)) for v in variables if row.get(v) is not None}
+            yield separator + json.dumps(binding)
+            separator = ","
+    except TimeoutError:
+        pass
+    yield "]}}"
+
+
+def _json_term(term):
+    if isinstance(term,Literal):
+        encoded = {"type" : "literal","value" : str(term)}
+        if term.language is not None:
+            encoded["xml:lang"] = term.language
+        elif term.datatype is not None:
+            encoded["datatype"] = str(term.datatype)
+        return encoded
+    if isinstance(term,BNode):
+        return {"type" : "bnode","value" : str(term)}
+    if isinstance(term,URIRef):
+        return {"type" : "uri","value" : str(term)}
+    return {"type" : "literal","value" : str(term)}
@@ -1,21 +1,66 @@
-import re
+import os
+import time
+from itertools import chain,repeat
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import networkx as nx
 from networkx.algorithms.centrality import degree_centrality
-from rdflib import URIRef,Graph,RDF
+from rdflib import Literal,BNode,Graph,RDF,Variable
+from rdflib.store import Store
+
+from graphs.csr_graph import CSRGraph,is_snapshot
+from graphs.sqlite_graph import SQLiteGraph,sqlite_suffix
+from util.graph_cache import graph_cache,encode_graph,decode_payload
+from util.term_table import term_table
+from util.names import get_name
+from util.line_parser import line_format,line_chunks,parse_lines
+from util.sbol_xml import parse_sbol_xml
+from util.compression import parse_rdf
+from util.query_cache import QueryCache,query_cache_size
 
 class AbstractGraph:
-    def __init__(self,graph):
-        if isinstance(graph,nx.MultiDiGraph):
+    # Predicates whose objects are held per subject node in the fact table.
+    fact_predicates = (RDF.type,)
+
+    def __init__(self,graph,literals_as_attributes=False):
+        cache_key = None
+        self.frozen_views = False
+        self.literals_as_attributes = literals_as_attributes
+        self.version = 0
+        self._query_cache = None
+        self._literal_nodes = {}
+        self._literal_data = {}
+        if isinstance(graph,(str,os.PathLike)) and os.fspath(graph).endswith(sqlite_suffix):
+            graph = SQLiteGraph(graph)
+        elif is_snapshot(graph):
+            graph = CSRGraph.load(graph)
+        if isinstance(graph,(CSRGraph,SQLiteGraph)):
+            self._graph = graph
+            max_node = self._graph.max_node()
+            self._max_key = max_node if max_node is not None else 1
+            self._build_node_index()
+        elif isinstance(graph,nx.MultiDiGraph):
             self._graph = graph
             if len(self._graph) > 0:
                 self._max_key = max([node for node in self._graph.nodes])
             else:
                 self._max_key = 1
+            self._build_node_index()
+        elif isinstance(graph,(list,tuple)):
+            self._graph,self._node_index,self._max_key = _load_many_to_networkx(graph,literals_as_attributes)
         else:
-            _graph = Graph()
-            _graph.load(graph)
-            self._graph,self._max_key = _rdf_to_networkx(_graph)
-        self._generate_labels()
+            cache_key = graph_cache.key(graph,literals_as_attributes)
+            cached = graph_cache.load(cache_key)
+            if cached is None:
+                cached = _load_to_networkx(graph,literals_as_attributes)
+            else:
+                cache_key = None
+            self._graph,self._node_index,self._max_key = cached
+        if cache_key is not None:
+            # Saved ahead of the indexes, which allocate literal node ids.
+            graph_cache.save(cache_key,self._graph,self._max_key)
+        self._build_indexes()
 
     def __len__(self):
         return len(self._graph)
@@ -30,11 +75,20 @@ class AbstractGraph:
     
     @property
     def graph(self):
+        if self.frozen:
+            return self._graph.to_networkx()
         return self._graph
+
+    @property
+    def frozen(self):
+        return isinstance(self._graph,(CSRGraph,SQLiteGraph))
     
     @graph.setter
     def graph(self,graph):
         self._graph = graph
+        self.version += 1
+        self._build_node_index()
+        self._build_indexes()
 
     @property
     def max_key(self):
@@ -46,16 +100,46 @@ class AbstractGraph:
         self._max_key += increase
         
     def degree_centrality(self):
-        return degree_centrality(self._graph)
+        return degree_centrality(self.graph)
     
     def in_edges(self,node = None,keys = False):
-        return self.graph.in_edges(node,keys=keys)
+        return self._graph.in_edges(node,keys=keys)
     
     def out_edges(self,node = None,keys = False):
-        return self.graph.out_edges(node,keys = keys)
+        return self._graph.out_edges(node,keys = keys)
+
+    def save_snapshot(self,path):
+        '''
+        Writes the graph as a memory mappable snapshot, see CSRGraph.save.
+        '''
+        if isinstance(self._graph,SQLiteGraph):
+            raise ValueError("Graphs backed by a database are already persistent.")
+        graph = self._graph if self.frozen else CSRGraph.from_networkx(self._graph)
+        graph.save(path)
+
+    @classmethod
+    def load_snapshot(cls,path,verify=True):
+        return cls(CSRGraph.load(path,verify))
+
+    def freeze(self):
+        '''
+        Returns a read-only copy of this graph backed by CSR arrays.
+        '''
+        if self.frozen:
+            return self
+        frozen_graph = self.__class__(CSRGraph.from_networkx(self._graph))
+        frozen_graph.frozen_views = True
+        return frozen_graph
 
     def merge_nodes(self,node1,node2):
+        self._check_mutable()
         node1_data = self.nodes[node1]["key"]
+        literals = self.nodes[node2].get("literals")
+        if literals:
+            merged = {p : list(l) for p,l in self.nodes[node1].get("literals",{}).items()}
+            for p,l in literals.items():
+                merged.setdefault(p,[]).extend(o for o in l if o not in merged[p])
+            self.set_node_attr(node1,{"literals" : merged})
         for n,v,k,e in self._graph.in_edges(node2,data=True,keys=True):
             new_key = (k[0],k[1],node1_data)
             self.add_edge(n,node1,new_key,**e)
@@ -65,53 +149,352 @@ class AbstractGraph:
 
         self.remove_node(node2)
 
-    def remove_edge(self,n1,n2):
-        self._graph.remove_edge(n1,n2)
+    def remove_edge(self,n1,n2,key=None):
+        self._check_mutable()
+        if key is None:
+            # Mirrors networkx, which drops the most recently added edge.
+            keys = list(self._graph.get_edge_data(n1,n2,default={}))
+            if len(keys) == 0:
+                raise nx.NetworkXError(f"The edge {n1}-{n2} is not in the graph.")
+            key = keys[-1]
+        self._unindex_edge(n1,n2,key)
+        self._graph.remove_edge(n1,n2,key=key)
     
     def remove_node(self,n1):
+        self._check_mutable()
+        for n,v,k in list(self._graph.in_edges(n1,keys=True)):
+            self._unindex_edge(n,v,k)
+        for n,v,k in list(self._graph.out_edges(n1,keys=True)):
+            self._unindex_edge(n,v,k)
+        for n,v,k in list(self._literal_edges(n1)):
+            self._unindex_edge(n,v,k)
+        self._unindex_node(n1)
         self._graph.remove_node(n1)
 
     def remove_isolated_nodes(self):
-        self._graph.remove_nodes_from(list(nx.isolates(self._graph)))
+        self._check_mutable()
+        # Literal attributes stand in for edges, a node holding them is not isolated.
+        isolates = [node for node in nx.isolates(self._graph)
+                    if not self._graph.nodes[node].get("literals")]
+        for node in isolates:
+            for n,v,k in list(self._literal_edges(node)):
+                self._unindex_edge(n,v,k)
+            self._unindex_node(node)
+        self._graph.remove_nodes_from(isolates)
         
     def is_connected(self):
-        return nx.is_connected(self._graph)
+        return nx.is_connected(self.graph)
+
+    def enable_query_cache(self,maxsize=query_cache_size):
+        '''
+        Keeps the results of search and get_facts for the last maxsize
+        patterns, the cache empties itself once the graph version moves on.
+        '''
+        self._query_cache = QueryCache(maxsize)
 
-    def search(self,pattern,lazy=False):
-        matches = []
+    def disable_query_cache(self):
+        self._query_cache = None
+
+    def query_cache_info(self):
+        '''
+        Returns (hits,misses,maxsize,currsize), None while caching is off.
+        '''
+        if self._query_cache is None:
+            return None
+        return self._query_cache.info()
+
+    def search(self,pattern,lazy=False,limit=None,offset=0):
+        if lazy:
+            limit = 1
+        if self._query_cache is None:
+            matches = list(self.iter_search(pattern,limit,offset))
+        else:
+            matches = self._cached("search",pattern,lambda: list(self.iter_search(pattern,limit,offset)),limit,offset)
+        if lazy:
+            return matches[0] if matches else []
+        return matches
+
+    def iter_search(self,pattern,limit=None,offset=0,deadline=None):
+        '''
+        Yields ([n,n_data],[v,v_data],edge) for each edge matching pattern,
+        skipping the first offset matches and stopping after limit of them.
+        Edges are only scanned as far as the matches consumed. Raises 
+        TimeoutError once deadline, a time.monotonic value, has passed 
+        while scanning, whether or not candidates matched.
+        '''
+        if limit is not None and limit <= 0:
+            return
         s,p,o = pattern
-        if s: s = self.get_entity_code(s)
-        if p and not isinstance(p,(list,set,tuple)): 
-            p = [p]
-        if o and not isinstance(o,(list,set,tuple)):
-            o = [o]
-        for n,v,e in self.edges(s,keys=True):
-            if not p or e[1] in p:
+        # Only None is unbound, literals such as 0, "" and false are falsy.
+        if s is not None:
+            try:
+                s = self.get_entity_code(s)
+            except ValueError:
+                return
+        # Sets of interned terms, membership is then a hash and identity check.
+        if p is not None:
+            p = set(p) if isinstance(p,(list,set,tuple)) else {p}
+        if o is not None:
+            o = set(o) if isinstance(o,(list,set,tuple)) else {o}
+        if p == set() or o == set():
+            return
+        edges = self._candidate_edges(s,p,o)
+        if deadline is not None:
+            edges = _until(edges,deadline)
+        for n,v,e in edges:
+            if p is None or e[1] in p:
                 n_data = self.nodes[n]
-                v_data = self.nodes[v]
-                if not o or v_data["key"] in o:
-                    if lazy:
-                        return ([n,n_data],[v,v_data],e)
-                    matches.append(([n,n_data],[v,v_data],e))
-        return matches
+                v_data = self._node_data(v)
+                if o is None or v_data["key"] in o:
+                    if offset > 0:
+                        offset -= 1
+                        continue
+                    yield ([n,n_data],[v,v_data],e)
+                    if limit is not None:
+                        limit -= 1
+                        if limit == 0:
+                            return
+
+    def _candidate_edges(self,s,p,o):
+        if s is not None and s not in self._graph:
+            # Join variables may bind literal node ids, which have no edges.
+            return ()
+        if s is not None or (p is None and o is None):
+            return chain(self.edges(s,keys=True),self._literal_edges(s))
+        if o is not None:
+            # Bound objects are resolved to their nodes and only the edges
+            # into them are walked, the predicate is filtered by the caller.
+            edges = self._reverse_edges(o)
+        else:
+            edges = _chain_index(self._p_index,[term_table.code(pr) for pr in p])
+        if self.frozen:
+            # Read-only backends answer from their own indexes, only 
+            # literal attributes are held in the dict indexes.
+            return chain(self._graph.match_edges(p,o),edges)
+        return edges
+
+    def _reverse_edges(self,objects):
+        nodes = {}
+        for ob in objects:
+            nodes.update(self._node_index.get(ob,()))
+            literal = self._literal_nodes.get(ob)
+            if literal is not None:
+                nodes[literal] = None
+        for node in nodes:
+            yield from self._in_edges(node)
+
+    def _in_edges(self,node):
+        # Copy so callers may mutate the graph while consuming results.
+        literal_edges = self._literal_in.get(node)
+        if literal_edges is not None:
+            return list(literal_edges)
+        if node not in self._graph:
+            return []
+        return list(self._graph.in_edges(node,keys=True))
 
+    def query(self,patterns):
+        '''
+        Matches a conjunction of (s,p,o) patterns whose parts may be 
+        rdflib Variables shared between patterns. Fixed subjects are 
+        entities or node ids, fixed predicates and objects terms or lists
+        of terms, None matches anything. Patterns are joined in order of 
+        their estimated matches, returns a list of bindings from variable 
+        to node id, or to the term for predicate variables.
+        '''
+        try:
+            patterns = [self._compile_pattern(pattern) for pattern in patterns]
+        except LookupError:
+            return []
+        bindings = [{}]
+        for pattern in self._plan_query(patterns):
+            bindings = [joined for binding in bindings 
+                        for joined in self._join_pattern(pattern,binding)]
+            if len(bindings) == 0:
+                break
+        return bindings
+
+    def _compile_pattern(self,pattern):
+        s,p,o = pattern
+        if isinstance(p,Variable) and p in (s,o):
+            raise ValueError(f"{p} can't bind both a predicate and a node.")
+        if s is not None and not isinstance(s,Variable):
+            try:
+                s = self.get_entity_code(s)
+            except ValueError:
+                raise LookupError(s)
+        if p is not None and not isinstance(p,Variable):
+            p = set(p) if isinstance(p,(list,set,tuple)) else {p}
+        if o is not None and not isinstance(o,Variable):
+            o = set(o) if isinstance(o,(list,set,tuple)) else {o}
+        return s,p,o
+
+    def _plan_query(self,patterns):
+        # Greedy, the pattern expected to match the fewest edges given the 
+        # variables bound so far is joined next, ties keep the given order.
+        bound = set()
+        plan = []
+        patterns = list(patterns)
+        while patterns:
+            pattern = min(patterns,key=lambda pt: self._estimate_pattern(pt,bound))
+            patterns.remove(pattern)
+            plan.append(pattern)
+            bound.update(t for t in pattern if isinstance(t,Variable))
+        return plan
+
+    def _estimate_pattern(self,pattern,bound):
+        s,p,o = pattern
+        if isinstance(p,Variable):
+            p = None
+        average_degree = self._graph.number_of_edges() / max(len(self._graph),1)
+        if s in bound:
+            return average_degree
+        if s is not None and not isinstance(s,Variable):
+            return len(self._graph.out_edges(s))
+        if isinstance(o,Variable):
+            if o in bound:
+                return average_degree
+            o = None
+        if p is None and o is None:
+            return self._graph.number_of_edges()
+        return self._count_edges(p,o)
+
+    def _count_edges(self,p,o):
+        count = 0
+        if self.frozen:
+            count = self._graph.count_edges(p,o)
+        if o is not None:
+            return count + sum(1 for n,v,k in self._reverse_edges(o) if p is None or k[1] in p)
+        return count + sum(len(self._p_index.get(term_table.code(pr),())) for pr in p)
+
+    def _join_pattern(self,pattern,binding):
+        s,p,o = (binding.get(t,t) if isinstance(t,Variable) else t for t in pattern)
+        s_var,p_var,o_var = (t if isinstance(t,Variable) else None for t in (s,p,o))
+        node = None
+        if p_var is None and p is not None and not isinstance(p,set):
+            p = {p}
+        if o_var is None and isinstance(o,int):
+            # Bound object variables match the node itself, not only its key.
+            node = o
+            o = {self._node_data(node)["key"]}
+        if node is not None and (s_var or s is None):
+            candidates = self._in_edges(node)
+        else:
+            candidates = self._candidate_edges(None if s_var else s,None if p_var else p,None if o_var else o)
+        for n,v,e in candidates:
+            if p and not p_var and e[1] not in p:
+                continue
+            if node is not None:
+                if v != node:
+                    continue
+            elif o and not o_var and self._node_data(v)["key"] not in o:
+                continue
+            joined = dict(binding)
+            if all(joined.setdefault(var,value) == value 
+                   for var,value in ((s_var,n),(p_var,e[1]),(o_var,v)) if var is not None):
+                yield joined
 
     def get_entity_code(self,entity):
-        for node,data in self.nodes(data=True):
-            if data["key"] == entity or node == entity:
-                return node
-        import pdb;pdb.set_trace()
+        if self.frozen:
+            codes = self._graph.entity_nodes(entity)
+        else:
+            codes = self._node_index.get(entity)
+        if codes:
+            return next(iter(codes))
+        if entity in self._graph:
+            return entity
         raise ValueError(f"Can't find code for {entity}")
         
     def add(self,edges):
-        self._graph.add_edges_from(edges)
+        self._check_mutable()
+        edges = list(edges)
+        keys = self._graph.add_edges_from(edges)
+        for edge,key in zip(edges,keys):
+            self._index_edge(edge[0],edge[1],key)
     
+    def apply_delta(self,added=[],removed=[]):
+        '''
+        Removes then adds the given (s,p,o) triples in place, keeping
+        labels and indexes current. Returns the ids of the touched nodes,
+        including those removed once nothing referred to them.
+        '''
+        self._check_mutable()
+        touched = set()
+        for s,p,o in removed:
+            for n in list(self._node_index.get(s,())):
+                literals = self.nodes[n].get("literals",{})
+                if o in literals.get(p,()):
+                    literals = {pr : [l for l in objects if pr != p or l != o]
+                                for pr,objects in literals.items()}
+                    self.set_node_attr(n,{"literals" : {pr : l for pr,l in literals.items() if l}})
+                    touched.add(n)
+                for u,v,k in list(self._graph.out_edges(n,keys=True)):
+                    if k == (s,p,o):
+                        self.remove_edge(u,v,k)
+                        touched.update((u,v))
+        for node in list(touched):
+            if self._graph.degree(node) == 0 and not self.nodes[node].get("literals"):
+                self.remove_node(node)
+        for triple in added:
+            s,p,o = (term_table.intern(t) for t in triple)
+            n = self._delta_node(s)
+            touched.add(n)
+            if self.literals_as_attributes and isinstance(o,Literal):
+                literals = {pr : list(l) for pr,l in self.nodes[n].get("literals",{}).items()}
+                if o not in literals.setdefault(p,[]):
+                    literals[p].append(o)
+                    self.set_node_attr(n,{"literals" : literals})
+                continue
+            v = self._delta_node(o)
+            touched.add(v)
+            if not self._graph.has_edge(n,v,(s,p,o)):
+                self.add_edge(n,v,(s,p,o),weight=1)
+        return touched
+
+    def _delta_node(self,entity):
+        nodes = self._node_index.get(entity)
+        if nodes:
+            return next(iter(nodes))
+        node = self.max_key
+        self._graph.add_node(node,key=entity)
+        self._index_node(node)
+        return node
+
+    @property
+    def terms(self):
+        return term_table
+
+    def encode(self,key):
+        return term_table.encode_triple(key)
+
+    def decode(self,codes):
+        return term_table.decode_triple(codes)
+
     def add_edge(self,n1,n2,key,**kwargs):
-        self._graph.add_edge(n1,n2,key=key,**kwargs)
+        self._check_mutable()
+        key = self._graph.add_edge(n1,n2,key=key,**kwargs)
+        self._index_edge(n1,n2,key)
     
     def set_node_attr(self,node_id,node_data):
+        self._check_mutable()
+        rekey = "key" in node_data and node_data["key"] != self.nodes[node_id].get("key")
+        relabel = rekey or "literals" in node_data
+        if rekey:
+            in_edges = list(self._graph.in_edges(node_id,keys=True))
+            for n,v,k in in_edges:
+                self._unindex_edge(n,v,k)
+            self._unindex_node(node_id)
+        if relabel:
+            for n,v,k in list(self._literal_edges(node_id)):
+                self._unindex_edge(n,v,k)
         for k,v in node_data.items():
             self._graph.nodes[node_id][k] = v
+        if rekey:
+            self._index_node(node_id)
+            for n,v,k in in_edges:
+                self._index_edge(n,v,k)
+        if relabel:
+            for n,v,k in self._literal_edges(node_id):
+                self._index_edge(n,v,k)
 
     def get_tree(self):
         tree_edges = []
@@ -123,96 +506,392 @@ class AbstractGraph:
             v_copy = v
             if v in seen:
                 v = self.max_key
-                node_attrs[v] = self.nodes[v_copy]
+                # Copies are leaves, the literals stay with the original.
+                node_attrs[v] = {k : d for k,d in self.nodes[v_copy].items() if k != "literals"}
                 seen.append(v)
             else:
                 seen.append(v)
             edge = self._create_edge_dict(e)
             tree_edges.append((n,v,e,edge))       
-        tree_graph = self.sub_graph(tree_edges,node_attrs)
+        tree_graph = self.sub_graph(tree_edges,node_attrs,literal_predicates=self.literal_predicates())
         return tree_graph
 
     def get_network(self):
         return self
         
-    def sub_graph(self,edges,node_attrs = {}):
+    def sub_graph(self,edges,node_attrs = {},frozen = None,literal_predicates = None):
+        '''
+        Returns a graph of edges with their nodes given node_attrs. Literal
+        attributes are only kept for literal_predicates, by default the 
+        predicates of edges, as the default ingest would keep those edges.
+        Nodes holding a kept literal are included without edges too.
+        '''
         new_graph = nx.MultiDiGraph()
         new_graph.add_edges_from(edges)
-        for subject,node,edge in new_graph.edges:
-            try:
-                new_graph.nodes[subject].update(node_attrs[subject])
-            except (KeyError,ValueError):
-                pass
-            try:
-                new_graph.nodes[node].update(node_attrs[node])
-            except (KeyError,ValueError):
-                pass
-        new_graph = self.__class__(new_graph)
+        if literal_predicates is None:
+            literal_predicates = {k[1] for n,v,k in new_graph.edges(keys=True)}
+        for node,data in node_attrs.items():
+            literals = data.get("literals")
+            if literals:
+                data = {k : d for k,d in data.items() if k != "literals"}
+                literals = {p : list(l) for p,l in literals.items() if p in literal_predicates}
+                if literals:
+                    data["literals"] = literals
+            if node in new_graph or literals:
+                new_graph.add_node(node,**data)
+        new_graph = self.__class__(new_graph,self.literals_as_attributes)
+        if frozen is None:
+            frozen = self.frozen_views
+        if frozen:
+            new_graph = new_graph.freeze()
         return new_graph
 
+    def literal_predicates(self):
+        '''
+        Returns the predicates of literals held as node attributes.
+        '''
+        if self.frozen and "literals" not in self._graph.node_columns:
+            return set()
+        return {p for n,literals in self._graph.nodes(data="literals") if literals for p in literals}
+
     def get_rdf_type(self,subject):
-        rdf_type = self.search((subject,RDF.type,None),lazy=True)
+        rdf_type = self.get_facts(subject,RDF.type)
         if rdf_type != []:
-            return rdf_type[1]
+            return rdf_type[0]
+
+    def get_facts(self,subject,predicate):
+        '''
+        Returns [node,data] for each object of predicate on subject, 
+        in search order. Fact predicates are answered from the fact table.
+        '''
+        if self._query_cache is None:
+            return self._get_facts(subject,predicate)
+        return self._cached("facts",(subject,predicate,None),lambda: self._get_facts(subject,predicate))
+
+    def _get_facts(self,subject,predicate):
+        facts = self._facts.get(term_table.code(predicate))
+        if facts is None or subject is None:
+            return [match[1] for match in self.iter_search((subject,predicate,None))]
+        try:
+            subject = self.get_entity_code(subject)
+        except ValueError:
+            return []
+        if self.frozen:
+            self._load_facts(subject)
+        return [[v,self._node_data(v)] for n,v,k in facts.get(subject,())]
+
+    def get_batch_facts(self,subjects,predicate):
+        '''
+        Returns {subject : [[node,data],...]} holding what get_facts returns
+        for each of subjects. Answered in one pass over the fact table or 
+        the edges of predicate rather than a search per subject. Predicate
+        may also be a list, objects are then grouped by predicate.
+        '''
+        results = {}
+        codes = {}
+        for subject in subjects:
+            results[subject] = []
+            try:
+                codes.setdefault(self.get_entity_code(subject),[]).append(subject)
+            except ValueError:
+                continue
+        facts = None
+        if not isinstance(predicate,(list,set,tuple)):
+            facts = self._facts.get(term_table.code(predicate))
+        if facts is not None and self.frozen:
+            unloaded = [code for code in codes if code not in self._fact_nodes]
+            if len(unloaded) > self._graph.count_edges([predicate]):
+                # One pass over the predicate's edges reads less than a lookup per subject.
+                facts = None
+            for code in unloaded if facts is not None else ():
+                self._load_facts(code)
+        if facts is not None:
+            for code,subjects in codes.items():
+                objects = [[v,self._node_data(v)] for n,v,k in facts.get(code,())]
+                for subject in subjects:
+                    results[subject] = list(objects)
+            return results
+        for n,v,e in self.iter_search((None,predicate,None)):
+            for subject in codes.get(n[0],()):
+                results[subject].append(v)
+        return results
+
+    def _cached(self,kind,pattern,compute,*args):
+        # Copies are handed out so callers can't change a cached result.
+        key = (kind,self._pattern_key(pattern)) + args
+        return list(self._query_cache.get(key,self.version,compute))
+
+    def _pattern_key(self,pattern):
+        s,p,o = pattern
+        if s is not None:
+            try:
+                s = self.get_entity_code(s)
+            except ValueError:
+                pass
+        return s,_term_key(p),_term_key(o)
+
+    def _check_mutable(self):
+        # Called ahead of every mutation, which also moves the version on.
+        if self.frozen:
+            raise ValueError("Graph is frozen, call sub_graph with frozen=False for a mutable copy.")
+        self.version += 1
+
+    def _build_node_index(self):
+        # Maps each entity to the node codes carrying it, tree views may 
+        # hold several copies of an entity, the first added is preferred.
+        self._node_index = {}
+        if self.frozen:
+            return
+        for node in self._graph.nodes:
+            self._index_node(node)
+
+    def _index_node(self,node):
+        key = self._graph.nodes[node].get("key")
+        if key is not None:
+            self._node_index.setdefault(key,{})[node] = None
+
+    def _unindex_node(self,node):
+        key = self._graph.nodes[node].get("key")
+        codes = self._node_index.get(key)
+        if codes is None:
+            return
+        codes.pop(node,None)
+        if len(codes) == 0:
+            del self._node_index[key]
+
+    def _build_indexes(self):
+        # Predicate keyed edge index so searches on a predicate alone do not
+        # walk every edge, bound objects are answered from their in edges.
+        # Literal attributes have no node, their in edges are held here.
+        self._p_index = {}
+        self._literal_in = {}
+        # Fact table, predicate code to subject node to its fact edges.
+        # Frozen backends fill it per subject on first use, see _load_facts.
+        self._facts = {term_table.encode(p) : {} for p in self.fact_predicates}
+        self._fact_nodes = {}
+        if not self.frozen:
+            # CSRGraph carries its own sorted predicate and object indexes.
+            for n,v,k in self._graph.edges(keys=True):
+                self._index_edge(n,v,k)
+        for n,v,k in self._literal_edges():
+            self._index_edge(n,v,k)
+
+    def _load_facts(self,node):
+        # Fact edges of a frozen graph's node are read from the backend 
+        # the first time they are asked for, ahead of any literal ones.
+        if node in self._fact_nodes:
+            return
+        self._fact_nodes[node] = None
+        loaded = {}
+        for n,v,k in self._graph.out_edges(node,keys=True):
+            p = term_table.code(k[1])
+            if p in self._facts:
+                loaded.setdefault(p,{})[(n,v,k)] = None
+        for p,edges in loaded.items():
+            edges.update(self._facts[p].get(node,{}))
+            self._facts[p][node] = edges
+
+    def _literal_edges(self,node=None):
+        # Literals held as node attributes are presented as edges to a node
+        # id allocated per literal, unless the graph already has that edge.
+        if self.frozen and "literals" not in self._graph.node_columns:
+            return
+        if node is None:
+            nodes = self._graph.nodes(data="literals")
+        else:
+            nodes = [(node,self._graph.nodes[node].get("literals"))]
+        for n,literals in nodes:
+            if not literals:
+                continue
+            key = self._graph.nodes[n].get("key")
+            existing = {k for u,v,k in self._graph.out_edges(n,keys=True)}
+            for p,objects in literals.items():
+                for o in objects:
+                    if (key,p,o) not in existing:
+                        yield (n,self._literal_node(o),(key,p,o))
+
+    def _literal_node(self,literal):
+        node = self._literal_nodes.get(literal)
+        if node is None:
+            node = self.max_key
+            self._literal_nodes[literal] = node
+            self._literal_data[node] = {"key" : literal}
+        return node
+
+    def _node_data(self,node):
+        data = self._literal_data.get(node)
+        if data is None:
+            return self.nodes[node]
+        return data
+
+    def _index_edge(self,n,v,k):
+        edge = (n,v,k)
+        p = term_table.encode(k[1])
+        self._p_index.setdefault(p,{})[edge] = None
+        if v in self._literal_data:
+            self._literal_in.setdefault(v,{})[edge] = None
+        if p in self._facts:
+            self._facts[p].setdefault(n,{})[edge] = None
+
+    def _unindex_edge(self,n,v,k):
+        edge = (n,v,k)
+        p = term_table.code(k[1])
+        for index,index_key in ((self._p_index,p),
+                                (self._literal_in,v)):
+            edges = index.get(index_key)
+            if edges is None:
+                continue
+            edges.pop(edge,None)
+            if len(edges) == 0:
+                del index[index_key]
+        facts = self._facts.get(p,{}).get(n)
+        if facts is not None:
+            facts.pop(edge,None)
+            if len(facts) == 0:
+                del self._facts[p][n]
 
     def _create_edge_dict(self,key,weight=1):
         edge = {'weight': weight, 
-                'display_name': self._get_name(str(key[1]))}
+                'display_name': get_name(str(key[1]))}
         return edge
 
-    def _get_name(self,subject):
-        split_subject = self._split(subject)
-        if len(split_subject[-1]) == 1 and split_subject[-1].isdigit():
-            return split_subject[-2]
-        elif len(split_subject[-1]) == 3 and _isfloat(split_subject[-1]):
-            return split_subject[-2]
-        else:
-            return split_subject[-1]
-
-    def _split(self,uri):
-        return re.split('#|\/|:', uri)
-
-    def _generate_labels(self):
-        for node,data in self.nodes(data=True):
-            if "display_name" not in data.keys():
-                identity = data["key"]
-                if isinstance(identity,URIRef):
-                    name = self._get_name(identity)
-                else:
-                    name = str(identity)
-                self.nodes[node]["display_name"] = name
-
-        for subject,node,edge in self.edges:
-            edge_data = self.edges[subject,node,edge]
-            if "display_name" not in edge_data.keys():
-                nx.set_edge_attributes(self._graph,{(subject,node,edge) : {"display_name" : self._get_name(edge[1])}})
+class _NetworkXIngest(Store):
+    '''
+    rdflib store that builds the networkx graph from each triple 
+    as the parser produces it instead of holding the triples itself.
+    '''
+    context_aware = True
+
+    def __init__(self,literals_as_attributes=False):
+        super().__init__()
+        self.nx_graph = nx.MultiDiGraph()
+        self.node_index = {}
+        self.node_count = 1
+        self.literals_as_attributes = literals_as_attributes
+
+    def add(self,triple,context=None,quoted=False):
+        s,p,o = (term_table.intern(t) for t in triple)
+        n = self._add_node(s)
+        if self.literals_as_attributes and isinstance(o,Literal):
+            self._add_literal(n,p,o)
+            return
+        v = self._add_node(o)
+        self.nx_graph.add_edge(n, v, key=(s,p,o), weight=1)
+
+    def merge(self,payload):
+        '''
+        Adds an encoded graph, remapping its node codes onto this graph.
+        Entities already present are shared rather than duplicated.
+        '''
+        codes = {}
+        nodes,edges,literals = decode_payload(payload)
+        for node,key,name in nodes:
+            codes[node] = self._add_node(key)
+            if name is not None:
+                self.nx_graph.nodes[codes[node]].setdefault("display_name",name)
+        for node,p,o in literals:
+            self._add_literal(codes[node],p,o)
+        for n,v,key,name in edges:
+            if name is None:
+                self.nx_graph.add_edge(codes[n], codes[v], key=key, weight=1)
+            else:
+                self.nx_graph.add_edge(codes[n], codes[v], key=key, weight=1, display_name=name)
+
+    def result(self):
+        return self.nx_graph, self.node_index, self.node_count + 1
+
+    def _add_node(self,entity):
+        if entity in self.node_index:
+            return next(iter(self.node_index[entity]))
+        n_key = self.node_count
+        self.node_index[entity] = {n_key : None}
+        self.nx_graph.add_node(n_key, key=entity)
+        self.node_count += 1
+        return n_key
+
+    def _add_literal(self,node,predicate,literal):
+        literals = self.nx_graph.nodes[node].setdefault("literals",{}).setdefault(predicate,[])
+        if literal not in literals:
+            literals.append(literal)
+
+
+def _load_to_networkx(source,literals_as_attributes=False):
+    rdf_format = line_format(source)
+    if rdf_format is not None:
+        return _load_lines_to_networkx(source,rdf_format,literals_as_attributes)
+    ingest = _NetworkXIngest(literals_as_attributes)
+    if parse_sbol_xml(source,ingest):
+        return ingest.result()
+    ingest = _NetworkXIngest(literals_as_attributes)
+    parse_rdf(Graph(store=ingest),source)
+    return ingest.result()
+
+
+def _load_lines_to_networkx(source,rdf_format,literals_as_attributes=False,processes=None):
+    ingest = _NetworkXIngest(literals_as_attributes)
+    chunks = line_chunks(source)
+    scope = f'{BNode()}_'
+    # Already in a worker when loading a directory, nested pools are avoided.
+    if len(chunks) < 2 or multiprocessing.parent_process() is not None:
+        for start,end in chunks:
+            parse_lines(source,start,end,rdf_format,ingest,scope)
+        return ingest.result()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        payloads = executor.map(_load_lines_payload,repeat(source),*zip(*chunks),
+                                repeat(rdf_format),repeat(literals_as_attributes),repeat(scope))
+        for payload in payloads:
+            ingest.merge(payload)
+    return ingest.result()
+
+
+def _load_lines_payload(source,start,end,rdf_format,literals_as_attributes,scope):
+    ingest = _NetworkXIngest(literals_as_attributes)
+    parse_lines(source,start,end,rdf_format,ingest,scope)
+    nx_graph,node_index,max_key = ingest.result()
+    return encode_graph(nx_graph,max_key)
+
+
+def _load_many_to_networkx(sources,literals_as_attributes=False,processes=None):
+    ingest = _NetworkXIngest(literals_as_attributes)
+    if len(sources) < 2:
+        for source in sources:
+            ingest.merge(_load_payload(source,literals_as_attributes))
+        return ingest.result()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # map keeps input order so node codes are the same between runs.
+        for payload in executor.map(_load_payload,sources,repeat(literals_as_attributes)):
+            ingest.merge(payload)
+    return ingest.result()
+
+
+def _load_payload(source,literals_as_attributes=False):
+    # Runs in a worker process, goes through AbstractGraph so the parse cache is used.
+    graph = AbstractGraph(source,literals_as_attributes)
+    return encode_graph(graph._graph,graph._max_key)
+
 
 def _rdf_to_networkx(graph):
-    nx_graph = nx.MultiDiGraph()
-    node_count = 1
-    node_map = {}
-    def _add_node(entity,node_count):
-        if entity in node_map.keys():
-            n_key = node_map[entity]
-        else:
-            n_key = node_count
-            node_map[entity] = n_key
-            node_count += 1
-        nx_graph.add_node(n_key, key=entity)
-        return n_key,node_count
-    for s,p,o in graph:
-        n,node_count = _add_node(s,node_count)
-        v,node_count = _add_node(o,node_count)
-        nx_graph.add_edge(n, v, key=(s,p,o), weight=1)
-    return nx_graph, node_count + 1
+    ingest = _NetworkXIngest()
+    for triple in graph:
+        ingest.add(triple)
+    return ingest.result()
+
 
+def _term_key(terms):
+    if isinstance(terms,(list,set,tuple)):
+        return frozenset(terms)
+    return terms
 
-def _isfloat(x):
-    try:
-        float(x)
-        return True
-    except ValueError:
-        return False
 
+def _until(edges,deadline):
+    for edge in edges:
+        if time.monotonic() > deadline:
+            raise TimeoutError("Search exceeded its time limit.")
+        yield edge
 
 
+def _chain_index(index,index_keys):
+    for index_key in dict.fromkeys(index_keys):
+        # Copy so callers may mutate the graph while consuming results.
+        for edge in list(index.get(index_key,())):
+            yield edge
@@ -0,0 +1,657 @@
+import os
+import json
+import shutil
+import hashlib
+
+import numpy as np
+import networkx as nx
+from rdflib import URIRef,BNode,Literal
+
+from util.term_table import term_table
+from util.prefix_table import prefix_table
+from util.graph_cache import uri_term,bnode_term,literal_term
+
+class _Missing:
+    # Pickled by reference so object columns keep the sentinel between processes.
+    def __reduce__(self):
+        return "_missing"
+
+_missing = _Missing()
+
+snapshot_version = 3
+snapshot_manifest = "manifest.json"
+_array_columns = ("node_ids","node_keys","node_names","out_offsets",
+                  "targets","edge_keys","edge_names","edge_weights")
+_derived_columns = ("_sources","_id_order","_ids_sorted","in_order","in_offsets",
+                    "_by_key","_keys_sorted","_by_p","_p_sorted","_by_o",
+                    "_o_sorted","_by_po","_po_sorted")
+
+def is_snapshot(path):
+    return (isinstance(path,(str,os.PathLike)) and 
+            os.path.isfile(os.path.join(path,snapshot_manifest)))
+
+class CSRGraph:
+    '''
+    Read-only compressed sparse row storage for a graph.
+    Adjacency, edge keys (as term codes) and node attributes are held in
+    NumPy columns instead of per node and per edge dicts. Exposes the
+    subset of the networkx MultiDiGraph interface used by AbstractGraph
+    and the visualisers. Term codes are those of the process wide term 
+    table unless a table local to the graph is given, as for snapshots.
+    '''
+    def __init__(self,node_ids,node_keys,node_names,out_offsets,targets,
+                 edge_keys,edge_names,edge_weights,names,
+                 node_columns=None,edge_columns=None,terms=None,derived=None):
+        self.node_ids = node_ids
+        self.node_keys = node_keys
+        self.node_names = node_names
+        self.out_offsets = out_offsets
+        self.targets = targets
+        self.edge_keys = edge_keys
+        self.edge_names = edge_names
+        self.edge_weights = edge_weights
+        self.names = names
+        self.node_columns = node_columns if node_columns is not None else {}
+        self.edge_columns = edge_columns if edge_columns is not None else {}
+        self.terms = terms if terms is not None else term_table
+        self._networkx = None
+        if derived is None:
+            self._build_derived()
+        else:
+            for name,value in derived.items():
+                setattr(self,name,value)
+
+    @classmethod
+    def from_networkx(cls,graph):
+        names = {}
+        def name_code(name):
+            if name is None:
+                return -1
+            return names.setdefault(name,len(names))
+
+        nodes = list(graph.nodes)
+        positions = {n : i for i,n in enumerate(nodes)}
+        node_keys = np.empty(len(nodes),dtype=np.int64)
+        node_names = np.empty(len(nodes),dtype=np.int64)
+        node_columns = {}
+        for i,(node,data) in enumerate(graph.nodes(data=True)):
+            node_keys[i] = _term_code(data.get("key"))
+            node_names[i] = name_code(data.get("display_name"))
+            for k,v in data.items():
+                if k in ("key","display_name"):
+                    continue
+                if k not in node_columns:
+                    node_columns[k] = np.full(len(nodes),_missing,dtype=object)
+                node_columns[k][i] = v
+
+        num_edges = graph.number_of_edges()
+        out_offsets = np.zeros(len(nodes) + 1,dtype=np.int64)
+        targets = np.empty(num_edges,dtype=np.int64)
+        edge_keys = np.empty((num_edges,3),dtype=np.int64)
+        edge_names = np.empty(num_edges,dtype=np.int64)
+        edge_weights = np.empty(num_edges,dtype=np.float64)
+        edge_columns = {}
+        index = 0
+        for i,node in enumerate(nodes):
+            for n,v,k,data in graph.out_edges(node,keys=True,data=True):
+                targets[index] = positions[v]
+                edge_keys[index] = term_table.encode_triple(k)
+                edge_names[index] = name_code(data.get("display_name"))
+                edge_weights[index] = data.get("weight",1)
+                for attr,value in data.items():
+                    if attr in ("weight","display_name"):
+                        continue
+                    if attr not in edge_columns:
+                        edge_columns[attr] = np.full(num_edges,_missing,dtype=object)
+                    edge_columns[attr][index] = value
+                index += 1
+            out_offsets[i + 1] = index
+        return cls(np.array(nodes,dtype=np.int64),node_keys,node_names,out_offsets,
+                   targets,edge_keys,edge_names,edge_weights,list(names),
+                   node_columns,edge_columns)
+
+    @classmethod
+    def load(cls,path,verify=True):
+        '''
+        Maps a snapshot written by save, the arrays are memory mapped
+        read-only so processes loading the same snapshot share pages.
+        '''
+        try:
+            with open(os.path.join(path,snapshot_manifest)) as f:
+                manifest = json.load(f)
+        except (OSError,ValueError):
+            raise ValueError(f"{path} is not a graph snapshot.")
+        if manifest.get("version") != snapshot_version:
+            raise ValueError(f"Snapshot {path} is version {manifest.get('version')}, expected {snapshot_version}.")
+        if verify:
+            for name,checksum in manifest["files"].items():
+                if _file_checksum(os.path.join(path,name)) != checksum:
+                    raise ValueError(f"Snapshot {path} is corrupt, checksum mismatch for {name}.")
+        def array(name):
+            return np.load(os.path.join(path,name + ".npy"),mmap_mode="r",allow_pickle=False)
+        def columns(kind):
+            return {n : _ValueColumn(array(f'{kind}_{i}'),array(f'{kind}_{i}_offsets')) 
+                    for i,n in enumerate(manifest[kind])}
+        terms = _SnapshotTerms(array("term_kinds"),array("term_prefixes"),
+                               list(_StringTable(array("prefixes"),array("prefixes_offsets"))),
+                               _StringTable(array("term_values"),array("term_values_offsets")),
+                               _StringTable(array("term_datatypes"),array("term_datatypes_offsets")),
+                               _StringTable(array("term_langs"),array("term_langs_offsets")),
+                               array("term_hashes"),array("term_hash_order"))
+        derived = {name : array(name.lstrip("_")) for name in _derived_columns}
+        derived["_stride"] = manifest["stride"]
+        return cls(*[array(name) for name in _array_columns],
+                   _StringTable(array("names"),array("names_offsets")),
+                   columns("node_columns"),columns("edge_columns"),
+                   terms,derived)
+
+    def save(self,path):
+        '''
+        Writes the graph as a snapshot directory of NumPy arrays with 
+        a manifest holding the format version and file checksums.
+        Term codes are rewritten local to the snapshot.
+        '''
+        if os.path.exists(path) and not is_snapshot(path):
+            raise ValueError(f"{path} exists and is not a graph snapshot.")
+        used = self.node_keys[self.node_keys >= 0]
+        codes = np.unique(np.concatenate([used,self.edge_keys.ravel()]))
+        node_keys = np.where(self.node_keys >= 0,np.searchsorted(codes,self.node_keys),-1)
+        edge_keys = np.searchsorted(codes,self.edge_keys)
+        terms = [_encode_term(self.terms.decode(int(c))) for c in codes]
+        # URIs are stored as the code of a prefix local to the snapshot and their local name.
+        prefixes = {}
+        term_prefixes = np.full(len(terms),-1,dtype=np.int32)
+        term_values = []
+        for i,(kind,value,datatype,lang) in enumerate(terms):
+            if kind == uri_term:
+                code,value = prefix_table.split(value)
+                if code is not None:
+                    term_prefixes[i] = prefixes.setdefault(code,len(prefixes))
+            term_values.append(value)
+        arrays = {"node_ids" : self.node_ids,
+                  "node_keys" : node_keys,
+                  "node_names" : self.node_names,
+                  "out_offsets" : self.out_offsets,
+                  "targets" : self.targets,
+                  "edge_keys" : edge_keys,
+                  "edge_names" : self.edge_names,
+                  "edge_weights" : self.edge_weights,
+                  "term_kinds" : np.array([t[0] for t in terms],dtype=np.int8),
+                  "term_prefixes" : term_prefixes}
+        for name,strings in (("names",list(self.names)),
+                             ("prefixes",[prefix_table.decode(c) for c in prefixes]),
+                             ("term_values",term_values),
+                             ("term_datatypes",[t[2] for t in terms]),
+                             ("term_langs",[t[3] for t in terms])):
+            arrays[name],arrays[name + "_offsets"] = _StringTable.pack(strings)
+        hashes = np.array([_term_hash(t) for t in terms],dtype=np.int64)
+        arrays["term_hash_order"] = np.argsort(hashes,kind="stable")
+        arrays["term_hashes"] = hashes[arrays["term_hash_order"]]
+        derived = _derived(self.node_ids,node_keys,self.out_offsets,self.targets,edge_keys)
+        for name in _derived_columns:
+            arrays[name.lstrip("_")] = derived[name]
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        os.makedirs(temp_path)
+        files = {}
+        # Other attributes are packed as tagged JSON, so loading never unpickles.
+        for kind,columns in (("node_columns",self.node_columns),("edge_columns",self.edge_columns)):
+            for i,column in enumerate(columns.values()):
+                name = f'{kind}_{i}'
+                arrays[name],arrays[name + "_offsets"] = _ValueColumn.pack(column)
+        for name,value in arrays.items():
+            files[name + ".npy"] = _save_array(temp_path,name,np.ascontiguousarray(value))
+        manifest = {"version" : snapshot_version,
+                    "stride" : derived["_stride"],
+                    "node_columns" : list(self.node_columns),
+                    "edge_columns" : list(self.edge_columns),
+                    "files" : files}
+        with open(os.path.join(temp_path,snapshot_manifest),"w") as f:
+            json.dump(manifest,f,indent=1)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(temp_path,path)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __iter__(self):
+        return iter(self.node_ids.tolist())
+
+    def __contains__(self,node):
+        return self._position(node) is not None
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    @property
+    def edges(self):
+        return _EdgeView(self)
+
+    def out_edges(self,nbunch=None,keys=False,data=False,default=None):
+        return self.edges(nbunch,keys=keys,data=data,default=default)
+
+    def in_edges(self,nbunch=None,keys=False,data=False,default=None):
+        if nbunch is None:
+            edges = self.in_order
+        else:
+            edges = [self.in_order[self.in_offsets[p]:self.in_offsets[p + 1]]
+                     for p in self._positions(nbunch)]
+            edges = np.concatenate(edges) if len(edges) > 0 else []
+        return [self._edge_tuple(e,keys,data,default) for e in edges]
+
+    def number_of_edges(self):
+        return len(self.targets)
+
+    def is_directed(self):
+        return True
+
+    def is_multigraph(self):
+        return True
+
+    def max_node(self):
+        if len(self.node_ids) == 0:
+            return None
+        return int(self.node_ids.max())
+
+    def entity_nodes(self,entity):
+        '''
+        Returns the node ids carrying entity as their key, in node order.
+        '''
+        code = self.terms.code(entity)
+        if code is None:
+            return []
+        lo,hi = np.searchsorted(self._keys_sorted,[code,code + 1])
+        positions = np.sort(self._by_key[lo:hi])
+        return self.node_ids[positions].tolist()
+
+    def match_edges(self,predicates=None,objects=None):
+        '''
+        Returns (u,v,k) for edges whose predicate and/or
+        object term is within the given terms.
+        '''
+        order,ranges = self._match_ranges(predicates,objects)
+        return [self._edge_tuple(e,True,False) for lo,hi in ranges for e in order[lo:hi]]
+
+    def count_edges(self,predicates=None,objects=None):
+        '''
+        Returns the number of edges match_edges would return.
+        '''
+        order,ranges = self._match_ranges(predicates,objects)
+        return sum(int(hi - lo) for lo,hi in ranges)
+
+    def to_networkx(self):
+        '''
+        Structural networkx copy (no attributes), built once for
+        algorithms such as the networkx layouts.
+        '''
+        if self._networkx is None:
+            graph = nx.MultiDiGraph()
+            graph.add_nodes_from(self.node_ids.tolist())
+            sources = self.node_ids[self._sources].tolist()
+            targets = self.node_ids[self.targets].tolist()
+            graph.add_edges_from(zip(sources,targets,range(len(targets)),
+                                ({"weight" : w} for w in self.edge_weights.tolist())))
+            self._networkx = graph
+        return self._networkx
+
+    def _match_ranges(self,predicates,objects):
+        predicates = [self.terms.code(p) for p in predicates or []]
+        objects = [self.terms.code(o) for o in objects or []]
+        if predicates and objects:
+            keys = [p * self._stride + o for p in predicates for o in objects
+                    if p is not None and o is not None and p < self._stride and o < self._stride]
+            order,sorted_keys = self._by_po,self._po_sorted
+        elif predicates:
+            keys = predicates
+            order,sorted_keys = self._by_p,self._p_sorted
+        else:
+            keys = objects
+            order,sorted_keys = self._by_o,self._o_sorted
+        ranges = [np.searchsorted(sorted_keys,[key,key + 1]) for key in dict.fromkeys(keys) if key is not None]
+        return order,ranges
+
+    def _build_derived(self):
+        derived = _derived(self.node_ids,self.node_keys,self.out_offsets,self.targets,self.edge_keys)
+        for name,value in derived.items():
+            setattr(self,name,value)
+
+    def _position(self,node):
+        if not isinstance(node,(int,np.integer)) or isinstance(node,bool):
+            return None
+        index = np.searchsorted(self._ids_sorted,node)
+        if index < len(self._ids_sorted) and self._ids_sorted[index] == node:
+            return int(self._id_order[index])
+        return None
+
+    def _positions(self,nbunch):
+        # Mirrors networkx, nbunch is either a single node or a container of nodes.
+        position = self._position(nbunch)
+        if position is not None:
+            return [position]
+        try:
+            positions = [self._position(n) for n in nbunch]
+        except TypeError:
+            return []
+        return [p for p in positions if p is not None]
+
+    def _node_data(self,position):
+        data = {}
+        key = self.node_keys[position]
+        if key >= 0:
+            data["key"] = self.terms.decode(key)
+        name = self.node_names[position]
+        if name >= 0:
+            data["display_name"] = self.names[name]
+        for attr,column in self.node_columns.items():
+            value = column[position]
+            if value is not _missing:
+                data[attr] = value
+        return data
+
+    def _edge_data(self,edge):
+        data = {"weight" : float(self.edge_weights[edge])}
+        name = self.edge_names[edge]
+        if name >= 0:
+            data["display_name"] = self.names[name]
+        for attr,column in self.edge_columns.items():
+            value = column[edge]
+            if value is not _missing:
+                data[attr] = value
+        return data
+
+    def _edge_key(self,edge):
+        return self.terms.decode_triple(self.edge_keys[edge].tolist())
+
+    def _edge_tuple(self,edge,keys=False,data=False,default=None):
+        u = int(self.node_ids[self._sources[edge]])
+        v = int(self.node_ids[self.targets[edge]])
+        edge_tuple = (u,v)
+        if keys:
+            edge_tuple += (self._edge_key(edge),)
+        if data is True:
+            edge_tuple += (self._edge_data(edge),)
+        elif data is not False:
+            edge_tuple += (self._edge_data(edge).get(data,default),)
+        return edge_tuple
+
+    def _find_edge(self,u,v,key):
+        position = self._position(u)
+        target = self._position(v)
+        if position is None or target is None:
+            raise KeyError((u,v,key))
+        codes = [self.terms.code(t) for t in key]
+        for edge in range(self.out_offsets[position],self.out_offsets[position + 1]):
+            if self.targets[edge] == target and self.edge_keys[edge].tolist() == codes:
+                return edge
+        raise KeyError((u,v,key))
+
+
+class _NodeView:
+    def __init__(self,graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return iter(self._graph)
+
+    def __len__(self):
+        return len(self._graph)
+
+    def __contains__(self,node):
+        return node in self._graph
+
+    def __getitem__(self,node):
+        position = self._graph._position(node)
+        if position is None:
+            raise KeyError(node)
+        return self._graph._node_data(position)
+
+    def __call__(self,data=False,default=None):
+        if data is False:
+            return self
+        return self.data(data,default)
+
+    def items(self):
+        return self.data(True)
+
+    def data(self,data=True,default=None):
+        node_ids = self._graph.node_ids.tolist()
+        if data is True:
+            return [(n,self._graph._node_data(i)) for i,n in enumerate(node_ids)]
+        return [(n,self._graph._node_data(i).get(data,default)) for i,n in enumerate(node_ids)]
+
+
+class _EdgeView:
+    def __init__(self,graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return iter(self(keys=True))
+
+    def __len__(self):
+        return self._graph.number_of_edges()
+
+    def __getitem__(self,edge):
+        u,v,key = edge
+        return self._graph._edge_data(self._graph._find_edge(u,v,key))
+
+    def __call__(self,nbunch=None,keys=False,data=False,default=None):
+        graph = self._graph
+        if nbunch is None:
+            edges = range(graph.number_of_edges())
+        else:
+            edges = [e for p in graph._positions(nbunch)
+                     for e in range(graph.out_offsets[p],graph.out_offsets[p + 1])]
+        return [graph._edge_tuple(e,keys,data,default) for e in edges]
+
+
+class _StringTable:
+    '''
+    Strings packed as UTF-8 bytes with offsets, decoded on access.
+    '''
+    def __init__(self,data,offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @staticmethod
+    def pack(strings):
+        encoded = [s.encode() for s in strings]
+        offsets = np.zeros(len(encoded) + 1,dtype=np.int64)
+        np.cumsum([len(e) for e in encoded],out=offsets[1:])
+        return np.frombuffer(b"".join(encoded),dtype=np.uint8),offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self,index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode()
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _ValueColumn(_StringTable):
+    '''
+    Attribute column of a snapshot, each value packed as tagged JSON and
+    decoded on access. An empty entry is a node or edge without it.
+    '''
+    def __init__(self,data,offsets):
+        super().__init__(data,offsets)
+        self._values = {}
+
+    @staticmethod
+    def pack(column):
+        return _StringTable.pack([_encode_value(v) if v is not _missing else "" 
+                                  for v in (column[i] for i in range(len(column)))])
+
+    def __getitem__(self,index):
+        value = self._values.get(index,_missing)
+        if value is _missing:
+            encoded = super().__getitem__(index)
+            if encoded != "":
+                value = _decode_value(json.loads(encoded))
+                self._values[index] = value
+        return value
+
+
+class _SnapshotTerms:
+    '''
+    Read-only term table of a snapshot. Terms are decoded on first use 
+    and found by a binary search over their sorted hashes.
+    '''
+    def __init__(self,kinds,prefix_codes,prefixes,values,datatypes,langs,hashes,hash_order):
+        self.kinds = kinds
+        self.prefix_codes = prefix_codes
+        self.prefixes = prefixes
+        self.values = values
+        self.datatypes = datatypes
+        self.langs = langs
+        self.hashes = hashes
+        self.hash_order = hash_order
+        self._terms = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def code(self,term):
+        try:
+            encoded = _encode_term(term)
+        except TypeError:
+            return None
+        term_hash = _term_hash(encoded)
+        lo = np.searchsorted(self.hashes,term_hash,side="left")
+        hi = np.searchsorted(self.hashes,term_hash,side="right")
+        for code in self.hash_order[lo:hi].tolist():
+            if self.decode(code) == term:
+                return code
+        return None
+
+    def decode(self,code):
+        term = self._terms.get(code)
+        if term is None:
+            value = self.values[code]
+            prefix = int(self.prefix_codes[code])
+            if prefix >= 0:
+                value = self.prefixes[prefix] + value
+            encoded = (int(self.kinds[code]),value,self.datatypes[code],self.langs[code])
+            term = term_table.intern(_decode_term(encoded))
+            self._terms[code] = term
+        return term
+
+    def decode_triple(self,codes):
+        return tuple(self.decode(c) for c in codes)
+
+
+def _derived(node_ids,node_keys,out_offsets,targets,edge_keys):
+    derived = {}
+    num_nodes = len(node_ids)
+    derived["_sources"] = np.repeat(np.arange(num_nodes,dtype=np.int64),np.diff(out_offsets))
+    derived["_id_order"] = np.argsort(node_ids,kind="stable")
+    derived["_ids_sorted"] = node_ids[derived["_id_order"]]
+
+    derived["in_order"] = np.argsort(targets,kind="stable")
+    derived["in_offsets"] = np.zeros(num_nodes + 1,dtype=np.int64)
+    np.cumsum(np.bincount(targets,minlength=num_nodes),out=derived["in_offsets"][1:])
+
+    derived["_by_key"] = np.argsort(node_keys,kind="stable")
+    derived["_keys_sorted"] = node_keys[derived["_by_key"]]
+
+    predicates = edge_keys[:,1]
+    objects = node_keys[targets]
+    stride = int(max(predicates.max(initial=0),objects.max(initial=0))) + 1
+    derived["_stride"] = stride
+    derived["_by_p"] = np.argsort(predicates,kind="stable")
+    derived["_p_sorted"] = predicates[derived["_by_p"]]
+    derived["_by_o"] = np.argsort(objects,kind="stable")
+    derived["_o_sorted"] = objects[derived["_by_o"]]
+    pred_obj = predicates * stride + objects
+    derived["_by_po"] = np.argsort(pred_obj,kind="stable")
+    derived["_po_sorted"] = pred_obj[derived["_by_po"]]
+    return derived
+
+
+def _term_code(term):
+    if term is None:
+        return -1
+    return term_table.encode(term)
+
+
+def _encode_term(term):
+    if isinstance(term,Literal):
+        datatype = "" if term.datatype is None else str(term.datatype)
+        return (literal_term,str(term),datatype,term.language or "")
+    if isinstance(term,BNode):
+        return (bnode_term,str(term),"","")
+    if isinstance(term,URIRef):
+        return (uri_term,str(term),"","")
+    raise TypeError(f"{term!r} is not an RDF term.")
+
+
+def _decode_term(encoded):
+    kind,value,datatype,lang = encoded
+    if kind == literal_term:
+        return Literal(value,lang=lang or None,datatype=datatype or None)
+    if kind == bnode_term:
+        return BNode(value)
+    return URIRef(value)
+
+
+def _encode_value(value):
+    # JSON tagged by type so terms and containers round trip.
+    return json.dumps(_tag_value(value),separators=(",",":"))
+
+
+def _tag_value(value):
+    if value is None or isinstance(value,(bool,int,float)):
+        return ["v",value]
+    if isinstance(value,(URIRef,BNode,Literal)):
+        return ["t",*_encode_term(value)]
+    if isinstance(value,str):
+        return ["v",value]
+    if isinstance(value,np.generic):
+        return ["v",value.item()]
+    if isinstance(value,(list,tuple)):
+        return ["l" if isinstance(value,list) else "u",[_tag_value(v) for v in value]]
+    if isinstance(value,dict):
+        return ["d",[[_tag_value(k),_tag_value(v)] for k,v in value.items()]]
+    if isinstance(value,(set,frozenset)):
+        return ["s",[_tag_value(v) for v in value]]
+    raise ValueError(f"Attribute value {value!r} can't be stored in a snapshot.")
+
+
+def _decode_value(tagged):
+    tag,*value = tagged
+    if tag == "v":
+        return value[0]
+    if tag == "t":
+        return term_table.intern(_decode_term(value))
+    if tag == "l":
+        return [_decode_value(v) for v in value[0]]
+    if tag == "u":
+        return tuple(_decode_value(v) for v in value[0])
+    if tag == "d":
+        return {_decode_value(k) : _decode_value(v) for k,v in value[0]}
+    if tag == "s":
+        return {_decode_value(v) for v in value[0]}
+    raise ValueError(f"Unknown attribute tag {tag!r} in snapshot.")
+
+
+def _term_hash(encoded):
+    # Stable across processes, unlike hash().
+    digest = hashlib.blake2b("\x00".join(map(str,encoded)).encode(),digest_size=8).digest()
+    return int.from_bytes(digest,"little",signed=True)
+
+
+def _save_array(directory,name,array):
+    path = os.path.join(directory,name + ".npy")
+    np.save(path,array,allow_pickle=False)
+    return _file_checksum(path)
+
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path,"rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
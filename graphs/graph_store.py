@@ -0,0 +1,30 @@
+from rdflib.store import Store
+
+class GraphStore(Store):
+    '''
+    Read-only rdflib store answering triple patterns from an AbstractGraph,
+    so rdflib graphs and SPARQL evaluation run over its indexes without
+    copying the triples. Lookups raise TimeoutError once deadline, a
+    time.monotonic value, has passed, checked for every candidate edge
+    scanned rather than only for matches.
+    '''
+    def __init__(self,graph,deadline=None):
+        super().__init__()
+        self.graph = graph
+        self.deadline = deadline
+
+    def triples(self,triple_pattern,context=None):
+        for match in self.graph.iter_search(triple_pattern,deadline=self.deadline):
+            yield match[2],iter(())
+
+    def __len__(self,context=None):
+        return sum(1 for _ in self.triples((None,None,None)))
+
+    def contexts(self,triple=None):
+        return iter(())
+
+    def add(self,triple,context,quoted=False):
+        raise ValueError("GraphStore is read-only, mutate the graph it wraps instead.")
+
+    def remove(self,triple,context=None):
+        raise ValueError("GraphStore is read-only, mutate the graph it wraps instead.")
@@ -5,21 +5,27 @@ from util.kg_identifiers import identifiers
 from graphs.abstract_graph import AbstractGraph
 
 class KnowledgeGraph(AbstractGraph):
-    def __init__(self,graph):
-        super().__init__(graph)
+    def __init__(self,graph,literals_as_attributes=False):
+        super().__init__(graph,literals_as_attributes)
         
     def get_descriptors(self,entity=None):
         if entity is not None:
-            return [d[1] for d in self.search((entity,identifiers.predicates.role,None))]
-        return [d[0] for d in self.search((None,identifiers.predicates.rdf_type, identifiers.objects.descriptor_type))]
+            return [d[1] for d in self.iter_search((entity,identifiers.predicates.role,None))]
+        return [d[0] for d in self.iter_search((None,identifiers.predicates.rdf_type, identifiers.objects.descriptor_type))]
 
     def get_entities(self,descriptor=None):
         if descriptor is not None:
-            return [e[0] for e in self.search((None,identifiers.predicates.role,descriptor))]
-        return [e[0] for e in self.search((None,identifiers.predicates.rdf_type,identifiers.objects.entity_type))]
+            return [e[0] for e in self.iter_search((None,identifiers.predicates.role,descriptor))]
+        return [e[0] for e in self.iter_search((None,identifiers.predicates.rdf_type,identifiers.objects.entity_type))]
 
-    def get_aliases(self,identifier=None):
-        return self.search((identifier,identifiers.predicates.alias,None))
+    def get_aliases(self,identifier=None,limit=None):
+        return self.search((identifier,identifiers.predicates.alias,None),limit=limit)
+
+    def get_batch_descriptors(self,entities):
+        return self.get_batch_facts(entities,identifiers.predicates.role)
+
+    def get_batch_aliases(self,subjects):
+        return self.get_batch_facts(subjects,identifiers.predicates.alias)
 
     def get_subjects(self,descriptor=None):
         return self.search((descriptor,identifiers.predicates.interaction_subject,None))
@@ -30,9 +36,15 @@ class KnowledgeGraph(AbstractGraph):
     def get_objects(self,descriptor=None):
         return self.search((descriptor,identifiers.predicates.interaction_object,None))
 
+    def get_batch_subjects(self,descriptors):
+        return self.get_batch_facts(descriptors,identifiers.predicates.interaction_subject)
+
+    def get_batch_objects(self,descriptors):
+        return self.get_batch_facts(descriptors,identifiers.predicates.interaction_object)
+
     def get_interactions(self,entity=None):
         return self.search((entity,identifiers.predicates.interactions,None))
 
     def get_interaction(self,predicate_map):
-        return [a[0] for a in self.search((None,identifiers.predicates.predicate_map,predicate_map),lazy=True)]
+        return [a[0] for a in self.iter_search((None,identifiers.predicates.predicate_map,predicate_map),limit=1)]
     
\ No newline at end of file
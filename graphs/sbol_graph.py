@@ -1,15 +1,20 @@
-from rdflib import URIRef
+from rdflib import URIRef,Variable
 import networkx as nx
 
 from graphs.abstract_graph import AbstractGraph
 from util.sbol_identifiers import identifiers
 
 class SBOLGraph(AbstractGraph):
-    def __init__(self,graph):
-        super().__init__(graph)       
+    fact_predicates = (identifiers.predicates.rdf_type,
+                       identifiers.predicates.type,
+                       identifiers.predicates.role,
+                       identifiers.predicates.definition)
+
+    def __init__(self,graph,literals_as_attributes=False):
+        super().__init__(graph,literals_as_attributes)       
 
     def get_component_definitions(self):
-        return [cd[0] for cd in self.search((None,identifiers.predicates.rdf_type,
+        return [cd[0] for cd in self.iter_search((None,identifiers.predicates.rdf_type,
                                 identifiers.objects.component_definition))]
 
     def get_component_instances(self):
@@ -17,76 +22,126 @@ class SBOLGraph(AbstractGraph):
                 identifiers.predicates.functional_component],None))
 
     def get_module_definitions(self):
-        return [md[0] for md in self.search((None,identifiers.predicates.rdf_type,
+        return [md[0] for md in self.iter_search((None,identifiers.predicates.rdf_type,
                                             identifiers.objects.module_definition))]
 
 
     def get_definition(self,component):
-        definition = self.search((component,identifiers.predicates.definition,None),lazy=True)
+        definition = self.get_facts(component,identifiers.predicates.definition)
         if definition != []:
-            return definition[1]
+            return definition[0]
 
     def get_type(self,subject):
-        r_type = self.search((subject,identifiers.predicates.type,None),lazy=True)
+        r_type = self.get_facts(subject,identifiers.predicates.type)
         if r_type != []:
-            return r_type[1]
+            return r_type[0]
 
     def get_role(self,subject):
-        role = self.search((subject,identifiers.predicates.role,None),lazy=True)
+        role = self.get_facts(subject,identifiers.predicates.role)
         if role != []:
-            return role[1]
+            return role[0]
 
     def get_types(self,subject):
-        return [t[1] for t in self.search((subject,identifiers.predicates.type,None))]
+        return self.get_facts(subject,identifiers.predicates.type)
         
     def get_roles(self,subject):
-        return [t[1] for t in self.search((subject,identifiers.predicates.role,None))]
+        return self.get_facts(subject,identifiers.predicates.role)
+
+    def get_batch_types(self,subjects):
+        return self.get_batch_facts(subjects,identifiers.predicates.type)
+
+    def get_batch_roles(self,subjects):
+        return self.get_batch_facts(subjects,identifiers.predicates.role)
+
+    def get_batch_definitions(self,components):
+        return self.get_batch_facts(components,identifiers.predicates.definition)
+
+    def get_batch_participations(self,interactions):
+        return self.get_batch_facts(interactions,identifiers.predicates.participation)
+
+    def get_batch_components(self,subjects):
+        return self.get_batch_facts(subjects,identifiers.predicates.component)
+
+    def get_batch_modules(self,mds):
+        return self.get_batch_facts(mds,identifiers.predicates.module)
+
+    def get_batch_interactions(self,mds):
+        return self.get_batch_facts(mds,identifiers.predicates.interaction)
+
+    def get_batch_functional_components(self,mds):
+        return self.get_batch_facts(mds,identifiers.predicates.functional_component)
 
     def get_participations(self,interaction):
-        return [i[1] for i in self.search((interaction,identifiers.predicates.participation,None))] 
+        return [i[1] for i in self.iter_search((interaction,identifiers.predicates.participation,None))] 
 
     def get_sequence_annotations(self,cd):
-        return [sa[1] for sa in self.search((cd,identifiers.predicates.sequence_annotation,None))]
+        return [sa[1] for sa in self.iter_search((cd,identifiers.predicates.sequence_annotation,None))]
 
     def get_sequence_constraints(self,cd):
-        return [sc[1] for sc in self.search((cd,identifiers.predicates.sequence_constraint,None))]
+        return [sc[1] for sc in self.iter_search((cd,identifiers.predicates.sequence_constraint,None))]
 
     def get_locations(self,sa):
-        return [l[1] for l in self.search((sa,identifiers.predicates.location,None))]
+        return [l[1] for l in self.iter_search((sa,identifiers.predicates.location,None))]
 
     def get_components(self,cd=None,sa=None):
         if cd is not None: s = cd
         elif sa is not None: s = sa
         else: s = None
-        return [c[1] for c in self.search((s,identifiers.predicates.component,None))]
+        return [c[1] for c in self.iter_search((s,identifiers.predicates.component,None))]
     
     def get_modules(self,md=None):
         if md is not None: s = md
-        return [c[1] for c in self.search((s,identifiers.predicates.module,None))]
+        return [c[1] for c in self.iter_search((s,identifiers.predicates.module,None))]
 
     def get_interactions(self,md=None):
-        return [i[1] for i in self.search((md,identifiers.predicates.interaction,None))]
+        return [i[1] for i in self.iter_search((md,identifiers.predicates.interaction,None))]
 
     def get_functional_components(self,md=None):
-        return [fc[1] for fc in self.search((md,identifiers.predicates.functional_component,None))]
+        return [fc[1] for fc in self.iter_search((md,identifiers.predicates.functional_component,None))]
 
     def get_component_definition(self,participation=None):
         if participation is not None:
-            fc = self.search((participation,identifiers.predicates.participant,None),lazy=True)
-            if fc is None:
-                return None
-            fc = fc[1][1]["key"]
-            cd = self.get_definition(fc)
-            return cd
+            fc,cd = Variable("fc"),Variable("cd")
+            matches = self.query([(participation,identifiers.predicates.participant,fc),
+                                  (fc,identifiers.predicates.definition,cd)])
+            if matches != []:
+                cd = matches[0][cd]
+                return [cd,self._node_data(cd)]
+
+    def get_batch_component_definitions(self,participations):
+        '''
+        Returns {participation : [node,data]} as get_component_definition
+        would, None where a participation has no defined participant.
+        '''
+        participants = self.get_batch_facts(participations,identifiers.predicates.participant)
+        definitions = self.get_batch_definitions({fc[0] : None for fcs in participants.values() for fc in fcs})
+        cds = {}
+        for participation,fcs in participants.items():
+            cds[participation] = next((definitions[fc[0]][0] for fc in fcs if definitions[fc[0]] != []),None)
+        return cds
 
     def get_heirachy_instances(self,cd=None):
-        return [c[0] for c in self.search((None,identifiers.predicates.definition,cd))]
+        return [c[0] for c in self.iter_search((None,identifiers.predicates.definition,cd))]
 
     def get_top_levels(self):
-        return [tl[0] for tl in self.search((None,identifiers.predicates.rdf_type,identifiers.objects.top_levels))]
+        return [tl[0] for tl in self.iter_search((None,identifiers.predicates.rdf_type,identifiers.objects.top_levels))]
 
     def get_maps_to(self,md=None):
-        return [m[1] for m in self.search((md,identifiers.predicates.maps_to,None))]
+        return [m[1] for m in self.iter_search((md,identifiers.predicates.maps_to,None))]
+
+    def get_module_maps(self,md):
+        '''
+        Returns (local,remote) node ids for the mapsTo of each module 
+        of md which has exactly one local and one remote.
+        '''
+        module,maps_to,local,remote = (Variable(v) for v in ("module","maps_to","local","remote"))
+        maps = {}
+        for match in self.query([(md,identifiers.predicates.module,module),
+                                 (module,identifiers.predicates.maps_to,maps_to),
+                                 (maps_to,identifiers.predicates.local,local),
+                                 (maps_to,identifiers.predicates.remote,remote)]):
+            maps.setdefault((match[module],match[maps_to]),[]).append((match[local],match[remote]))
+        return [pairs[0] for pairs in maps.values() if len(pairs) == 1]
     
     def get_property(self,subject,predicate):
-        return [p[1] for p in self.search((subject,predicate,None))]
\ No newline at end of file
+        return [p[1] for p in self.iter_search((subject,predicate,None))]
\ No newline at end of file
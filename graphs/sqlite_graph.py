@@ -0,0 +1,373 @@
+import os
+import sqlite3
+from pathlib import Path
+from functools import lru_cache
+
+import networkx as nx
+from rdflib import URIRef,BNode,Literal,Graph
+from rdflib.store import Store
+
+from util.term_table import term_table
+from util.names import get_name
+from util.graph_cache import uri_term,bnode_term,literal_term
+from util.line_parser import line_format,line_chunks,parse_lines
+
+schema_version = 1
+sqlite_suffix = ".sqlite"
+batch_size = 10000
+term_cache_size = 1 << 16
+
+class SQLiteGraph:
+    '''
+    Read-only graph storage backed by an indexed SQLite database on disk.
+    Nodes, edges and their attributes are read on demand so graphs far
+    larger than memory can be searched, and the views built from them
+    hold only what they touch. Exposes the same subset of the networkx
+    MultiDiGraph interface as CSRGraph.
+    '''
+    def __init__(self,path):
+        uri = f'{Path(path).resolve().as_uri()}?mode=ro'
+        self.path = path
+        self.node_columns = {}
+        self._connection = sqlite3.connect(uri,uri=True,check_same_thread=False)
+        version = self._connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or int(version[0]) != schema_version:
+            raise ValueError(f"{path} is not a graph database of schema version {schema_version}.")
+        self._term_row = lru_cache(maxsize=term_cache_size)(self._load_term_row)
+        self._networkx = None
+        self._len = None
+
+    @classmethod
+    def create(cls,path,sources):
+        '''
+        Imports one or more RDF files into a new database at path,
+        streaming triples to disk rather than building them in memory.
+        '''
+        if isinstance(sources,(str,os.PathLike)):
+            sources = [sources]
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.executescript(_schema)
+            ingest = _SQLiteIngest(connection)
+            for source in sources:
+                rdf_format = line_format(source)
+                if rdf_format is None:
+                    Graph(store=ingest).parse(source)
+                    continue
+                scope = f'{BNode()}_'
+                for start,end in line_chunks(source):
+                    parse_lines(source,start,end,rdf_format,ingest,scope)
+            ingest.flush()
+            connection.create_function("display_name",4,_display_name)
+            connection.executescript(_finalise)
+            connection.execute("INSERT INTO meta VALUES ('schema_version',?)",(str(schema_version),))
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(temp_path,path)
+        return cls(path)
+
+    def __len__(self):
+        if self._len is None:
+            self._len = self._connection.execute("SELECT count(*) FROM nodes").fetchone()[0]
+        return self._len
+
+    def __iter__(self):
+        return (row[0] for row in self._connection.execute("SELECT id FROM nodes ORDER BY id"))
+
+    def __contains__(self,node):
+        if not isinstance(node,int) or isinstance(node,bool):
+            return False
+        return self._connection.execute("SELECT 1 FROM nodes WHERE id = ?",(node,)).fetchone() is not None
+
+    @property
+    def nodes(self):
+        return _NodeView(self)
+
+    @property
+    def edges(self):
+        return _EdgeView(self)
+
+    def out_edges(self,nbunch=None,keys=False,data=False,default=None):
+        return self.edges(nbunch,keys=keys,data=data,default=default)
+
+    def in_edges(self,nbunch=None,keys=False,data=False,default=None):
+        return _EdgeQuery(self,"o",nbunch,keys,data,default)
+
+    def number_of_edges(self):
+        return self._connection.execute("SELECT count(*) FROM edges").fetchone()[0]
+
+    def is_directed(self):
+        return True
+
+    def is_multigraph(self):
+        return True
+
+    def max_node(self):
+        return self._connection.execute("SELECT max(id) FROM nodes").fetchone()[0]
+
+    def entity_nodes(self,entity):
+        '''
+        Returns the node ids carrying entity as their key.
+        '''
+        term_id = self._term_id(entity)
+        if term_id is None or term_id not in self:
+            return []
+        return [term_id]
+
+    def match_edges(self,predicates=None,objects=None):
+        '''
+        Yields (u,v,k) for edges whose predicate and/or
+        object term is within the given terms.
+        '''
+        for where,params in self._match_queries(predicates,objects):
+            yield from self._edge_tuples(self._select(where,params),True,False)
+
+    def count_edges(self,predicates=None,objects=None):
+        '''
+        Returns the number of edges match_edges would yield.
+        '''
+        return sum(self._connection.execute(f"SELECT count(*) FROM edges WHERE {where}",params).fetchone()[0]
+                   for where,params in self._match_queries(predicates,objects))
+
+    def to_networkx(self):
+        '''
+        Structural networkx copy (no attributes), built once for
+        algorithms such as the networkx layouts.
+        '''
+        if self._networkx is None:
+            graph = nx.MultiDiGraph()
+            graph.add_nodes_from(self)
+            graph.add_edges_from((s,o,i,{"weight" : 1}) for i,(s,p,o) in enumerate(self._select()))
+            self._networkx = graph
+        return self._networkx
+
+    def _match_queries(self,predicates,objects):
+        predicates = [self._term_id(p) for p in predicates or []]
+        objects = [self._term_id(o) for o in objects or []]
+        if predicates and objects:
+            queries = [("p = ? AND o = ?",(p,o)) for p in predicates for o in objects]
+        elif predicates:
+            queries = [("p = ?",(p,)) for p in predicates]
+        else:
+            queries = [("o = ?",(o,)) for o in objects]
+        return [(where,params) for where,params in dict.fromkeys(queries) if None not in params]
+
+    def _select(self,where=None,params=()):
+        query = "SELECT s,p,o FROM edges"
+        if where is not None:
+            query += f" WHERE {where}"
+        return self._connection.execute(query + " ORDER BY rowid",params)
+
+    def _select_around(self,column,nodes):
+        for node in nodes:
+            yield from self._select(f"{column} = ?",(node,))
+
+    def _nbunch(self,nbunch):
+        # Mirrors networkx, nbunch is either a single node or a container of nodes.
+        if nbunch in self:
+            return [nbunch]
+        try:
+            return [n for n in nbunch if n in self]
+        except TypeError:
+            return []
+
+    def _load_term_row(self,term_id):
+        row = self._connection.execute("SELECT kind,value,datatype,lang,name FROM terms WHERE id = ?",
+                                       (term_id,)).fetchone()
+        if row is None:
+            raise KeyError(term_id)
+        return term_table.intern(_decode_term(*row[:4])),row[4]
+
+    def _term_id(self,term):
+        row = self._connection.execute("SELECT id FROM terms WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?",
+                                       _encode_term(term)).fetchone()
+        return None if row is None else row[0]
+
+    def _node_data(self,node):
+        if node not in self:
+            raise KeyError(node)
+        key,name = self._term_row(node)
+        return {"key" : key,"display_name" : name}
+
+    def _edge_data(self,p):
+        return {"weight" : 1,"display_name" : self._term_row(p)[1]}
+
+    def _edge_key(self,s,p,o):
+        return (self._term_row(s)[0],self._term_row(p)[0],self._term_row(o)[0])
+
+    def _edge_tuples(self,rows,keys=False,data=False,default=None):
+        for s,p,o in rows:
+            edge_tuple = (s,o)
+            if keys:
+                edge_tuple += (self._edge_key(s,p,o),)
+            if data is True:
+                edge_tuple += (self._edge_data(p),)
+            elif data is not False:
+                edge_tuple += (self._edge_data(p).get(data,default),)
+            yield edge_tuple
+
+    def _find_edge(self,u,v,key):
+        s,p,o = (self._term_id(t) for t in key)
+        row = self._connection.execute("SELECT p FROM edges WHERE s = ? AND p = ? AND o = ?",
+                                       (u,p,v)).fetchone()
+        if row is None or s != u or o != v:
+            raise KeyError((u,v,key))
+        return row[0]
+
+
+class _NodeView:
+    def __init__(self,graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return iter(self._graph)
+
+    def __len__(self):
+        return len(self._graph)
+
+    def __contains__(self,node):
+        return node in self._graph
+
+    def __getitem__(self,node):
+        return self._graph._node_data(node)
+
+    def __call__(self,data=False,default=None):
+        if data is False:
+            return self
+        return self.data(data,default)
+
+    def items(self):
+        return self.data(True)
+
+    def data(self,data=True,default=None):
+        for node in self._graph:
+            key,name = self._graph._term_row(node)
+            node_data = {"key" : key,"display_name" : name}
+            yield (node,node_data) if data is True else (node,node_data.get(data,default))
+
+
+class _EdgeView:
+    def __init__(self,graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return iter(self(keys=True))
+
+    def __len__(self):
+        return self._graph.number_of_edges()
+
+    def __getitem__(self,edge):
+        u,v,key = edge
+        return self._graph._edge_data(self._graph._find_edge(u,v,key))
+
+    def __call__(self,nbunch=None,keys=False,data=False,default=None):
+        return _EdgeQuery(self._graph,"s",nbunch,keys,data,default)
+
+
+class _EdgeQuery:
+    '''
+    Edges of a node bunch (or all edges) read from the database each time
+    they are iterated, so large results are never held in memory.
+    '''
+    def __init__(self,graph,column,nbunch,keys,data,default):
+        self._graph = graph
+        self._column = column
+        self._nodes = None if nbunch is None else graph._nbunch(nbunch)
+        self._args = (keys,data,default)
+
+    def __iter__(self):
+        graph = self._graph
+        if self._nodes is None:
+            rows = graph._select()
+        else:
+            rows = graph._select_around(self._column,self._nodes)
+        return graph._edge_tuples(rows,*self._args)
+
+    def __len__(self):
+        if self._nodes is None:
+            return self._graph.number_of_edges()
+        query = f"SELECT count(*) FROM edges WHERE {self._column} = ?"
+        return sum(self._graph._connection.execute(query,(n,)).fetchone()[0] for n in self._nodes)
+
+
+class _SQLiteIngest(Store):
+    '''
+    rdflib store that stages each parsed triple in the database in batches.
+    '''
+    context_aware = True
+
+    def __init__(self,connection):
+        super().__init__()
+        self.connection = connection
+        self.batch = []
+
+    def add(self,triple,context=None,quoted=False):
+        self.batch.append(sum((_encode_term(t) for t in triple),()))
+        if len(self.batch) >= batch_size:
+            self.flush()
+
+    def flush(self):
+        self.connection.executemany(f"INSERT INTO staging VALUES ({','.join('?' * 12)})",self.batch)
+        self.batch = []
+
+
+def _encode_term(term):
+    # Empty strings rather than NULL, NULLs are never equal within a UNIQUE constraint.
+    if isinstance(term,Literal):
+        datatype = "" if term.datatype is None else str(term.datatype)
+        return (literal_term,str(term),datatype,term.language or "")
+    if isinstance(term,BNode):
+        return (bnode_term,str(term),"","")
+    return (uri_term,str(term),"","")
+
+
+def _decode_term(kind,value,datatype,lang):
+    if kind == literal_term:
+        return Literal(value,lang=lang or None,datatype=datatype or None)
+    if kind == bnode_term:
+        return BNode(value)
+    return URIRef(value)
+
+
+def _display_name(kind,value,datatype,lang):
+    if kind != uri_term:
+        return value
+    return get_name(value)
+
+
+_schema = '''
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE staging (s_kind INTEGER, s_value TEXT, s_datatype TEXT, s_lang TEXT,
+                      p_kind INTEGER, p_value TEXT, p_datatype TEXT, p_lang TEXT,
+                      o_kind INTEGER, o_value TEXT, o_datatype TEXT, o_lang TEXT);
+CREATE TABLE terms (id INTEGER PRIMARY KEY, kind INTEGER NOT NULL, value TEXT NOT NULL,
+                    datatype TEXT NOT NULL, lang TEXT NOT NULL, name TEXT,
+                    UNIQUE (kind, value, datatype, lang));
+CREATE TABLE nodes (id INTEGER PRIMARY KEY);
+CREATE TABLE edges (s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL,
+                    UNIQUE (s, p, o));
+'''
+
+_finalise = '''
+INSERT OR IGNORE INTO terms (kind, value, datatype, lang)
+    SELECT kind, value, datatype, lang FROM (
+        SELECT rowid AS r, 0 AS c, s_kind AS kind, s_value AS value, s_datatype AS datatype, s_lang AS lang FROM staging
+        UNION ALL SELECT rowid, 1, p_kind, p_value, p_datatype, p_lang FROM staging
+        UNION ALL SELECT rowid, 2, o_kind, o_value, o_datatype, o_lang FROM staging)
+    ORDER BY r, c;
+INSERT OR IGNORE INTO edges (s, p, o)
+    SELECT ts.id, tp.id, tob.id FROM staging AS st
+    JOIN terms AS ts ON ts.kind = st.s_kind AND ts.value = st.s_value AND ts.datatype = st.s_datatype AND ts.lang = st.s_lang
+    JOIN terms AS tp ON tp.kind = st.p_kind AND tp.value = st.p_value AND tp.datatype = st.p_datatype AND tp.lang = st.p_lang
+    JOIN terms AS tob ON tob.kind = st.o_kind AND tob.value = st.o_value AND tob.datatype = st.o_datatype AND tob.lang = st.o_lang
+    ORDER BY st.rowid;
+DROP TABLE staging;
+INSERT OR IGNORE INTO nodes (id) SELECT s FROM edges UNION SELECT o FROM edges;
+UPDATE terms SET name = display_name(kind, value, datatype, lang);
+CREATE INDEX edges_po ON edges (p, o);
+CREATE INDEX edges_o ON edges (o);
+'''
@@ -1,12 +1,17 @@
+import os
+import glob
 import argparse
 from flask import Flask
 from dashboards.sbol_dash import SBOLDash
 from dashboards.results_dash import ResultDash
 from dashboards.kg_dash import KnowledgeDash
+from dashboards.sparql_endpoint import SPARQLEndpoint
+from graphs.csr_graph import is_snapshot
+from util.compression import is_rdf_file
 assets_dir = "assets"
 
 
-def process_input(filename,summary,knowledge):
+def process_input(filename,summary,knowledge,literals=False,query_cache=None):
     server = Flask(__name__)
     if summary:
         dashboard = ResultDash(__name__,server)
@@ -14,16 +19,56 @@ def process_input(filename,summary,knowledge):
         dashboard = KnowledgeDash(__name__,server)
     else:
         dashboard = SBOLDash(__name__,server)
-    dashboard.load_graph(filename)
+    if literals:
+        dashboard.load_graph(filename,literals)
+    else:
+        dashboard.load_graph(filename)
+    if query_cache:
+        enable_query_cache(dashboard,query_cache)
+    mount_sparql(dashboard,server)
     dashboard.run()
 
+def enable_query_cache(dashboard,maxsize):
+    '''
+    Caches lookups on the graph the dashboard loaded, so switching presets 
+    on an unchanged graph repeats no searches.
+    '''
+    builder = dashboard.visualiser._graph
+    if builder is not None:
+        builder.graph.enable_query_cache(maxsize)
+
+def mount_sparql(dashboard,server):
+    '''
+    Serves SPARQL queries at /sparql over the graph the dashboard loaded.
+    '''
+    builder = dashboard.visualiser._graph
+    if builder is not None:
+        SPARQLEndpoint(builder.graph,server)
+
+def expand_inputs(filename):
+    '''
+    A directory or glob pattern is expanded into the sorted list of files it matches.
+    Only RDF and SBOL files are kept, hidden files are skipped.
+    Snapshot directories are loaded as a single graph.
+    '''
+    if filename is None or is_snapshot(filename):
+        return filename
+    if os.path.isdir(filename):
+        filenames = [os.path.join(filename,f) for f in sorted(os.listdir(filename))]
+        return [f for f in filenames if os.path.isfile(f) and is_rdf_file(f)]
+    if glob.has_magic(filename):
+        return sorted(f for f in glob.glob(filename) if os.path.isfile(f) and is_rdf_file(f))
+    return filename
+
 def language_processor_args():
     parser = argparse.ArgumentParser(description="Network Visualisation Tool")
-    parser.add_argument('filename', default=None, nargs='?',help="File to parse as Input")
+    parser.add_argument('filename', default=None, nargs='?',help="File, directory, glob pattern of files or graph snapshot to parse as Input")
     parser.add_argument('-s', '--summary', help="Renders Summary Dashboard.", default=None, action='store_true')
     parser.add_argument("-k", "--knowledge",help="For knowledge Graph", default=None, action='store_true')
+    parser.add_argument("-l", "--literals",help="Store literal properties as node attributes rather than nodes.", default=None, action='store_true')
+    parser.add_argument("-c", "--query-cache",help="Cache the results of up to this many graph lookups.", default=None, type=int)
     return  parser.parse_args()
 
 if __name__ == "__main__":
     args = language_processor_args()
-    process_input(args.filename,args.summary,args.knowledge)
\ No newline at end of file
+    process_input(expand_inputs(args.filename),args.summary,args.knowledge,args.literals,args.query_cache)
\ No newline at end of file
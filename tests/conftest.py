@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.graph_cache import graph_cache
+
+data_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)),"data")
+
+@pytest.fixture(autouse=True)
+def isolated_graph_cache(tmp_path,monkeypatch):
+    # Converted graphs are cached per test so no test reads another's entries.
+    monkeypatch.setattr(graph_cache,"directory",str(tmp_path / "graph_cache"))
+
+
+def data_file(name):
+    return os.path.join(data_directory,name)
@@ -0,0 +1,124 @@
+import os
+
+import pytest
+from rdflib import URIRef
+
+from graphs.sbol_graph import SBOLGraph
+from builder.sbol_builder import SBOLBuilder
+from builder.knowledge_builder import KnowledgeBuilder
+from graphs.sqlite_graph import SQLiteGraph
+from util.names import node_name,edge_name
+from conftest import data_file
+
+sbol_views = ["produce_full_graph","produce_pruned_graph","produce_heirarchy_graph",
+              "produce_components_graph","produce_interaction_graph",
+              "produce_interaction_verbose_graph","produce_genetic_interaction_graph",
+              "produce_protein_protein_interaction_graph","produce_module_graph",
+              "produce_maps_graph","produce_tree"]
+knowledge_views = ["produce_synonym_graph","produce_interaction_graph","produce_entity_graph"]
+
+@pytest.fixture(params=["csr","sqlite","snapshot"])
+def backend(request,tmp_path):
+    def open_graph(cls,name):
+        # Read-only graph over the named test file, builders serve frozen views.
+        if request.param == "csr":
+            if cls in (SBOLBuilder,KnowledgeBuilder):
+                return cls(data_file(name),frozen_views=True)
+            return cls(data_file(name)).freeze()
+        if request.param == "snapshot":
+            path = str(tmp_path / f'{name}.snap')
+            if not os.path.exists(path):
+                SBOLGraph(data_file(name)).save_snapshot(path)
+            return cls(path)
+        path = str(tmp_path / f'{name}.sqlite')
+        if not os.path.exists(path):
+            SQLiteGraph.create(path,data_file(name))
+        return cls(path)
+    return open_graph
+
+
+def _canon(graph):
+    def key(n):
+        return str(graph.nodes[n].get("key"))
+    nodes = sorted((key(n),node_name(d)) for n,d in graph.nodes(data=True))
+    edges = sorted((key(n),repr(k),key(v),edge_name(k,d)) for n,v,k,d in graph.edges(keys=True,data=True))
+    return nodes,edges
+
+
+def _matches(matches):
+    return sorted((n[1]["key"],v[1]["key"],e) for n,v,e in matches)
+
+
+def _patterns(graph):
+    edges = list(graph.edges(keys=True))
+    patterns = [(None,None,None)]
+    patterns += [(None,p,None) for p in sorted({e[1] for n,v,e in edges})]
+    for n,v,(s,p,o) in edges[::5]:
+        patterns += [(s,None,None),(None,None,o),(None,p,o),(s,p,o)]
+    return patterns
+
+
+def test_graph_matches_networkx(backend):
+    graph = SBOLGraph(data_file("design.xml"))
+    frozen = backend(SBOLGraph,"design.xml")
+    assert frozen.frozen
+    assert len(frozen) == len(graph)
+    # Ingested edges carry a weight of 1 in every store.
+    assert {d.get("weight") for n,v,d in graph.edges(data=True)} == {1}
+    assert {d.get("weight") for n,v,d in frozen.edges(data=True)} == {1}
+    assert _canon(frozen) == _canon(graph)
+    for n,data in graph.nodes(data=True):
+        f = frozen.get_entity_code(data["key"])
+        assert sorted(repr(k) for u,v,k in frozen.out_edges(f,keys=True)) == sorted(repr(k) for u,v,k in graph.out_edges(n,keys=True))
+        assert sorted(repr(k) for u,v,k in frozen.in_edges(f,keys=True)) == sorted(repr(k) for u,v,k in graph.in_edges(n,keys=True))
+
+
+def test_search_matches_networkx(backend):
+    graph = SBOLGraph(data_file("design.xml"))
+    frozen = backend(SBOLGraph,"design.xml")
+    for pattern in _patterns(graph):
+        assert _matches(frozen.search(pattern)) == _matches(graph.search(pattern)),pattern
+    assert frozen.search((URIRef("http://ex.org/unknown"),None,None)) == []
+
+
+def test_getters_match_networkx(backend):
+    graph = SBOLGraph(data_file("design.xml"))
+    frozen = backend(SBOLGraph,"design.xml")
+    cds = sorted(str(cd[1]["key"]) for cd in graph.get_component_definitions())
+    assert sorted(str(cd[1]["key"]) for cd in frozen.get_component_definitions()) == cds
+    for n,data in graph.nodes(data=True):
+        f = frozen.get_entity_code(data["key"])
+        expected = graph.get_rdf_type(n)
+        actual = frozen.get_rdf_type(f)
+        assert (actual and actual[1]["key"]) == (expected and expected[1]["key"])
+
+
+@pytest.mark.parametrize("view",sbol_views)
+def test_sbol_views_match_networkx(backend,view):
+    expected = getattr(SBOLBuilder(data_file("design.xml")),view)()
+    assert _canon(getattr(backend(SBOLBuilder,"design.xml"),view)()) == _canon(expected)
+
+
+@pytest.mark.parametrize("view",knowledge_views)
+def test_knowledge_views_match_networkx(backend,view):
+    expected = getattr(KnowledgeBuilder(data_file("knowledge.xml")),view)()
+    assert _canon(getattr(backend(KnowledgeBuilder,"knowledge.xml"),view)()) == _canon(expected)
+
+
+def test_frozen_graph_is_read_only(backend):
+    frozen = backend(SBOLGraph,"design.xml")
+    node = next(iter(frozen.nodes))
+    with pytest.raises(ValueError):
+        frozen.add_edge(node,node,(URIRef("http://ex.org/s"),URIRef("http://ex.org/p"),URIRef("http://ex.org/o")))
+    with pytest.raises(ValueError):
+        frozen.remove_node(node)
+
+
+def test_sqlite_imports_several_files(tmp_path):
+    path = str(tmp_path / "both.sqlite")
+    sources = [data_file("design.xml"),data_file("knowledge.xml")]
+    SQLiteGraph.create(path,sources)
+    graph = SBOLGraph(path)
+    expected = SBOLGraph(sources)
+    assert len(graph) == len(expected)
+    assert {k for n,v,k in graph.edges(keys=True)} == {k for n,v,k in expected.edges(keys=True)}
@@ -0,0 +1,78 @@
+import pytest
+from rdflib import URIRef
+
+from graphs.sbol_graph import SBOLGraph
+from graphs.knowledge_graph import KnowledgeGraph
+from conftest import data_file
+
+unknown = URIRef("http://ex.org/unknown")
+
+def _objects(matches):
+    return [match[1] for match in matches]
+
+
+def _definitions(graph,component):
+    definition = graph.get_definition(component)
+    return [] if definition is None else [definition]
+
+
+sbol_getters = [("get_batch_types",SBOLGraph.get_types),
+                ("get_batch_roles",SBOLGraph.get_roles),
+                ("get_batch_definitions",_definitions),
+                ("get_batch_participations",SBOLGraph.get_participations),
+                ("get_batch_components",lambda g,s: g.get_components(cd=s)),
+                ("get_batch_modules",lambda g,s: g.get_modules(md=s)),
+                ("get_batch_interactions",lambda g,s: g.get_interactions(md=s)),
+                ("get_batch_functional_components",lambda g,s: g.get_functional_components(md=s)),
+                ("get_batch_component_definitions",SBOLGraph.get_component_definition)]
+
+knowledge_getters = [("get_batch_descriptors",KnowledgeGraph.get_descriptors),
+                     ("get_batch_aliases",lambda g,s: _objects(g.get_aliases(s))),
+                     ("get_batch_subjects",lambda g,s: _objects(g.get_subjects(s))),
+                     ("get_batch_objects",lambda g,s: _objects(g.get_objects(s)))]
+
+def _subjects(graph):
+    # Node ids and entity keys are both accepted, unknown subjects map to nothing.
+    nodes = list(graph.nodes(data=True))
+    return [n for n,d in nodes[::2]] + [d["key"] for n,d in nodes[1::2]] + [unknown]
+
+
+def _check(graph,getters):
+    # Returns the batches that found something, to show the check isn't vacuous.
+    subjects = _subjects(graph)
+    populated = set()
+    for batch,getter in getters:
+        # A few subjects and then all of them, frozen graphs choose between
+        # fact lookups per subject and a pass over the predicate's edges.
+        for chosen in (subjects[:3],subjects):
+            results = getattr(graph,batch)(chosen)
+            assert list(results) == chosen
+            for subject in chosen:
+                assert results[subject] == getter(graph,subject),(batch,subject)
+        if any(results.values()):
+            populated.add(batch)
+    return populated
+
+
+@pytest.mark.parametrize("frozen",[False,True])
+def test_sbol_batch_getters_match_per_subject(frozen):
+    graph = SBOLGraph(data_file("design.xml"))
+    assert _check(graph.freeze() if frozen else graph,sbol_getters) == {b for b,g in sbol_getters}
+
+
+@pytest.mark.parametrize("frozen",[False,True])
+def test_knowledge_batch_getters_match_per_subject(frozen):
+    graph = KnowledgeGraph(data_file("knowledge.xml"))
+    # The test knowledge graph has no interaction subjects or objects.
+    populated = _check(graph.freeze() if frozen else graph,knowledge_getters)
+    assert populated == {"get_batch_descriptors","get_batch_aliases"}
+
+
+def test_batch_facts_groups_predicate_lists():
+    graph = SBOLGraph(data_file("design.xml"))
+    predicates = [SBOLGraph.fact_predicates[2],SBOLGraph.fact_predicates[3]]
+    subjects = [n for n in graph.nodes][::3]
+    results = graph.get_batch_facts(subjects,predicates)
+    for subject in subjects:
+        expected = _objects(graph.search((subject,predicates,None)))
+        assert sorted(results[subject],key=repr) == sorted(expected,key=repr)
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+from rdflib import Graph,URIRef,Literal,RDF
+
+from graphs.sbol_graph import SBOLGraph
+from util.sbol_identifiers import identifiers
+from conftest import data_file
+
+def _state(graph):
+    # Triples held as edges and as literal attributes, keyed by term.
+    triples = {k for n,v,k in graph.edges(keys=True)}
+    for n,data in graph.nodes(data=True):
+        for p,objects in data.get("literals",{}).items():
+            triples.update((data["key"],p,o) for o in objects)
+    return triples
+
+
+def _matches(graph,pattern):
+    return sorted((n[1]["key"],e[1],v[1]["key"]) for n,v,e in graph.search(pattern))
+
+
+def _delta():
+    triples = sorted(Graph().parse(data_file("design.xml")))
+    rng = random.Random(3)
+    removed = rng.sample(triples,60)
+    added = [(URIRef(f'http://ex.org/new{i}'),identifiers.predicates.role,rng.choice(triples)[2]) for i in range(20)]
+    added += [(rng.choice(triples)[0],URIRef("http://ex.org/note"),Literal(f'note {i}')) for i in range(10)]
+    return set(triples),removed,added
+
+
+@pytest.mark.parametrize("literals_as_attributes",[False,True])
+def test_delta_matches_rebuilt_graph(tmp_path,literals_as_attributes):
+    triples,removed,added = _delta()
+    graph = SBOLGraph(data_file("design.xml"),literals_as_attributes)
+    version = graph.version
+    graph.apply_delta(added,removed)
+    assert graph.version > version
+    expected_triples = (triples - set(removed)) | set(added)
+    rebuilt = Graph()
+    for triple in expected_triples:
+        rebuilt.add(triple)
+    path = str(tmp_path / "rebuilt.xml")
+    rebuilt.serialize(destination=path,format="xml")
+    expected = SBOLGraph(path,literals_as_attributes)
+    assert _state(graph) == _state(expected) == expected_triples
+    assert sorted(str(d["key"]) for n,d in graph.nodes(data=True)) == sorted(str(d["key"]) for n,d in expected.nodes(data=True))
+    for n,data in graph.nodes(data=True):
+        assert graph.get_entity_code(data["key"]) == n
+    for s,p,o in list(added) + list(removed):
+        for pattern in ((s,None,None),(None,p,None),(None,None,o),(None,p,o)):
+            assert _matches(graph,pattern) == _matches(expected,pattern),pattern
+
+
+def test_delta_updates_facts_and_touched_nodes():
+    graph = SBOLGraph(data_file("design.xml"))
+    subject = URIRef("http://ex.org/delta/cd")
+    touched = graph.apply_delta([(subject,RDF.type,identifiers.objects.component_definition)])
+    node = graph.get_entity_code(subject)
+    assert node in touched
+    assert graph.get_rdf_type(node)[1]["key"] == identifiers.objects.component_definition
+    assert node in [cd[0] for cd in graph.get_component_definitions()]
+    touched = graph.apply_delta(removed=[(subject,RDF.type,identifiers.objects.component_definition)])
+    assert node in touched
+    # Nothing refers to the subject any more, so its node is gone.
+    assert node not in graph.nodes
+    with pytest.raises(ValueError):
+        graph.get_entity_code(subject)
+
+
+def test_delta_on_frozen_graph_is_refused():
+    graph = SBOLGraph(data_file("design.xml")).freeze()
+    with pytest.raises(ValueError):
+        graph.apply_delta([(URIRef("http://ex.org/s"),RDF.type,URIRef("http://ex.org/o"))])
@@ -0,0 +1,46 @@
+import pytest
+
+from graphs.sbol_graph import SBOLGraph
+from graphs.sqlite_graph import SQLiteGraph
+from util.sbol_identifiers import identifiers
+from conftest import data_file
+
+fact_predicates = SBOLGraph.fact_predicates
+
+@pytest.fixture(params=["snapshot","sqlite"])
+def frozen_graph(request,tmp_path):
+    if request.param == "snapshot":
+        path = str(tmp_path / "design.snap")
+        SBOLGraph(data_file("design.xml")).save_snapshot(path)
+    else:
+        path = str(tmp_path / "design.sqlite")
+        SQLiteGraph.create(path,data_file("design.xml"))
+    return SBOLGraph(path)
+
+
+def test_frozen_facts_are_not_read_on_open(frozen_graph):
+    assert frozen_graph.frozen
+    assert all(len(facts) == 0 for facts in frozen_graph._facts.values())
+
+
+def test_frozen_facts_match_networkx(frozen_graph):
+    graph = SBOLGraph(data_file("design.xml"))
+    for node,data in graph.nodes(data=True):
+        for predicate in fact_predicates:
+            expected = [v[1]["key"] for v in graph.get_facts(node,predicate)]
+            assert [v[1]["key"] for v in frozen_graph.get_facts(data["key"],predicate)] == expected
+    # Only the subjects asked about are held afterwards.
+    assert len(frozen_graph._fact_nodes) <= len(graph)
+
+
+def test_frozen_batch_facts_match_networkx(frozen_graph):
+    graph = SBOLGraph(data_file("design.xml"))
+    keys = {n : d["key"] for n,d in graph.nodes(data=True)}
+    subjects = [frozen_graph.get_entity_code(k) for k in keys.values()]
+    for predicate in (identifiers.predicates.type,identifiers.predicates.role):
+        expected = graph.get_batch_facts(list(keys),predicate)
+        batch = frozen_graph.get_batch_facts(subjects,predicate)
+        for node,subject in zip(keys,subjects):
+            assert [v[1]["key"] for v in batch[subject]] == [v[1]["key"] for v in expected[node]]
+        few = frozen_graph.get_batch_facts(subjects[:2],predicate)
+        assert all(few[s] == batch[s] for s in subjects[:2])
@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import pytest
+
+from graphs import abstract_graph
+from graphs.abstract_graph import AbstractGraph
+from util.graph_cache import graph_cache
+from conftest import data_file
+
+def _graph_data(graph):
+    nodes = sorted((n,repr(sorted(d.items()))) for n,d in graph.nodes(data=True))
+    edges = sorted((n,v,repr(k),repr(sorted(d.items()))) for n,v,k,d in graph.edges(keys=True,data=True))
+    return nodes,edges
+
+
+def _no_parse(*args):
+    raise AssertionError("Cached graph was parsed again.")
+
+
+@pytest.mark.parametrize("literals_as_attributes",[False,True])
+def test_second_load_comes_from_cache(monkeypatch,literals_as_attributes):
+    graph = AbstractGraph(data_file("design.xml"),literals_as_attributes)
+    assert len(os.listdir(graph_cache.directory)) == 1
+    monkeypatch.setattr(abstract_graph,"_load_to_networkx",_no_parse)
+    cached = AbstractGraph(data_file("design.xml"),literals_as_attributes)
+    assert _graph_data(cached) == _graph_data(graph)
+    assert cached._max_key == graph._max_key
+    for n,data in graph.nodes(data=True):
+        assert cached.get_entity_code(data["key"]) == n
+
+
+def test_key_follows_content_and_options(tmp_path):
+    path = str(tmp_path / "design.xml")
+    shutil.copy(data_file("design.xml"),path)
+    key = graph_cache.key(path,False)
+    assert key == graph_cache.key(data_file("design.xml"),False)
+    assert key != graph_cache.key(path,True)
+    with open(path,"a") as f:
+        f.write("\n")
+    assert key != graph_cache.key(path,False)
+    assert graph_cache.key(str(tmp_path / "missing.xml")) is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    path = str(tmp_path / "design.xml")
+    shutil.copy(data_file("design.xml"),path)
+    graph = AbstractGraph(path)
+    key = graph_cache.key(path,False)
+    with open(graph_cache._path(key),"wb") as f:
+        f.write(b"not a graph")
+    assert graph_cache.load(key) is None
+    assert _graph_data(AbstractGraph(path)) == _graph_data(graph)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path,monkeypatch):
+    paths = []
+    for name in ("design.xml","knowledge.xml"):
+        paths.append(str(tmp_path / name))
+        shutil.copy(data_file(name),paths[-1])
+    AbstractGraph(paths[0])
+    first = graph_cache._path(graph_cache.key(paths[0],False))
+    os.utime(first,(0,0))
+    monkeypatch.setattr(graph_cache,"max_size",os.path.getsize(first))
+    AbstractGraph(paths[1])
+    assert not os.path.exists(first)
+    assert os.path.exists(graph_cache._path(graph_cache.key(paths[1],False)))
+    graph_cache.clear()
+    assert os.listdir(graph_cache.directory) == []
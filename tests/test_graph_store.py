@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from rdflib import Graph,URIRef,Literal,XSD
+
+from graphs.abstract_graph import AbstractGraph
+from graphs.graph_store import GraphStore
+
+ex = "http://example.org/"
+start = URIRef(ex + "start")
+label = URIRef(ex + "label")
+flag = URIRef(ex + "flag")
+
+@pytest.fixture
+def literal_graph(tmp_path):
+    graph = Graph()
+    graph.add((URIRef(ex + "a"),start,Literal(0)))
+    graph.add((URIRef(ex + "b"),start,Literal(5)))
+    graph.add((URIRef(ex + "a"),label,Literal("")))
+    graph.add((URIRef(ex + "b"),label,Literal("b")))
+    graph.add((URIRef(ex + "a"),flag,Literal(False)))
+    graph.add((URIRef(ex + "b"),flag,Literal(True)))
+    path = tmp_path / "literals.nt"
+    graph.serialize(destination=str(path),format="nt")
+    return path
+
+
+@pytest.mark.parametrize("literals_as_attributes",[False,True])
+@pytest.mark.parametrize("predicate,obj,subject",[(start,Literal(0),"a"),
+                                                  (label,Literal(""),"a"),
+                                                  (flag,Literal(False),"a"),
+                                                  (start,Literal(5),"b")])
+def test_falsy_literal_objects_are_bound(literal_graph,literals_as_attributes,predicate,obj,subject):
+    store = GraphStore(AbstractGraph(literal_graph,literals_as_attributes))
+    assert [t for t,c in store.triples((None,predicate,obj))] == [(URIRef(ex + subject),predicate,obj)]
+    assert [t for t,c in store.triples((None,None,obj))] == [(URIRef(ex + subject),predicate,obj)]
+
+
+def test_falsy_literal_with_bound_subject(literal_graph):
+    store = GraphStore(AbstractGraph(literal_graph))
+    assert [t for t,c in store.triples((URIRef(ex + "b"),start,Literal(0)))] == []
+    assert len([t for t,c in store.triples((URIRef(ex + "a"),None,None))]) == 3
+
+
+def test_typed_zero_is_not_a_wildcard(literal_graph):
+    store = GraphStore(AbstractGraph(literal_graph))
+    zero = Literal("0",datatype=XSD.integer)
+    assert [t[0] for t,c in store.triples((None,start,zero))] == [URIRef(ex + "a")]
+
+
+def test_store_len_and_read_only(literal_graph):
+    store = GraphStore(AbstractGraph(literal_graph))
+    assert len(store) == 6
+    with pytest.raises(ValueError):
+        store.add((URIRef(ex + "c"),start,Literal(1)),None)
+
+
+def test_expired_deadline_raises(literal_graph):
+    store = GraphStore(AbstractGraph(literal_graph),deadline=time.monotonic() - 1)
+    with pytest.raises(TimeoutError):
+        list(store.triples((None,None,None)))
+
+
+def test_deadline_checked_while_scanning(literal_graph,monkeypatch):
+    # A selective pattern that scans candidates without yielding still times out.
+    graph = AbstractGraph(literal_graph)
+    clock = iter(range(100))
+    monkeypatch.setattr(time,"monotonic",lambda: next(clock))
+    store = GraphStore(graph,deadline=1)
+    with pytest.raises(TimeoutError):
+        list(store.triples((URIRef(ex + "a"),start,Literal(7))))
+    assert list(GraphStore(graph).triples((URIRef(ex + "a"),start,Literal(7)))) == []
@@ -0,0 +1,127 @@
+from collections import Counter
+
+import pytest
+from rdflib import Graph,Literal,URIRef
+
+from graphs.sbol_graph import SBOLGraph
+from builder.sbol_builder import SBOLBuilder
+from builder.knowledge_builder import KnowledgeBuilder
+from util.names import node_name,edge_name
+from conftest import data_file
+
+def _matches(matches):
+    return sorted((n[1]["key"],e[1],v[1]["key"]) for n,v,e in matches)
+
+
+def _canon(graph):
+    def key(n):
+        return str(graph.nodes[n].get("key"))
+    nodes = sorted((key(n),node_name(d)) for n,d in graph.nodes(data=True))
+    edges = sorted((key(n),repr(k),key(v),edge_name(k,d)) for n,v,k,d in graph.edges(keys=True,data=True))
+    return nodes,edges
+
+
+@pytest.fixture
+def graphs():
+    return SBOLGraph(data_file("design.xml")),SBOLGraph(data_file("design.xml"),literals_as_attributes=True)
+
+
+def test_literals_are_held_on_their_subject(graphs):
+    graph,attributed = graphs
+    assert not any(isinstance(d["key"],Literal) for n,d in attributed.nodes(data=True))
+    expected = {}
+    for s,p,o in Graph().parse(data_file("design.xml")):
+        if isinstance(o,Literal):
+            expected.setdefault(s,{}).setdefault(p,set()).add(o)
+    for n,data in attributed.nodes(data=True):
+        literals = {p : set(l) for p,l in data.get("literals",{}).items()}
+        assert literals == expected.get(data["key"],{})
+
+
+def test_literal_patterns_search_alike(graphs):
+    graph,attributed = graphs
+    literals = [e for n,v,e in graph.edges(keys=True) if isinstance(e[2],Literal)]
+    assert literals
+    for s,p,o in literals[::3]:
+        for pattern in ((s,None,None),(None,p,None),(None,None,o),(None,p,o),(s,p,o)):
+            assert _matches(attributed.search(pattern)) == _matches(graph.search(pattern)),pattern
+    assert _matches(attributed.search((None,None,None))) == _matches(graph.search((None,None,None)))
+
+
+def test_literal_updates_are_searchable(graphs):
+    graph,attributed = graphs
+    node,data = next((n,d) for n,d in attributed.nodes(data=True) if d.get("literals"))
+    predicate = URIRef("http://ex.org/note")
+    literals = dict(data["literals"])
+    literals[predicate] = [Literal("added")]
+    attributed.set_node_attr(node,{"literals" : literals})
+    assert _matches(attributed.search((None,predicate,None))) == [(data["key"],predicate,Literal("added"))]
+    other = next(n for n in attributed.nodes if n != node and not attributed.nodes[n].get("literals"))
+    attributed.merge_nodes(other,node)
+    merged = attributed.nodes[other]["key"]
+    assert _matches(attributed.search((None,predicate,None))) == [(merged,predicate,Literal("added"))]
+
+
+@pytest.mark.parametrize("view",["produce_heirarchy_graph","produce_components_graph",
+                                 "produce_interaction_graph","produce_maps_graph"])
+def test_search_built_views_match_default_ingest(view):
+    expected = getattr(SBOLBuilder(data_file("design.xml")),view)()
+    attributed = getattr(SBOLBuilder(data_file("design.xml"),literals_as_attributes=True),view)()
+    assert _canon(attributed) == _canon(expected)
+
+
+def _strip_node(graph,key):
+    # Removes every edge between entities touching key, literal ones stay.
+    node = graph.get_entity_code(key)
+    for n,v,k in list(graph.in_edges(node,keys=True)) + list(graph.out_edges(node,keys=True)):
+        if not isinstance(k[2],Literal):
+            graph.remove_edge(n,v,k)
+    return node
+
+
+def test_remove_isolated_nodes_keeps_literal_subjects(graphs):
+    graph,attributed = graphs
+    subject,p,o = next(e for n,v,e in graph.edges(keys=True) if isinstance(e[2],Literal))
+    bare = next(d["key"] for n,d in attributed.nodes(data=True) 
+                if not d.get("literals") and not isinstance(d["key"],Literal))
+    for g in (graph,attributed):
+        node = _strip_node(g,subject)
+        bare_node = _strip_node(g,bare)
+        g.remove_isolated_nodes()
+        assert node in g.nodes
+        assert bare_node not in g.nodes
+    for pattern in ((None,p,None),(None,None,o),(None,p,o),(subject,None,None),(None,None,None)):
+        assert _matches(attributed.search(pattern)) == _matches(graph.search(pattern)),pattern
+
+
+sbol_views = ["produce_full_graph","produce_pruned_graph","produce_heirarchy_graph",
+              "produce_components_graph","produce_interaction_graph",
+              "produce_interaction_verbose_graph","produce_genetic_interaction_graph",
+              "produce_protein_protein_interaction_graph","produce_module_graph",
+              "produce_maps_graph","produce_tree"]
+knowledge_views = ["produce_synonym_graph","produce_interaction_graph","produce_entity_graph"]
+
+def _view_matches(builder,view):
+    matches = getattr(builder,view)().search((None,None,None))
+    return Counter((n[1]["key"],e[1],v[1]["key"]) for n,v,e in matches)
+
+
+@pytest.mark.parametrize("cls,name,view",[(SBOLBuilder,"design.xml",v) for v in sbol_views] + 
+                                         [(KnowledgeBuilder,"knowledge.xml",v) for v in knowledge_views])
+def test_every_view_searches_alike(cls,name,view):
+    expected = _view_matches(cls(data_file(name)),view)
+    assert _view_matches(cls(data_file(name),literals_as_attributes=True),view) == expected
+
+
+def test_pruned_view_keeps_unpruned_literals():
+    note = URIRef("http://ex.org/note")
+    builders = SBOLBuilder(data_file("design.xml")),SBOLBuilder(data_file("design.xml"),literals_as_attributes=True)
+    subject = next(iter(builders[0].graph.get_component_definitions()))[1]["key"]
+    for builder in builders:
+        # One subject noted with nothing but a literal the pruned view keeps.
+        builder.graph.apply_delta([(subject,note,Literal("kept")),
+                                   (URIRef("http://ex.org/noted"),note,Literal("alone"))])
+    expected = _view_matches(builders[0],"produce_pruned_graph")
+    assert expected[(subject,note,Literal("kept"))] == 1
+    assert expected[(URIRef("http://ex.org/noted"),note,Literal("alone"))] == 1
+    assert _view_matches(builders[1],"produce_pruned_graph") == expected
@@ -0,0 +1,62 @@
+import pytest
+from rdflib import Graph,Literal
+
+from graphs.abstract_graph import AbstractGraph
+from conftest import data_file
+
+def _triples(graph):
+    return {e for n,v,e in graph.edges(keys=True)}
+
+
+@pytest.fixture
+def halves(tmp_path):
+    # Two documents that share entities, split from the test design.
+    triples = sorted(Graph().parse(data_file("design.xml")))
+    paths = []
+    for i,part in enumerate((triples[::2],triples[1::2])):
+        graph = Graph()
+        for triple in part:
+            graph.add(triple)
+        paths.append(str(tmp_path / f'half{i}.xml'))
+        graph.serialize(destination=paths[-1],format="xml")
+    return paths
+
+
+def test_files_merge_into_one_graph(halves):
+    graph = AbstractGraph(halves)
+    whole = AbstractGraph(data_file("design.xml"))
+    assert _triples(graph) == _triples(whole)
+    keys = [d["key"] for n,d in graph.nodes(data=True)]
+    assert len(keys) == len(set(keys)) == len(whole)
+    for n,data in graph.nodes(data=True):
+        assert graph.get_entity_code(data["key"]) == n
+
+
+def test_node_codes_follow_input_order(halves):
+    first = AbstractGraph(halves)
+    second = AbstractGraph(halves)
+    assert [(n,d["key"]) for n,d in first.nodes(data=True)] == [(n,d["key"]) for n,d in second.nodes(data=True)]
+    assert sorted(first.edges(keys=True)) == sorted(second.edges(keys=True))
+
+
+def test_single_source_list_and_literal_attributes():
+    graph = AbstractGraph([data_file("design.xml")],literals_as_attributes=True)
+    expected = AbstractGraph(data_file("design.xml"),literals_as_attributes=True)
+    assert _triples(graph) == _triples(expected)
+    assert not any(isinstance(e[2],Literal) for e in _triples(graph))
+    literals = {d["key"] : d.get("literals") for n,d in expected.nodes(data=True)}
+    for n,data in graph.nodes(data=True):
+        assert data.get("literals") == literals[data["key"]]
+
+
+def test_directory_inputs_keep_rdf_files(tmp_path):
+    pytest.importorskip("flask")
+    pytest.importorskip("dash")
+    from run import expand_inputs
+    names = ["a.xml","b.nt.gz","c.sbol","d.ttl.bz2",".DS_Store",".hidden.xml","README","notes.txt","page.html"]
+    for name in names:
+        (tmp_path / name).write_text("")
+    (tmp_path / "nested.xml").mkdir()
+    expected = [str(tmp_path / n) for n in ("a.xml","b.nt.gz","c.sbol","d.ttl.bz2")]
+    assert expand_inputs(str(tmp_path)) == expected
+    assert expand_inputs(str(tmp_path / "*")) == expected
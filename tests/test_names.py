@@ -0,0 +1,46 @@
+import pytest
+from rdflib import URIRef,Literal
+
+from graphs.abstract_graph import AbstractGraph
+from util.names import get_name,display_name,node_name,edge_name,name_cache_info
+from conftest import data_file
+
+@pytest.mark.parametrize("uri,name",[("http://ex.org/cd0/1","cd0"),
+                                     ("http://ex.org/cd0/1.0","cd0"),
+                                     ("http://ex.org/a/b","b"),
+                                     ("http://sbols.org/v2#ComponentDefinition","ComponentDefinition"),
+                                     ("http://identifiers.org/so/SO:0000141","0000141"),
+                                     ("http://ex.org/a/c_2/1","c_2")])
+def test_names_of_uris(uri,name):
+    assert get_name(URIRef(uri)) == name
+
+
+def test_names_are_memoized():
+    uri = URIRef("http://ex.org/names/memoized")
+    get_name(uri)
+    hits = name_cache_info().hits
+    assert get_name(uri) == "memoized"
+    assert name_cache_info().hits == hits + 1
+
+
+def test_literals_are_shown_as_is():
+    assert display_name(Literal("a/b#c")) == "a/b#c"
+    assert node_name({"key" : Literal(5)}) == "5"
+
+
+def test_stored_names_win():
+    key = (URIRef("http://ex.org/s"),URIRef("http://ex.org/p"),URIRef("http://ex.org/o"))
+    assert node_name({"key" : key[0]}) == "s"
+    assert node_name({"key" : key[0],"display_name" : "given"}) == "given"
+    assert edge_name(key,{}) == "p"
+    assert edge_name("custom",{"display_name" : "given"}) == "given"
+
+
+def test_graphs_store_no_derived_names():
+    graph = AbstractGraph(data_file("design.xml"))
+    assert not any("display_name" in d for n,d in graph.nodes(data=True))
+    assert not any("display_name" in d for n,v,d in graph.edges(data=True))
+    edges = list(graph.edges(keys=True))[:20]
+    view = graph.sub_graph(edges,{n : graph.nodes[n] for e in edges for n in e[:2]})
+    assert not any("display_name" in d for n,d in view.nodes(data=True))
+    assert [node_name(d) for n,d in view.nodes(data=True)] == [display_name(d["key"]) for n,d in view.nodes(data=True)]
@@ -0,0 +1,55 @@
+import pytest
+from rdflib import URIRef
+
+from graphs.abstract_graph import AbstractGraph
+from conftest import data_file
+
+@pytest.fixture
+def graph():
+    return AbstractGraph(data_file("design.xml"))
+
+
+def _check_index(graph):
+    for node,data in graph.nodes(data=True):
+        code = graph.get_entity_code(data["key"])
+        assert graph.nodes[code]["key"] == data["key"]
+
+
+def test_entities_resolve_to_their_nodes(graph):
+    _check_index(graph)
+    node = next(iter(graph.nodes))
+    assert graph.get_entity_code(node) == node
+    with pytest.raises(ValueError):
+        graph.get_entity_code(URIRef("http://ex.org/unknown"))
+
+
+def test_views_are_indexed(graph):
+    edges = list(graph.edges(keys=True))[:20]
+    view = graph.sub_graph(edges,{n : graph.nodes[n] for e in edges for n in e[:2]})
+    _check_index(view)
+
+
+def test_rekeyed_node_is_reindexed(graph):
+    node,data = next((n,d) for n,d in graph.nodes(data=True) if graph.in_edges(n))
+    old_key = data["key"]
+    new_key = URIRef("http://ex.org/renamed")
+    graph.set_node_attr(node,{"key" : new_key})
+    assert graph.get_entity_code(new_key) == node
+    with pytest.raises(ValueError):
+        graph.get_entity_code(old_key)
+    assert {n[0] for n,v,e in graph.search((None,None,new_key))} == {n for n,v in graph.in_edges(node)}
+    _check_index(graph)
+
+
+def test_merged_and_removed_nodes_leave_the_index(graph):
+    nodes = [n for n in graph.nodes if graph.out_edges(n)]
+    node1,node2 = nodes[0],nodes[1]
+    key2 = graph.nodes[node2]["key"]
+    graph.merge_nodes(node1,node2)
+    with pytest.raises(ValueError):
+        graph.get_entity_code(key2)
+    key1 = graph.nodes[node1]["key"]
+    graph.remove_node(node1)
+    with pytest.raises(ValueError):
+        graph.get_entity_code(key1)
+    _check_index(graph)
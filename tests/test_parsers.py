@@ -0,0 +1,192 @@
+import bz2
+import gzip
+import lzma
+import shutil
+
+import pytest
+from rdflib import Graph,BNode
+from rdflib.compare import isomorphic
+
+from graphs import abstract_graph
+from graphs.abstract_graph import AbstractGraph
+from util.line_parser import line_chunks
+from util.sbol_xml import parse_sbol_xml
+from util.compression import is_rdf_file
+from conftest import data_file
+
+def _triples(graph):
+    return {e for n,v,e in graph.edges(keys=True)}
+
+
+def _rdflib_triples(source,rdf_format=None):
+    return set(Graph().parse(source,format=rdf_format))
+
+
+def _check_nodes(graph):
+    # One node per distinct term, keyed by it.
+    keys = [d["key"] for n,d in graph.nodes(data=True)]
+    assert len(keys) == len(set(keys))
+    assert set(keys) == {t for e in _triples(graph) for t in (e[0],e[2])}
+
+
+@pytest.fixture
+def rdflib_only(monkeypatch):
+    # Sends every RDF/XML document down the generic rdflib parser.
+    monkeypatch.setattr(abstract_graph,"parse_sbol_xml",lambda source,store: False)
+
+
+@pytest.mark.parametrize("name",["design.xml","knowledge.xml"])
+def test_rdflib_parse_streams_into_graph(rdflib_only,name):
+    graph = AbstractGraph(data_file(name))
+    assert _triples(graph) == _rdflib_triples(data_file(name))
+    _check_nodes(graph)
+
+
+def test_blank_nodes_are_one_node_each(rdflib_only,tmp_path):
+    path = str(tmp_path / "blank.xml")
+    with open(path,"w") as f:
+        f.write('<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns:ex="http://ex.org/">'
+                '<rdf:Description rdf:about="http://ex.org/a"><ex:p rdf:nodeID="x"/></rdf:Description>'
+                '<rdf:Description rdf:about="http://ex.org/c"><ex:p rdf:nodeID="y"/></rdf:Description>'
+                '<rdf:Description rdf:nodeID="x"><ex:q rdf:resource="http://ex.org/b"/></rdf:Description>'
+                '<rdf:Description rdf:nodeID="y"><ex:q rdf:resource="http://ex.org/b"/></rdf:Description>'
+                '</rdf:RDF>')
+    graph = AbstractGraph(path)
+    blanks = [d["key"] for n,d in graph.nodes(data=True) if isinstance(d["key"],BNode)]
+    assert len(blanks) == 2
+    assert len(graph.edges) == 4
+    _check_nodes(graph)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Splits line based files into many chunks, each parsed in a worker.
+    monkeypatch.setattr(abstract_graph,"line_chunks",lambda source: line_chunks(source,2048))
+
+
+@pytest.fixture
+def ntriples_file(tmp_path):
+    path = str(tmp_path / "design.nt")
+    Graph().parse(data_file("design.xml")).serialize(destination=path,format="nt")
+    return path
+
+
+def test_line_chunks_cover_whole_lines(ntriples_file):
+    chunks = line_chunks(ntriples_file,2048)
+    assert len(chunks) > 2
+    assert chunks[0][0] == 0
+    with open(ntriples_file,"rb") as f:
+        data = f.read()
+    assert chunks[-1][1] == len(data)
+    for (start,end),(next_start,next_end) in zip(chunks,chunks[1:]):
+        assert end == next_start
+        assert data[end - 1:end] == b"\n"
+
+
+@pytest.mark.parametrize("chunked",[False,True])
+def test_ntriples_match_rdflib(request,ntriples_file,chunked):
+    if chunked:
+        request.getfixturevalue("small_chunks")
+    graph = AbstractGraph(ntriples_file)
+    assert _triples(graph) == _rdflib_triples(ntriples_file,"nt")
+    _check_nodes(graph)
+
+
+def test_nquads_match_rdflib(tmp_path,small_chunks):
+    path = str(tmp_path / "design.nq")
+    with open(path,"w") as f:
+        for i,(s,p,o) in enumerate(sorted(Graph().parse(data_file("design.xml")))):
+            f.write(f'{s.n3()} {p.n3()} {o.n3()} <http://ex.org/graph{i % 3}> .\n')
+    graph = AbstractGraph(path)
+    assert _triples(graph) == _rdflib_triples(data_file("design.xml"))
+    _check_nodes(graph)
+
+
+def test_blank_node_labels_span_chunks(tmp_path,small_chunks):
+    path = str(tmp_path / "blank.nt")
+    with open(path,"w") as f:
+        f.write("_:b0 <http://ex.org/p> <http://ex.org/first> .\n")
+        for i in range(200):
+            f.write(f'<http://ex.org/s{i}> <http://ex.org/p> "{i}" .\n')
+        f.write("_:b0 <http://ex.org/p> <http://ex.org/last> .\n")
+    assert len(line_chunks(path,2048)) > 2
+    graph = AbstractGraph(path)
+    blanks = [n for n,d in graph.nodes(data=True) if isinstance(d["key"],BNode)]
+    assert len(blanks) == 1
+    assert len(graph.out_edges(blanks[0])) == 2
+
+
+rdf_xml = ('<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+           'xmlns:ex="http://ex.org/" xml:lang="en">{}</rdf:RDF>')
+striped = ('<ex:Thing rdf:about="http://ex.org/a">'
+           '<ex:label>hello</ex:label>'
+           '<ex:label xml:lang="fr">bonjour</ex:label>'
+           '<ex:count rdf:datatype="http://www.w3.org/2001/XMLSchema#integer">3</ex:count>'
+           '<ex:part><ex:Part rdf:about="http://ex.org/a/p"><ex:label>inner</ex:label></ex:Part></ex:part>'
+           '<ex:ref rdf:resource="http://ex.org/b"/>'
+           '</ex:Thing>'
+           '<rdf:Description rdf:about="http://ex.org/b"><ex:label/></rdf:Description>')
+
+@pytest.mark.parametrize("name",["design.xml","knowledge.xml"])
+def test_sbol_xml_reader_matches_rdflib(monkeypatch,name):
+    triples = set()
+    assert parse_sbol_xml(data_file(name),triples)
+    assert triples == _rdflib_triples(data_file(name))
+    # Triples arrive in rdflib's order, so nodes are numbered alike.
+    graph,node_index,max_key = abstract_graph._load_to_networkx(data_file(name))
+    monkeypatch.setattr(abstract_graph,"parse_sbol_xml",lambda source,store: False)
+    expected,node_index,expected_max_key = abstract_graph._load_to_networkx(data_file(name))
+    assert list(graph.nodes(data="key")) == list(expected.nodes(data="key"))
+    assert max_key == expected_max_key
+
+
+@pytest.mark.parametrize("body,accepted",[(striped,True),
+    ('<rdf:Description rdf:about="http://ex.org/a"><ex:p rdf:nodeID="x"/></rdf:Description>',False),
+    ('<rdf:Description rdf:about="http://ex.org/a"><ex:p rdf:parseType="Resource"><ex:q>1</ex:q></ex:p></rdf:Description>',False),
+    ('<rdf:Description rdf:about="relative"><ex:p>1</ex:p></rdf:Description>',False),
+    ('<rdf:Description rdf:about="http://ex.org/a" ex:p="1"/>',False)])
+def test_sbol_xml_reader_falls_back(tmp_path,body,accepted):
+    path = str(tmp_path / "document.xml")
+    with open(path,"w") as f:
+        f.write(rdf_xml.format(body))
+    assert parse_sbol_xml(path,set()) == accepted
+    loaded = Graph()
+    for triple in _triples(AbstractGraph(path)):
+        loaded.add(triple)
+    assert isomorphic(loaded,Graph().parse(path))
+
+
+compressors = {".gz" : gzip.open,".bz2" : bz2.open,".xz" : lzma.open}
+
+def _compress(path,suffix):
+    with open(path,"rb") as f,compressors[suffix](path + suffix,"wb") as out:
+        shutil.copyfileobj(f,out)
+    return path + suffix
+
+
+@pytest.mark.parametrize("suffix",list(compressors))
+def test_compressed_rdf_xml(tmp_path,suffix):
+    path = str(tmp_path / "design.xml")
+    shutil.copy(data_file("design.xml"),path)
+    assert _triples(AbstractGraph(_compress(path,suffix))) == _rdflib_triples(path)
+
+
+@pytest.mark.parametrize("suffix",list(compressors))
+def test_compressed_ntriples(ntriples_file,suffix):
+    graph = AbstractGraph(_compress(ntriples_file,suffix))
+    assert _triples(graph) == _rdflib_triples(ntriples_file,"nt")
+
+
+@pytest.mark.parametrize("suffix",list(compressors))
+def test_compressed_relative_uris_resolve_against_the_file(tmp_path,suffix):
+    path = str(tmp_path / "document.xml")
+    with open(path,"w") as f:
+        f.write(rdf_xml.format('<rdf:Description rdf:about="relative"><ex:p rdf:resource="#other"/></rdf:Description>'))
+    assert _triples(AbstractGraph(_compress(path,suffix))) == _rdflib_triples(path)
+
+
+def test_rdf_files_are_recognised_by_name():
+    for name in ("design.xml","a/b.SBOL","c.nt.gz","d.ttl.xz","e.nq.bz2","f.rdf"):
+        assert is_rdf_file(name),name
+    for name in (".DS_Store","a/.hidden.xml","README","notes.txt","page.html","archive.gz"):
+        assert not is_rdf_file(name),name
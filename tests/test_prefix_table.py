@@ -0,0 +1,58 @@
+import os
+
+from rdflib import URIRef,RDF
+
+from graphs.abstract_graph import AbstractGraph
+from util.prefix_table import PrefixTable,prefix_table
+from util.graph_cache import encode_graph
+from util.term_table import term_table
+from conftest import data_file
+
+def test_identifier_namespaces_are_seeded():
+    for prefix in ("http://sbols.org/v2#","http://knowledge_graph/",
+                   "http://www.biopax.org/release/biopax-level3.owl#",str(RDF)):
+        assert prefix in prefix_table
+
+
+def test_longest_prefix_splits_uri():
+    table = PrefixTable(["http://ex.org/","http://ex.org/a/"])
+    code,local = table.split("http://ex.org/a/b")
+    assert table.decode(code) == "http://ex.org/a/"
+    assert local == "b"
+    assert table.join(code,local) == "http://ex.org/a/b"
+    assert table.split("urn-no-separator") == (None,"urn-no-separator")
+    assert table.join(None,"urn-no-separator") == "urn-no-separator"
+
+
+def test_namespaces_are_added_during_ingest():
+    table = PrefixTable()
+    table.add("http://ex.org/design/cd0/1")
+    # A trailing version stays with the name it belongs to.
+    assert "http://ex.org/design/" in table
+    assert table.local_name("http://ex.org/design/cd0/1") == "cd0/1"
+    table.add("http://ex.org/design/cd1/1")
+    assert len(table) == 1
+    # A host of its own, other tests intern terms under http://ex.org/.
+    term_table.encode(URIRef("http://prefix-table.ex.org/ingested/1"))
+    assert "http://prefix-table.ex.org/" in prefix_table
+
+
+def test_cache_payload_stores_local_names():
+    graph = AbstractGraph(data_file("design.xml"))
+    payload = encode_graph(graph._graph,graph._max_key)
+    keys = {str(t) for n,v,k in graph.edges(keys=True) for t in k}
+    split = [t for t in payload["terms"] if len(t) == 3]
+    assert len(split) > 0.9 * sum(1 for t in payload["terms"] if t[0] == 0)
+    for term in split:
+        assert payload["prefixes"][term[2]] + term[1] in keys
+
+
+def test_snapshot_stores_local_names(tmp_path):
+    path = str(tmp_path / "design.snap")
+    graph = AbstractGraph(data_file("design.xml"))
+    graph.save_snapshot(path)
+    loaded = AbstractGraph.load_snapshot(path)
+    assert {d["key"] for n,d in loaded.nodes(data=True)} == {d["key"] for n,d in graph.nodes(data=True)}
+    for name in os.listdir(path):
+        with open(os.path.join(path,name),"rb") as f:
+            assert b"http://sbols.org/v2#ComponentDefinition" not in f.read()
@@ -0,0 +1,95 @@
+import itertools
+
+import pytest
+from rdflib import URIRef,Variable,RDF
+
+from graphs.sbol_graph import SBOLGraph
+from util.sbol_identifiers import identifiers
+from conftest import data_file
+
+predicates = identifiers.predicates
+objects = identifiers.objects
+cd,c,d,t,p,x,y,z = (Variable(v) for v in ("cd","c","d","t","p","x","y","z"))
+
+queries = [[(cd,RDF.type,objects.component_definition),(cd,predicates.component,c),(c,predicates.definition,d)],
+           [(cd,predicates.component,c),(c,predicates.definition,d),(d,predicates.type,t)],
+           [(cd,p,d),(d,RDF.type,objects.component_definition)],
+           [(cd,[predicates.role,predicates.type],t)],
+           [(c,predicates.definition,d),(x,predicates.definition,d),(cd,predicates.component,x)]]
+
+def _bindings(bindings):
+    return sorted(sorted(binding.items()) for binding in bindings)
+
+
+def _scan(graph,patterns):
+    # Every pattern checked against every edge, bindings joined in order.
+    matches = graph.search((None,None,None))
+    bindings = [{}]
+    for pattern in patterns:
+        joined = []
+        for binding in bindings:
+            for (n,n_data),(v,v_data),e in matches:
+                values = {}
+                for term,value,key in zip(pattern,(n,e[1],v),(e[0],e[1],v_data["key"])):
+                    if isinstance(term,Variable):
+                        if binding.get(term,value) != value or values.setdefault(term,value) != value:
+                            break
+                    elif term is not None and key not in (term if isinstance(term,list) else [term]):
+                        break
+                else:
+                    joined.append({**binding,**values})
+        bindings = joined
+    return bindings
+
+
+@pytest.fixture
+def graph():
+    return SBOLGraph(data_file("design.xml"))
+
+
+@pytest.mark.parametrize("patterns",queries)
+def test_query_matches_scan(graph,patterns):
+    expected = _bindings(_scan(graph,patterns))
+    assert expected
+    assert _bindings(graph.query(patterns)) == expected
+    # The join order is planned, the order patterns are given in is irrelevant.
+    for permutation in itertools.permutations(patterns):
+        assert _bindings(graph.query(list(permutation))) == expected
+
+
+def test_query_fixed_subjects(graph):
+    binding = graph.query(queries[0])[0]
+    subject = graph.nodes[binding[cd]]["key"]
+    fixed = [(subject,predicates.component,c),(c,predicates.definition,d)]
+    expected = {(b[c],b[d]) for b in graph.query(queries[0]) if b[cd] == binding[cd]}
+    assert sorted((b[c],b[d]) for b in graph.query(fixed)) == sorted(expected)
+    assert graph.query([(URIRef("http://ex.org/unknown"),None,c)]) == []
+
+
+def test_query_frozen_graph(graph):
+    frozen = graph.freeze()
+    for patterns in queries:
+        assert _bindings(frozen.query(patterns)) == _bindings(graph.query(patterns))
+
+
+def test_variable_cannot_bind_predicate_and_node(graph):
+    with pytest.raises(ValueError):
+        graph.query([(cd,cd,c)])
+
+
+def _subject_keys(graph,patterns):
+    return sorted((graph.nodes[b[x]]["key"],graph.nodes[b[z]]["key"]) for b in graph.query(patterns))
+
+
+@pytest.mark.parametrize("frozen",[False,True])
+def test_literal_bindings_join_as_subjects(frozen):
+    # Literal objects bound by one pattern have no edges as the next subject.
+    patterns = [(x,predicates.display_id,y),(y,p,z)]
+    graph = SBOLGraph(data_file("design.xml"))
+    attributed = SBOLGraph(data_file("design.xml"),literals_as_attributes=True)
+    if frozen:
+        graph,attributed = graph.freeze(),attributed.freeze()
+    assert graph.query(patterns) == attributed.query(patterns) == []
+    assert len(attributed.query(patterns[:1])) == len(graph.query(patterns[:1])) > 0
+    shared = [(x,predicates.version,y),(z,predicates.version,y),(z,RDF.type,t)]
+    assert _subject_keys(attributed,shared) == _subject_keys(graph,shared) != []
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+from rdflib import URIRef,RDF
+
+from graphs.sbol_graph import SBOLGraph
+from util.query_cache import QueryCache
+from util.sbol_identifiers import identifiers
+from conftest import data_file
+
+def test_lru_eviction_and_counts():
+    cache = QueryCache(2)
+    assert cache.get("a",0,lambda: 1) == 1
+    assert cache.get("b",0,lambda: 2) == 2
+    assert cache.get("a",0,lambda: None) == 1
+    cache.get("c",0,lambda: 3)
+    assert cache.get("b",0,lambda: "recomputed") == "recomputed"
+    assert cache.info() == (1,4,2,2)
+
+
+def test_new_version_empties_cache():
+    cache = QueryCache(4)
+    cache.get("a",0,lambda: 1)
+    assert cache.get("a",1,lambda: 2) == 2
+    assert len(cache) == 1
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        QueryCache(0)
+
+
+def test_concurrent_lookups():
+    cache = QueryCache(8)
+    errors = []
+    def worker(offset):
+        try:
+            for i in range(2000):
+                key = (i + offset) % 32
+                assert cache.get(key,i // 500,lambda: key) == key
+        except Exception as ex:
+            errors.append(ex)
+    threads = [threading.Thread(target=worker,args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) <= 8
+
+
+def test_graph_cache_matches_uncached_search():
+    graph = SBOLGraph(data_file("design.xml"))
+    cached = SBOLGraph(data_file("design.xml"))
+    cached.enable_query_cache(1024)
+    for repeat in range(2):
+        for node in graph.nodes:
+            assert cached.get_rdf_type(node) == graph.get_rdf_type(node)
+            assert cached.get_roles(node) == graph.get_roles(node)
+            assert cached.search((node,None,None)) == graph.search((node,None,None))
+        assert cached.search((None,RDF.type,None),lazy=True) == graph.search((None,RDF.type,None),lazy=True)
+    info = cached.query_cache_info()
+    assert info.hits > 0 and info.hits == info.misses
+    assert graph.query_cache_info() is None
+
+
+def test_graph_cache_invalidated_by_apply_delta():
+    graph = SBOLGraph(data_file("design.xml"))
+    graph.enable_query_cache()
+    node = next(n for n in graph.nodes if graph.get_rdf_type(n) is not None)
+    subject = graph.nodes[node]["key"]
+    before = graph.get_types(node)
+    matches = graph.search((subject,None,None))
+    new_type = URIRef("http://example.org/new_type")
+    graph.apply_delta(added=[(subject,identifiers.predicates.type,new_type)])
+    assert [t[1]["key"] for t in graph.get_types(node)] == [t[1]["key"] for t in before] + [new_type]
+    assert len(graph.search((subject,None,None))) == len(matches) + 1
+    graph.apply_delta(removed=[(subject,identifiers.predicates.type,new_type)])
+    assert graph.get_types(node) == before
+
+
+def test_cached_results_are_copies():
+    graph = SBOLGraph(data_file("design.xml"))
+    graph.enable_query_cache()
+    graph.search((None,RDF.type,None)).clear()
+    assert graph.search((None,RDF.type,None)) != []
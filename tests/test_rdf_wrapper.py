@@ -0,0 +1,43 @@
+import pytest
+from rdflib import Graph,URIRef,Literal
+
+pytest.importorskip("pysbolgraph")
+
+from util.graph import RDFGraphWrapper
+from conftest import data_file
+
+ex = "http://example.org/"
+triple = (URIRef(ex + "a"),URIRef(ex + "p"),Literal("x"))
+other = (URIRef(ex + "b"),URIRef(ex + "p"),Literal("y"))
+
+def test_external_graph_is_copied_on_construction():
+    graph = Graph()
+    graph.add(triple)
+    wrapper = RDFGraphWrapper(graph)
+    graph.add(other)
+    assert list(wrapper) == [triple]
+    wrapper.add(other)
+    graph.remove(other)
+    assert len(wrapper) == 2 and len(graph) == 1
+
+
+def test_wrappers_share_until_one_mutates():
+    wrapper = RDFGraphWrapper(data_file("design.xml"))
+    derived = RDFGraphWrapper(wrapper)
+    assert derived.graph is wrapper.graph
+    size = len(wrapper)
+    version = derived.version
+    derived.add(triple)
+    assert derived.graph is not wrapper.graph
+    assert len(derived) == size + 1 and len(wrapper) == size
+    assert derived.version > version
+    wrapper.remove(next(iter(wrapper)))
+    assert len(derived) == size + 1 and len(wrapper) == size - 1
+
+
+def test_search_limit_and_offset():
+    wrapper = RDFGraphWrapper(data_file("design.xml"))
+    matches = wrapper.search((None,None,None))
+    assert wrapper.search((None,None,None),limit=3,offset=2) == matches[2:5]
+    assert wrapper.search((None,None,None),lazy=True) == matches[0]
+    assert wrapper.search((URIRef(ex + "missing"),None,None),lazy=True) is None
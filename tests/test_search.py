@@ -0,0 +1,158 @@
+import networkx as nx
+import pytest
+from rdflib import URIRef,RDF
+
+from graphs.abstract_graph import AbstractGraph
+from util.sbol_identifiers import identifiers
+from conftest import data_file
+
+@pytest.fixture
+def graph():
+    return AbstractGraph(data_file("design.xml"))
+
+
+def _scan(graph,pattern):
+    # Every edge checked against the pattern, what the indexes must reproduce.
+    s,p,o = pattern
+    p = set(p) if isinstance(p,list) else p
+    matches = []
+    for n,v,e in graph.edges(keys=True):
+        if s is not None and e[0] != s:
+            continue
+        if p is not None and e[1] not in (p if isinstance(p,set) else {p}):
+            continue
+        if o is not None and e[2] != o:
+            continue
+        matches.append((n,v,e))
+    return sorted(matches,key=repr)
+
+
+def _search(graph,pattern):
+    matches = graph.search(pattern)
+    for n,v,e in matches:
+        assert n[1] is graph.nodes[n[0]]
+        assert v[1]["key"] == e[2]
+    return sorted(((n[0],v[0],e) for n,v,e in matches),key=repr)
+
+
+def _patterns(graph):
+    edges = list(graph.edges(keys=True))
+    predicates = sorted({e[1] for n,v,e in edges})
+    patterns = [(None,None,None),(None,predicates[:3],None)]
+    patterns += [(None,p,None) for p in predicates]
+    for n,v,(s,p,o) in edges[::7]:
+        patterns += [(s,None,None),(s,p,None),(None,None,o),(None,p,o),(s,p,o)]
+    return patterns
+
+
+def test_search_matches_edge_scan(graph):
+    for pattern in _patterns(graph):
+        assert _search(graph,pattern) == _scan(graph,pattern),pattern
+
+
+def test_search_unknown_terms(graph):
+    unknown = URIRef("http://ex.org/unknown")
+    assert graph.search((unknown,None,None)) == []
+    assert graph.search((None,unknown,None)) == []
+    assert graph.search((None,RDF.type,unknown)) == []
+
+
+def test_search_lazy_returns_first_match(graph):
+    pattern = (None,RDF.type,identifiers.objects.component_definition)
+    assert graph.search(pattern,lazy=True) == graph.search(pattern)[0]
+    assert graph.search((None,None,URIRef("http://ex.org/unknown")),lazy=True) == []
+
+
+def test_search_follows_added_and_removed_edges(graph):
+    role = identifiers.predicates.role
+    cd_type = identifiers.objects.component_definition
+    n,v,e = graph.search((None,RDF.type,cd_type))[0]
+    key = (cd_type,role,e[0])
+    graph.add_edge(v[0],n[0],key,weight=1)
+    assert _search(graph,(None,role,e[0])) == [(v[0],n[0],key)]
+    assert _search(graph,(None,role,None)) == _scan(graph,(None,role,None))
+    graph.remove_edge(v[0],n[0],key)
+    assert _search(graph,(None,role,e[0])) == []
+    assert _search(graph,(cd_type,None,None)) == []
+
+
+
+def test_remove_edge_without_key_drops_latest(graph):
+    role = identifiers.predicates.role
+    n,v,e = graph.search((None,RDF.type,identifiers.objects.component_definition))[0]
+    first,second = (e[0],role,e[2]),(e[0],identifiers.predicates.type,e[2])
+    graph.add_edge(n[0],v[0],first)
+    graph.add_edge(n[0],v[0],second)
+    graph.remove_edge(n[0],v[0])
+    assert _search(graph,(None,role,None)) == _scan(graph,(None,role,None))
+    assert [k for k in graph._graph[n[0]][v[0]]] == [e,first]
+    graph.remove_edge(n[0],v[0])
+    graph.remove_edge(n[0],v[0])
+    assert _search(graph,(e[0],None,e[2])) == []
+    with pytest.raises(nx.NetworkXError):
+        graph.remove_edge(n[0],v[0])
+
+@pytest.mark.parametrize("frozen",[False,True])
+def test_search_limit_and_offset_slice_matches(graph,frozen):
+    if frozen:
+        graph = graph.freeze()
+    for pattern in [(None,None,None),(None,RDF.type,None),(None,identifiers.predicates.role,None)]:
+        matches = graph.search(pattern)
+        for limit,offset in [(1,0),(5,0),(5,3),(None,7),(3,len(matches) - 1),(2,len(matches))]:
+            end = None if limit is None else offset + limit
+            assert graph.search(pattern,limit=limit,offset=offset) == matches[offset:end],(limit,offset)
+        assert graph.search(pattern,limit=0) == []
+
+
+def test_iter_search_stops_early(graph,monkeypatch):
+    scanned = []
+    candidate_edges = graph._candidate_edges
+    def counting(s,p,o):
+        for edge in candidate_edges(s,p,o):
+            scanned.append(edge)
+            yield edge
+    monkeypatch.setattr(graph,"_candidate_edges",counting)
+    assert len(graph.search((None,None,None),limit=3,offset=2)) == 3
+    assert len(scanned) == 5
+    with pytest.raises(TimeoutError):
+        list(graph.iter_search((None,None,None),deadline=0))
+
+
+def _object_patterns(graph):
+    objects = sorted({d["key"] for n,d in graph.nodes(data=True)},key=repr)
+    objects += sorted({o for n,d in graph.nodes(data=True) 
+                       for values in d.get("literals",{}).values() for o in values},key=repr)
+    patterns = []
+    for o in objects[::3]:
+        patterns += [(None,None,o),(None,RDF.type,o),(None,[identifiers.predicates.role,RDF.type],o)]
+    return patterns
+
+
+def _filtered(graph,pattern):
+    # Object-bound lookups against a filter over every match.
+    s,p,o = pattern
+    p = None if p is None else (set(p) if isinstance(p,list) else {p})
+    return sorted(((n[0],v[0],e) for n,v,e in graph.search((None,None,None))
+                   if v[1]["key"] == o and (p is None or e[1] in p)),key=repr)
+
+
+@pytest.mark.parametrize("literals_as_attributes",[False,True])
+@pytest.mark.parametrize("frozen",[False,True])
+def test_object_bound_search_matches_filter(literals_as_attributes,frozen):
+    graph = AbstractGraph(data_file("design.xml"),literals_as_attributes)
+    if frozen:
+        graph = graph.freeze()
+    for pattern in _object_patterns(graph):
+        # Frozen graphs build node data per call, only ids are compared.
+        matches = sorted(((n[0],v[0],e) for n,v,e in graph.search(pattern)),key=repr)
+        assert matches == _filtered(graph,pattern),pattern
+
+
+def test_object_bound_search_after_delta(graph):
+    o = graph.search((None,RDF.type,None))[0][2][2]
+    added = [(URIRef(f'http://ex.org/s{i}'),identifiers.predicates.role,o) for i in range(3)]
+    removed = [e for n,v,e in graph.search((None,None,o))][:2]
+    graph.apply_delta(added,removed)
+    for pattern in [(None,None,o),(None,identifiers.predicates.role,o),(None,RDF.type,o)]:
+        assert _search(graph,pattern) == _filtered(graph,pattern),pattern
+    assert {e for n,v,e in graph.search((None,None,o))}.isdisjoint(removed)
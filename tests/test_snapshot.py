@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from graphs.abstract_graph import AbstractGraph
+from graphs.csr_graph import CSRGraph,snapshot_manifest
+from conftest import data_file
+
+def _graph_data(graph):
+    nodes = {n : d for n,d in graph.nodes(data=True)}
+    edges = sorted((n,v,repr(k),sorted(d.items())) for n,v,k,d in graph.edges(keys=True,data=True))
+    return nodes,edges
+
+
+def _matches(matches):
+    # Literal attributes get node ids per graph, compare them by term.
+    return [(n[0],v[1]["key"],e) for n,v,e in matches]
+
+
+@pytest.mark.parametrize("literals_as_attributes",[False,True])
+def test_snapshot_round_trip(tmp_path,literals_as_attributes):
+    graph = AbstractGraph(data_file("design.xml"),literals_as_attributes)
+    graph.save_snapshot(str(tmp_path / "design.snap"))
+    loaded = AbstractGraph.load_snapshot(str(tmp_path / "design.snap"))
+    assert loaded.frozen
+    assert _graph_data(loaded) == _graph_data(graph)
+    for n,data in graph.nodes(data=True):
+        pattern = (data["key"],None,None)
+        assert _matches(loaded.search(pattern)) == _matches(graph.search(pattern))
+
+
+def test_snapshot_arrays_are_memory_mapped(tmp_path):
+    graph = AbstractGraph(data_file("design.xml"),literals_as_attributes=True)
+    graph.save_snapshot(str(tmp_path / "design.snap"))
+    loaded = CSRGraph.load(str(tmp_path / "design.snap"))
+    assert isinstance(loaded.targets,np.memmap)
+    assert "literals" in loaded.node_columns
+    assert isinstance(loaded.node_columns["literals"].data,np.memmap)
+
+
+def test_pickled_columns_are_refused(tmp_path):
+    path = str(tmp_path / "design.snap")
+    AbstractGraph(data_file("design.xml"),literals_as_attributes=True).save_snapshot(path)
+    column = os.path.join(path,"node_columns_0.npy")
+    np.save(column,np.array([{"a" : 1}],dtype=object),allow_pickle=True)
+    with pytest.raises(ValueError):
+        CSRGraph.load(path)
+    with pytest.raises(ValueError):
+        CSRGraph.load(path,verify=False)
+
+
+def test_unknown_snapshot_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        CSRGraph.load(str(tmp_path))
+    path = tmp_path / "design.snap"
+    AbstractGraph(data_file("design.xml")).save_snapshot(str(path))
+    manifest = (path / snapshot_manifest).read_text().replace('"version": 3','"version": 1')
+    (path / snapshot_manifest).write_text(manifest)
+    with pytest.raises(ValueError):
+        CSRGraph.load(str(path))
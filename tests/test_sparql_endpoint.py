@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from rdflib import Graph
+
+flask = pytest.importorskip("flask")
+
+from graphs.sbol_graph import SBOLGraph
+from dashboards.sparql_endpoint import SPARQLEndpoint
+from conftest import data_file
+
+prefix = "PREFIX sbol: <http://sbols.org/v2#>\n"
+selects = [prefix + "SELECT ?cd ?role WHERE { ?cd a sbol:ComponentDefinition ; sbol:role ?role }",
+           prefix + "SELECT ?cd ?c ?d WHERE { ?cd sbol:component ?c . ?c sbol:definition ?d }",
+           prefix + "SELECT ?cd ?name WHERE { ?cd a sbol:ComponentDefinition . "
+                    "OPTIONAL { ?cd sbol:displayId ?name } }"]
+
+@pytest.fixture(params=["networkx","snapshot"])
+def endpoint(request,tmp_path):
+    graph = SBOLGraph(data_file("design.xml"))
+    if request.param == "snapshot":
+        graph.save_snapshot(str(tmp_path / "design.snap"))
+        graph = SBOLGraph(str(tmp_path / "design.snap"))
+    app = flask.Flask(__name__)
+    return SPARQLEndpoint(graph,app),app.test_client()
+
+
+def _rows(variables,rows):
+    # rdflib keys its rows by variable name, the endpoint by Variable.
+    rows = ({str(k) : value for k,value in row.items()} for row in rows)
+    return sorted(tuple(str(row.get(str(v))) for v in variables) for row in rows)
+
+
+@pytest.mark.parametrize("query",selects)
+def test_select_matches_rdflib(endpoint,query):
+    sparql,client = endpoint
+    kind,variables,rows = sparql.execute(query)
+    assert kind == "SELECT"
+    expected = Graph().parse(data_file("design.xml")).query(query)
+    assert _rows(variables,rows) == _rows(variables,(row.asdict() for row in expected))
+
+
+def test_ask(endpoint):
+    sparql,client = endpoint
+    assert sparql.execute(prefix + "ASK { ?s a sbol:ModuleDefinition }") == ("ASK",True)
+    assert sparql.execute(prefix + "ASK { ?s a sbol:Unknown }") == ("ASK",False)
+
+
+def test_row_limit_and_timeout(endpoint):
+    sparql,client = endpoint
+    sparql.row_limit = 5
+    kind,variables,rows = sparql.execute("SELECT * WHERE { ?s ?p ?o }")
+    assert len(list(rows)) == 5
+    sparql.timeout = 0
+    with pytest.raises(TimeoutError):
+        list(sparql.execute("SELECT * WHERE { ?s ?p ?o . ?a ?b ?c }")[2])
+    response = client.get("/sparql",query_string={"query" : "SELECT * WHERE { ?s ?p ?o . ?a ?b ?c }"})
+    assert response.status_code == 503
+
+
+def test_http_results(endpoint):
+    sparql,client = endpoint
+    response = client.get("/sparql",query_string={"query" : selects[0]})
+    assert response.status_code == 200
+    assert response.mimetype == "application/sparql-results+json"
+    body = json.loads(response.get_data(as_text=True))
+    kind,variables,rows = sparql.execute(selects[0])
+    assert body["head"]["vars"] == [str(v) for v in variables]
+    assert len(body["results"]["bindings"]) == len(list(rows))
+    response = client.post("/sparql",data=prefix + "ASK { ?s a sbol:ModuleDefinition }",
+                           content_type="application/sparql-query")
+    assert json.loads(response.get_data(as_text=True)) == {"head" : {},"boolean" : True}
+
+
+def test_http_errors(endpoint):
+    sparql,client = endpoint
+    assert client.get("/sparql").status_code == 400
+    assert client.get("/sparql",query_string={"query" : "SELCT ?s"}).status_code == 400
+    construct = "CONSTRUCT { ?s ?p ?o } WHERE { ?s ?p ?o }"
+    assert client.get("/sparql",query_string={"query" : construct}).status_code == 400
@@ -0,0 +1,74 @@
+import pytest
+from rdflib import URIRef
+
+pytest.importorskip("pysbolgraph")
+
+from graphs.sbol_graph import SBOLGraph
+from util.graph import RDFGraphWrapper,NetworkXGraphWrapper
+from util.sbol_summarise import get_all_views
+from conftest import data_file
+
+ex = "http://example.org/"
+
+def _unordered(view):
+    # Entries follow the order triples are iterated in, which differs by store.
+    if isinstance(view,dict):
+        return sorted((k,_unordered(v)) for k,v in view.items())
+    if isinstance(view,(list,tuple)):
+        return sorted((_unordered(v) for v in view),key=repr)
+    return view
+
+
+def _patterns(wrapper):
+    triples = list(wrapper)
+    patterns = [(None,None,None)]
+    for s,p,o in triples[::9]:
+        patterns += [(s,None,None),(None,p,None),(None,None,o),(s,p,None),(None,p,o)]
+    return patterns
+
+
+def test_wrapper_searches_like_rdflib():
+    rdf = RDFGraphWrapper(data_file("design.xml"))
+    wrapper = NetworkXGraphWrapper(SBOLGraph(data_file("design.xml")))
+    assert set(wrapper) == set(rdf)
+    assert len(wrapper) == len(rdf)
+    for pattern in _patterns(rdf):
+        assert sorted(wrapper.search(pattern)) == sorted(rdf.search(pattern)),pattern
+        match = wrapper.search(pattern,lazy=True)
+        assert match in rdf.search(pattern)
+
+
+def test_wrapper_mutates_the_graph():
+    graph = SBOLGraph(data_file("design.xml"))
+    wrapper = NetworkXGraphWrapper(graph)
+    triple = (URIRef(ex + "a"),URIRef(ex + "p"),URIRef(ex + "b"))
+    wrapper.add(triple)
+    assert graph.search(triple)[0][2] == triple
+    wrapper.remove(triple)
+    assert graph.search(triple) == []
+    with pytest.raises(ValueError):
+        wrapper.add((URIRef(ex + "a"),URIRef(ex + "p")))
+
+
+def test_summary_of_loaded_graph_matches_file():
+    views = get_all_views(SBOLGraph(data_file("design.xml")))
+    expected = get_all_views(data_file("design.xml"))
+    for view,expected_view in zip(views,expected):
+        assert _unordered(view) == _unordered(expected_view)
+
+
+def test_wrapper_streams_its_triples(monkeypatch):
+    graph = SBOLGraph(data_file("design.xml"))
+    wrapper = NetworkXGraphWrapper(graph)
+    expected = [match[2] for match in graph.search((None,None,None))]
+    scanned = []
+    candidate_edges = graph._candidate_edges
+    def counting(s,p,o):
+        for edge in candidate_edges(s,p,o):
+            scanned.append(edge)
+            yield edge
+    monkeypatch.setattr(graph,"_candidate_edges",counting)
+    triples = iter(wrapper)
+    assert [next(triples) for i in range(3)] == expected[:3]
+    assert len(scanned) == 3
+    assert list(triples) == expected[3:]
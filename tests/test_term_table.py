@@ -0,0 +1,35 @@
+from rdflib import URIRef,Literal,XSD
+
+from graphs.abstract_graph import AbstractGraph
+from util.term_table import term_table
+from conftest import data_file
+
+def test_equal_terms_share_one_instance_and_code():
+    first = URIRef("http://ex.org/term_table/a")
+    second = URIRef("http://ex.org/term_table/" + "a")
+    assert term_table.code(first) is None
+    assert term_table.intern(first) is first
+    assert term_table.intern(second) is first
+    assert term_table.encode(second) == term_table.code(first)
+    assert term_table.decode(term_table.code(first)) is first
+
+
+def test_literals_differ_by_datatype_and_language():
+    terms = [Literal("1"),Literal("1",datatype=XSD.integer),Literal("1",lang="en")]
+    assert len({term_table.encode(t) for t in terms}) == 3
+
+
+def test_triples_round_trip():
+    triple = (URIRef("http://ex.org/s"),URIRef("http://ex.org/p"),Literal("o"))
+    codes = term_table.encode_triple(triple)
+    assert term_table.decode_triple(codes) == triple
+
+
+def test_graphs_share_canonical_terms():
+    graph = AbstractGraph(data_file("design.xml"))
+    other = AbstractGraph(data_file("design.xml"))
+    keys = {d["key"] : d["key"] for n,d in graph.nodes(data=True)}
+    for n,data in other.nodes(data=True):
+        assert keys[data["key"]] is data["key"]
+    for n,v,(s,p,o) in graph.edges(keys=True):
+        assert term_table.intern(p) is p
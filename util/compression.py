@@ -0,0 +1,71 @@
+import os
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+from rdflib.parser import InputSource
+
+_openers = {".gz" : gzip.open,
+            ".bz2" : bz2.open,
+            ".xz" : lzma.open}
+# Suffixes of the RDF and SBOL files a directory or glob input may hold.
+rdf_suffixes = (".xml",".sbol",".rdf",".rdfs",".owl",".ttl",".n3",".nt",".nq",".trig",".trix")
+
+def compression(source):
+    '''
+    Returns the compression suffix of a compressed local file, otherwise None.
+    '''
+    if not isinstance(source,(str,os.PathLike)):
+        return None
+    suffix = os.path.splitext(os.fspath(source))[1].lower()
+    if suffix in _openers:
+        return suffix
+    return None
+
+
+def uncompressed_name(source):
+    '''
+    Returns the name of source without its compression suffix,
+    which is the name the format is guessed from.
+    '''
+    if compression(source) is None:
+        return os.fspath(source)
+    return os.path.splitext(os.fspath(source))[0]
+
+
+def is_rdf_file(source):
+    '''
+    True for a visible file named as RDF or SBOL, compressed or not.
+    '''
+    if os.path.basename(source).startswith("."):
+        return False
+    return uncompressed_name(source).lower().endswith(rdf_suffixes)
+
+
+def open_source(source):
+    '''
+    Opens a local file for binary reading, compressed files are
+    decompressed block by block as they are read.
+    '''
+    suffix = compression(source)
+    if suffix is None:
+        return open(source,"rb")
+    return _openers[suffix](source,"rb")
+
+
+def parse_rdf(graph,source,**kwargs):
+    '''
+    Parses source into an rdflib graph. Compressed files are streamed
+    into the parser, relative URIs resolve as they would against the
+    decompressed file.
+    '''
+    if compression(source) is None:
+        return graph.parse(source,**kwargs)
+    input_source = InputSource()
+    input_source.setPublicId(Path(os.path.abspath(uncompressed_name(source))).as_uri())
+    input_source.setByteStream(open_source(source))
+    try:
+        return graph.parse(input_source,**kwargs)
+    finally:
+        input_source.close()
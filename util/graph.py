@@ -1,23 +1,35 @@
 import re
 import os
-import copy 
 from pathlib import Path
+from itertools import chain,islice
 
 import rdflib
 from pysbolgraph.SBOL2Serialize import serialize_sboll2
 from pysbolgraph.SBOL2Graph import SBOL2Graph
 
+from util.compression import parse_rdf
+
 rdf_type = rdflib.RDF.type
 class RDFGraphWrapper:
+    '''
+    Wrappers built from another wrapper share its triple store, the store
+    is copied by the first mutating method (add, remove, replace, 
+    add_graph) called on either side. An rdflib graph is copied when the
+    wrapper is built, as its owner may still change it.
+    '''
     def __init__(self, graph = None):
+        self._shared = False
+        self.version = 0
         if isinstance(graph,RDFGraphWrapper):
-            self.graph = copy.deepcopy(graph.graph)
+            self.graph = graph.graph
+            self._shared = True
+            graph._shared = True
         elif isinstance(graph,rdflib.Graph):
-            self.graph = copy.deepcopy(graph)
+            self.graph = _copy_graph(graph)
         else:
             self.graph = rdflib.Graph()
             if graph is not None:
-                self.graph.load(graph)
+                parse_rdf(self.graph,graph,format="xml")
 
     def __iter__(self):
         for x in self.graph:
@@ -30,6 +42,7 @@ class RDFGraphWrapper:
         '''
         Given a single or list of triples add each triple to graph.
         '''
+        self._copy_on_write()
         if isinstance(triples, list):
             for s,p,o in triples:
                 self.graph.add((rdflib.URIRef(s),rdflib.URIRef(p),o))
@@ -44,6 +57,7 @@ class RDFGraphWrapper:
         '''
         Given a single or list of triples add each triple to graph.
         '''
+        self._copy_on_write()
         if isinstance(triples, list):
             for triple in triples:
                 if len(triple) != 3:
@@ -61,16 +75,21 @@ class RDFGraphWrapper:
         self.remove(target)
         self.add(value)
     
-    def search(self,pattern,lazy=False):
+    def search(self,pattern,lazy=False,limit=None,offset=0):
         if lazy:
-            for res in self.graph.triples(pattern):
+            for res in self.iter_search(pattern,1,offset):
                 return res
             return None
         else:
-            results = []
-            for res in self.graph.triples(pattern):
-                results.append(res)
-            return results
+            return list(self.iter_search(pattern,limit,offset))
+
+    def iter_search(self,pattern,limit=None,offset=0):
+        '''
+        Yields the triples matching pattern, skipping the first offset
+        and stopping after limit of them.
+        '''
+        stop = None if limit is None else offset + max(limit,0)
+        return islice(self.graph.triples(pattern),offset,stop)
 
     def triples(self,pattern):
         return self.graph.triples(pattern)
@@ -138,6 +157,8 @@ class RDFGraphWrapper:
         Standard setter that sets the graph with a new input graph.
         '''
         self.graph = graph
+        self._shared = False
+        self.version += 1
     
     def sub_graph(self, triplepack=[]):
         new_graph = RDFGraphWrapper()
@@ -147,8 +168,34 @@ class RDFGraphWrapper:
     def add_graph(self,graph):
         if isinstance(graph, rdflib.Graph):
             self.graph = self.graph + graph
+            self._shared = False
+            self.version += 1
         else:
-            self.graph.parse(graph)
+            self._copy_on_write()
+            parse_rdf(self.graph,graph)
+
+    def apply_delta(self,added=[],removed=[]):
+        '''
+        Removes then adds the given triples in place and
+        returns the subjects and objects they touched.
+        '''
+        self._copy_on_write()
+        touched = set()
+        for s,p,o in removed:
+            self.graph.remove((s,p,o))
+            touched.update((s,o))
+        for s,p,o in added:
+            self.graph.add((s,p,o))
+            touched.update((s,o))
+        return touched
+
+    def _copy_on_write(self):
+        # Runs ahead of every in place mutation, which also moves the version on.
+        self.version += 1
+        if not self._shared:
+            return
+        self.graph = _copy_graph(self.graph)
+        self._shared = False
 
     def save(self,filename,format="xml"):
         if format == 'sbolxml':
@@ -177,6 +224,90 @@ class RDFGraphWrapper:
             pysbolG += self.graph
             return serialize_sboll2(pysbolG).decode("utf-8")
 
+
+class NetworkXGraphWrapper(RDFGraphWrapper):
+    '''
+    Presents an already loaded AbstractGraph through the RDFGraphWrapper
+    interface so the rdflib based helpers run without a second parse.
+    Searches are answered from the graph indexes, mutations go through
+    AbstractGraph.apply_delta and an rdflib graph is only built for
+    serialisation.
+    '''
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __iter__(self):
+        return self.iter_search((None,None,None))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @property
+    def graph(self):
+        graph = rdflib.Graph()
+        for triple in self:
+            graph.add(triple)
+        return graph
+
+    @property
+    def version(self):
+        return self._graph.version
+
+    def add(self,triples):
+        if isinstance(triples, tuple):
+            if len(triples) != 3:
+                raise ValueError("RDF Triples must contain three values.")
+            triples = [triples]
+        elif not isinstance(triples, list):
+            raise ValueError("Input must be a triple or list of triples")
+        self._graph.apply_delta(added=triples)
+
+    def remove(self,triples):
+        if isinstance(triples, tuple):
+            triples = [triples]
+        elif not isinstance(triples, list):
+            raise ValueError("Input must be a triple or list of triples")
+        for triple in triples:
+            if len(triple) != 3:
+                raise ValueError("RDF Triples must contain three values.")
+        self._graph.apply_delta(removed=triples)
+
+    def search(self,pattern,lazy=False,limit=None,offset=0):
+        if lazy:
+            match = self._graph.search(pattern,True,offset=offset)
+            return match[2] if match else None
+        return list(self.iter_search(pattern,limit,offset))
+
+    def iter_search(self,pattern,limit=None,offset=0):
+        for match in self._graph.iter_search(pattern,limit,offset):
+            yield match[2]
+
+    def triples(self,pattern):
+        return self.iter_search(pattern)
+
+    def get_triples(self,subjects):
+        return [triple for triple in self if triple[0] in subjects]
+
+    def get_identity_list(self):
+        return list(dict.fromkeys(triple[0] for triple in self))
+
+    def load_graph(self,graph):
+        raise ValueError("Wrapped graphs can't be replaced, wrap the new graph instead.")
+
+    def add_graph(self,graph):
+        raise ValueError("Wrapped graphs can't be extended, use add or apply_delta.")
+
+    def apply_delta(self,added=[],removed=[]):
+        self._graph.apply_delta(added,removed)
+        return {term for s,p,o in chain(removed,added) for term in (s,o)}
+
+def _copy_graph(graph):
+    copy = rdflib.Graph()
+    for prefix,namespace in graph.namespaces():
+        copy.bind(prefix,namespace)
+    copy += graph
+    return copy
+
 def uri_ref(string):
     '''
     Elements added to a rdflib graph must be a URIRef object you can NOT just add primitives (string,int etc)
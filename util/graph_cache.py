@@ -0,0 +1,222 @@
+import os
+import hashlib
+import marshal
+from array import array
+
+import networkx as nx
+import rdflib
+from rdflib import URIRef,BNode,Literal
+
+from util.term_table import term_table
+from util.prefix_table import prefix_table
+
+cache_version = 3
+cache_suffix = ".graph"
+default_directory = os.path.join(os.path.expanduser("~"),".cache","sbol_graph_visualiser")
+default_max_size = 512 * 1024 * 1024
+
+uri_term = 0
+bnode_term = 1
+literal_term = 2
+
+class GraphCache:
+    '''
+    On-disk cache of converted graphs keyed by the content hash of the
+    input file and the parser version. Least recently used entries are
+    evicted once the cache grows beyond max_size bytes.
+    '''
+    def __init__(self,directory=default_directory,max_size=default_max_size):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self,source,*options):
+        '''
+        Returns the cache key for a local file or None when the source can't be cached.
+        Ingest options that change the converted graph are part of the key.
+        '''
+        if not isinstance(source,(str,os.PathLike)) or not os.path.isfile(source):
+            return None
+        digest = hashlib.sha256()
+        digest.update(f'{cache_version}-{marshal.version}-{rdflib.__version__}-{options}'.encode())
+        with open(source,"rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self,key):
+        '''
+        Returns (networkx graph, node index, max key) for a cached entry or None on a miss.
+        '''
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path,"rb") as f:
+                payload = marshal.load(f)
+            # Touch the entry so it is the last to be evicted.
+            os.utime(path)
+        except (OSError,EOFError,ValueError,TypeError):
+            return None
+        return decode_graph(payload)
+
+    def save(self,key,graph,max_key):
+        if key is None:
+            return
+        path = self._path(key)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.directory,exist_ok=True)
+            with open(temp_path,"wb") as f:
+                marshal.dump(encode_graph(graph,max_key),f)
+            os.replace(temp_path,path)
+            self._evict()
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for path,size,mtime in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _path(self,key):
+        return os.path.join(self.directory,key + cache_suffix)
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(cache_suffix):
+                continue
+            path = os.path.join(self.directory,name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path,stat.st_size,stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(),key=lambda e: e[2])
+        total = sum(e[1] for e in entries)
+        for path,size,mtime in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def encode_graph(graph,max_key):
+    '''
+    Packs a converted networkx graph into builtin types (term, prefix 
+    and name tables, int64 arrays). URIs are packed as a prefix code 
+    local to the payload and their local name.
+    '''
+    terms = {}
+    names = {}
+    prefixes = {}
+    def term_code(term):
+        return terms.setdefault(term,len(terms))
+    def name_code(name):
+        if name is None:
+            return -1
+        return names.setdefault(name,len(names))
+
+    nodes = array("q")
+    literals = array("q")
+    for node,data in graph.nodes(data=True):
+        nodes.extend((node,term_code(data["key"]),name_code(data.get("display_name"))))
+        for p,objects in data.get("literals",{}).items():
+            for o in objects:
+                literals.extend((node,term_code(p),term_code(o)))
+    edges = array("q")
+    for n,v,k,data in graph.edges(keys=True,data=True):
+        edges.extend((n,v,term_code(k[0]),term_code(k[1]),term_code(k[2]),
+                      name_code(data.get("display_name"))))
+    return {"max_key" : max_key,
+            "terms" : [_encode_term(t,prefixes) for t in terms],
+            "prefixes" : [prefix_table.decode(c) for c in prefixes],
+            "names" : list(names),
+            "nodes" : nodes.tobytes(),
+            "edges" : edges.tobytes(),
+            "literals" : literals.tobytes()}
+
+
+def decode_graph(payload):
+    nx_graph = nx.MultiDiGraph()
+    node_index = {}
+    nodes,edges,literals = decode_payload(payload)
+    for node,key,name in nodes:
+        if name is None:
+            nx_graph.add_node(node,key=key)
+        else:
+            nx_graph.add_node(node,key=key,display_name=name)
+        node_index.setdefault(key,{})[node] = None
+    for node,p,o in literals:
+        nx_graph.nodes[node].setdefault("literals",{}).setdefault(p,[]).append(o)
+    for n,v,key,name in edges:
+        if name is None:
+            nx_graph.add_edge(n,v,key=key,weight=1)
+        else:
+            nx_graph.add_edge(n,v,key=key,weight=1,display_name=name)
+    return nx_graph,node_index,payload["max_key"]
+
+
+def decode_payload(payload):
+    '''
+    Returns generators of (node,key,display name), (n,v,key,display name) 
+    and (node,predicate,literal) from an encoded graph.
+    '''
+    terms = [term_table.intern(_decode_term(t,payload["prefixes"])) for t in payload["terms"]]
+    names = payload["names"]
+    def _nodes():
+        nodes = array("q",payload["nodes"])
+        for i in range(0,len(nodes),3):
+            node,term,name = nodes[i:i+3]
+            yield node,terms[term],None if name == -1 else names[name]
+    def _edges():
+        edges = array("q",payload["edges"])
+        for i in range(0,len(edges),6):
+            n,v,s,p,o,name = edges[i:i+6]
+            yield n,v,(terms[s],terms[p],terms[o]),None if name == -1 else names[name]
+    def _literals():
+        literals = array("q",payload["literals"])
+        for i in range(0,len(literals),3):
+            node,p,o = literals[i:i+3]
+            yield node,terms[p],terms[o]
+    return _nodes(),_edges(),_literals()
+
+
+def _encode_term(term,prefixes):
+    if isinstance(term,Literal):
+        datatype = None if term.datatype is None else str(term.datatype)
+        return (literal_term,str(term),datatype,term.language)
+    if isinstance(term,BNode):
+        return (bnode_term,str(term))
+    code,local = prefix_table.split(term)
+    if code is None:
+        return (uri_term,str(term))
+    return (uri_term,local,prefixes.setdefault(code,len(prefixes)))
+
+
+def _decode_term(encoded,prefixes):
+    if encoded[0] == literal_term:
+        return Literal(encoded[1],lang=encoded[3],datatype=encoded[2])
+    if encoded[0] == bnode_term:
+        return BNode(encoded[1])
+    if len(encoded) == 3:
+        return URIRef(prefixes[encoded[2]] + encoded[1])
+    return URIRef(encoded[1])
+
+
+graph_cache = GraphCache()
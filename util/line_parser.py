@@ -0,0 +1,99 @@
+import os
+from io import BytesIO
+
+from rdflib import Graph,BNode
+from rdflib.parser import InputSource
+from rdflib.util import guess_format
+from rdflib.plugins.parsers.ntriples import NTriplesParser,r_nodeid
+from rdflib.plugins.parsers.nquads import NQuadsParser
+
+from util.compression import compression,uncompressed_name,open_source
+
+line_formats = ("nt","nquads")
+default_chunk_size = 32 * 1024 * 1024
+
+def line_format(source):
+    '''
+    Returns the rdflib format name of a local N-Triples or N-Quads file, 
+    which may be compressed, otherwise None.
+    '''
+    if not isinstance(source,(str,os.PathLike)) or not os.path.isfile(source):
+        return None
+    rdf_format = guess_format(uncompressed_name(source))
+    if rdf_format in line_formats:
+        return rdf_format
+    return None
+
+
+def line_chunks(source,chunk_size=default_chunk_size):
+    '''
+    Splits a file into (start,end) byte ranges of roughly chunk_size
+    which always end on a line boundary. Compressed files can't be
+    split without decompressing them and are read as one open ended range.
+    '''
+    if compression(source) is not None:
+        return [(0,None)]
+    chunks = []
+    size = os.path.getsize(source)
+    start = 0
+    with open(source,"rb") as f:
+        while start < size:
+            f.seek(min(start + chunk_size,size))
+            f.readline()
+            end = min(f.tell(),size)
+            chunks.append((start,end))
+            start = end
+    return chunks
+
+
+def parse_lines(source,start,end,rdf_format,store,scope):
+    '''
+    Parses the lines within a byte range of source into store.
+    Blank node labels are prefixed with scope so every chunk
+    of a file resolves a label to the same blank node.
+    An open ended range is streamed line by line from the start of the file.
+    '''
+    if end is None:
+        with open_source(source) as f:
+            _parse_stream(f,rdf_format,store,scope)
+        return
+    with open(source,"rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    _parse_stream(BytesIO(data),rdf_format,store,scope)
+
+
+def _parse_stream(stream,rdf_format,store,scope):
+    if rdf_format == "nquads":
+        input_source = InputSource()
+        input_source.setByteStream(stream)
+        _NQuadsChunkParser(scope).parse(input_source,Graph(store=store))
+    else:
+        _NTriplesChunkParser(scope,_StoreSink(store)).parse(stream)
+
+
+class _ScopedNodeIds:
+    def nodeid(self):
+        if self.peek('_'):
+            return BNode(self.scope + self.eat(r_nodeid).group(1))
+        return False
+
+
+class _NTriplesChunkParser(_ScopedNodeIds,NTriplesParser):
+    def __init__(self,scope,sink):
+        super().__init__(sink)
+        self.scope = scope
+
+
+class _NQuadsChunkParser(_ScopedNodeIds,NQuadsParser):
+    def __init__(self,scope):
+        super().__init__()
+        self.scope = scope
+
+
+class _StoreSink:
+    def __init__(self,store):
+        self.store = store
+
+    def triple(self,s,p,o):
+        self.store.add((s,p,o))
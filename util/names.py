@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+from rdflib import URIRef
+
+from util.prefix_table import last_separator,is_version
+
+name_cache_size = 1 << 16
+
+@lru_cache(maxsize=name_cache_size)
+def get_name(subject):
+    '''
+    Returns the human readable name of a URI, the last path segment
+    or the one before it when the last is a version number.
+    Memoized process wide, see name_cache_info for hit and miss counts.
+    '''
+    name = subject[last_separator(subject) + 1:]
+    if is_version(name):
+        end = len(subject) - len(name) - 1
+        return subject[last_separator(subject,end) + 1:end]
+    return name
+
+
+def display_name(term):
+    '''
+    Name a node is labelled with, literals and blank nodes are shown as is.
+    '''
+    if isinstance(term,URIRef):
+        return get_name(term)
+    return str(term)
+
+
+def node_name(data):
+    '''
+    Label of a node from its attributes. Names are not stored on the graph 
+    unless given explicitly, the name of the key is derived on first access.
+    '''
+    name = data.get("display_name")
+    if name is None:
+        return display_name(data["key"])
+    return name
+
+
+def edge_name(key,data):
+    '''
+    Label of an edge keyed by a triple, its explicit name or the predicate's.
+    '''
+    name = data.get("display_name")
+    if name is None:
+        return get_name(key[1])
+    return name
+
+
+def name_cache_info():
+    return get_name.cache_info()
+
@@ -0,0 +1,126 @@
+from rdflib.namespace import RDF,RDFS,XSD,OWL
+
+from util.sbol_identifiers import identifiers as sbol_identifiers
+from util.kg_identifiers import identifiers as kg_identifiers
+
+separators = "#/:"
+
+class PrefixTable:
+    '''
+    Namespace prefixes URIs are split on, each held once under a small
+    integer code so a URI can be stored as (prefix code, local name).
+    Seeded from the identifier modules and extended with the namespace
+    of every URI interned during ingest. Snapshots and the parse cache 
+    store URIs in this split form, graphs in memory keep whole terms.
+    '''
+    def __init__(self,prefixes=[]):
+        self._codes = {}
+        self._prefixes = []
+        for prefix in prefixes:
+            self.encode(prefix)
+
+    def __len__(self):
+        return len(self._prefixes)
+
+    def __contains__(self,prefix):
+        return prefix in self._codes
+
+    def encode(self,prefix):
+        '''
+        Returns the code for prefix, adding it if unseen.
+        '''
+        code = self._codes.get(prefix)
+        if code is None:
+            code = len(self._prefixes)
+            self._codes[prefix] = code
+            self._prefixes.append(prefix)
+        return code
+
+    def decode(self,code):
+        return self._prefixes[code]
+
+    def add(self,uri):
+        '''
+        Adds the namespace of uri unless a known prefix already covers it.
+        '''
+        if self.split(uri)[0] is not None:
+            return
+        namespace = _namespace(uri)
+        if namespace is not None:
+            self.encode(namespace)
+
+    def split(self,uri):
+        '''
+        Returns (prefix code,local name) for the longest known prefix
+        of uri ending on a separator, otherwise (None,uri).
+        '''
+        end = len(uri)
+        while True:
+            end = last_separator(uri,end)
+            if end < 0:
+                return None,uri
+            code = self._codes.get(uri[:end + 1])
+            if code is not None:
+                return code,uri[end + 1:]
+
+    def join(self,code,local):
+        if code is None:
+            return local
+        return self._prefixes[code] + local
+
+    def local_name(self,uri):
+        return self.split(uri)[1]
+
+
+def last_separator(value,end=None):
+    '''
+    Returns the index of the last separator before end, otherwise -1.
+    '''
+    return max(value.rfind(s,0,end) for s in separators)
+
+
+def is_version(segment):
+    '''
+    SBOL versions are a single digit or a three character number (1.0).
+    '''
+    if len(segment) == 1:
+        return segment.isdigit()
+    if len(segment) == 3:
+        try:
+            float(segment)
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def _namespace(uri):
+    # Everything before the name segment, a trailing version
+    # stays in the local name with the name it belongs to.
+    end = last_separator(uri)
+    if end >= 0 and is_version(uri[end + 1:]):
+        end = last_separator(uri,end)
+    if end < 0:
+        return None
+    return uri[:end + 1]
+
+
+def _seed_prefixes(namespaces):
+    for value in vars(namespaces).values():
+        if isinstance(value,str):
+            values = [value]
+        elif isinstance(value,list):
+            values = value
+        elif hasattr(value,"__dict__"):
+            yield from _seed_prefixes(value)
+            continue
+        else:
+            continue
+        for prefix in values:
+            if prefix[-1:] in separators:
+                yield str(prefix)
+
+
+prefix_table = PrefixTable([str(RDF),str(RDFS),str(XSD),str(OWL),
+                            *_seed_prefixes(sbol_identifiers.namespaces),
+                            *_seed_prefixes(kg_identifiers.namespaces)])
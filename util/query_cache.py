@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict,namedtuple
+
+query_cache_size = 1 << 12
+
+CacheInfo = namedtuple("CacheInfo",["hits","misses","maxsize","currsize"])
+
+class QueryCache:
+    '''
+    Results of graph lookups keyed by their normalised pattern, the least
+    recently used is evicted past maxsize. Results are only valid for the
+    graph version they were computed at, a lookup at any other version
+    empties the cache first. Safe to share between the threads of a 
+    threaded server, results are computed outside the lock.
+    '''
+    def __init__(self,maxsize=query_cache_size):
+        if maxsize <= 0:
+            raise ValueError("Query cache size must be positive.")
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._results)
+
+    def get(self,key,version,compute):
+        '''
+        Returns the cached result for key, otherwise calls compute and caches it.
+        '''
+        with self._lock:
+            if version != self.version:
+                self._results.clear()
+                self.version = version
+            try:
+                result = self._results[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return result
+        result = compute()
+        with self._lock:
+            # Dropped if the graph moved on while it was computed.
+            if version == self.version:
+                self._results[key] = result
+                if len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits,self.misses,self.maxsize,len(self._results))
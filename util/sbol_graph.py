@@ -2,7 +2,9 @@ import re
 
 
 from util.sbol_identifiers import identifiers
-from util.graph import RDFGraphWrapper
+from util.graph import RDFGraphWrapper,NetworkXGraphWrapper
+from graphs.abstract_graph import AbstractGraph
+from util.names import get_name
 class SBOLGraph:
     def __init__(self,graph):
         self.graph = SBOLGraphUtil(graph)
@@ -245,11 +247,7 @@ class SBOLGraph:
         return self.graph.search(pattern,lazy)
 
     def get_name(self,subject):
-        split_subject = self.split(subject)
-        if len(split_subject[-1]) == 1 and split_subject[-1].isdigit():
-            return split_subject[-2]
-        else:
-            return split_subject[-1]
+        return get_name(subject)
 
     def split(self,uri):
         return re.split('#|\/|:', uri)
@@ -271,7 +269,10 @@ class SBOLGraph:
 
 class SBOLGraphUtil:
     def __init__(self,graph):
-        self.graph = RDFGraphWrapper(graph)
+        if isinstance(graph,AbstractGraph):
+            self.graph = NetworkXGraphWrapper(graph)
+        else:
+            self.graph = RDFGraphWrapper(graph)
         self.rdf_type = identifiers.predicates.rdf_type
         self.definition = identifiers.predicates.definition
         self.type = identifiers.predicates.type
@@ -307,7 +308,7 @@ class SBOLGraphUtil:
     # - Parent Searches
     def get_parent(self,child,predicate):
         if predicate == identifiers.predicates.component:
-            for s,p,o in self.graph.search((None,predicate,child)):
+            for s,p,o in self.graph.iter_search((None,predicate,child)):
                 if self.get_rdf_type(s)[2] == identifiers.objects.component_definition:
                     return s,p,o
         return self.graph.search((None,predicate,child),lazy=True)
@@ -333,8 +334,11 @@ class SBOLGraphUtil:
         roles = self.graph.search((subject,self.role,None))
         return roles
     
-    def search(self,pattern,lazy=False):
-        return self.graph.search(pattern,lazy=lazy)
+    def search(self,pattern,lazy=False,limit=None,offset=0):
+        return self.graph.search(pattern,lazy=lazy,limit=limit,offset=offset)
+
+    def iter_search(self,pattern,limit=None,offset=0):
+        return self.graph.iter_search(pattern,limit,offset)
 
     def add(self,triples):
         # Need to add the triples to the intermediate sub_graphs also.
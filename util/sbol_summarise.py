@@ -1,12 +1,16 @@
 import sys
-import re
 
 from util.sbol_graph import SBOLGraph
 from util.sbol_identifiers import identifiers
+from util.names import get_name
 
 
-def get_all_views(filename):
-    graph = SBOLGraph(filename)
+def get_all_views(graph):
+    '''
+    graph is a filename or an already loaded AbstractGraph,
+    which is then summarised without parsing the file again.
+    '''
+    graph = SBOLGraph(graph)
     summary_view = summarise_json(graph)
     tree_view = heirachy_json(graph)
     functional_view = functional_json(graph)
@@ -26,7 +30,7 @@ def heirachy_json(graph):
             continue
         types = _get_types(cd,graph)
         roles = _get_roles(cd,graph)
-        name = f'{_get_name(cd)} - {"-".join(types)} - {"-".join(roles)}'
+        name = f'{get_name(cd)} - {"-".join(types)} - {"-".join(roles)}'
         level = _build_heirachy_tree(cd,graph)
         if len(level) > 0:
             json_heirachy[name] = level
@@ -36,7 +40,7 @@ def heirachy_json(graph):
 def functional_json(graph):
     json_functional = {}
     for md in graph.get_module_definitions():
-        json_functional[_get_name(md)] = _build_functional_tree(md,graph)
+        json_functional[get_name(md)] = _build_functional_tree(md,graph)
     return json_functional
 
 
@@ -46,7 +50,7 @@ def _build_functional_tree(entity,graph):
     sub_modules = {}
     for module in graph.get_heirachical_instances(entity):
         definition = graph.get_definition(module)
-        sub_modules[_get_name(definition)] = _build_functional_tree(definition,graph)
+        sub_modules[get_name(definition)] = _build_functional_tree(definition,graph)
     if len(interactions) > 0:
         level["Interactions"] = interactions
     if len(sub_modules) > 0:
@@ -58,7 +62,7 @@ def _build_heirachy_tree(entity,graph):
     level = {}
     for component in graph.get_components(entity):
         definition = graph.get_definition(component)
-        level[_get_name(definition)] = _build_heirachy_tree(definition,graph)
+        level[get_name(definition)] = _build_heirachy_tree(definition,graph)
     return level
 
 
@@ -68,7 +72,7 @@ def _component_definitions(graph):
         types = _get_types(cd,graph)
         roles = _get_roles(cd,graph)
         components = _get_instances(cd,graph)
-        cd_name = _get_name(cd)
+        cd_name = get_name(cd)
 
         cd_json[cd_name] = {}
         if len(roles) > 0:
@@ -106,7 +110,7 @@ def _get_instances(identity,graph):
     instances = {}
     instance_parents = []
     for instance in graph.get_heirachical_instances(identity):
-        instance_name = _get_name(graph.get_component_definition(instance))
+        instance_name = get_name(graph.get_component_definition(instance))
         instance_parents.append(instance_name)
     
     if len(instance_parents) > 0:
@@ -122,7 +126,7 @@ def _module_definitions(graph):
     for md in graph.get_module_definitions():
         components = _get_functional_components(md,graph)
         interactions = _get_interactions(md,graph)
-        md_json[_get_name(md)] = {"components" : components,"interactions" : interactions}
+        md_json[get_name(md)] = {"components" : components,"interactions" : interactions}
     return md_json
 
 
@@ -130,14 +134,14 @@ def _get_functional_components(identity,graph):
     fcs = {}
     for fc in graph.get_functional_components(identity):
         definition = graph.get_definition(fc)
-        fcs[_get_name(fc)] = _get_name(definition)
+        fcs[get_name(fc)] = get_name(definition)
     return fcs
 
 
 def _get_interactions(identity,graph):
     interactions = {}
     for interaction in graph.get_interactions(md=identity):
-        name = _get_name(interaction)
+        name = get_name(interaction)
         for i_type in graph.get_types(interaction):
             try:
                 type_name = identifiers.external.interaction_type_names[i_type]
@@ -154,7 +158,7 @@ def _get_participants(identity,graph):
         participant = graph.get_functional_components(participation=participation)
         definition = graph.get_definition(participant)
 
-        name = _get_name(definition)
+        name = get_name(definition)
         for r in graph.get_roles(participation):
             try:
                 role_name = identifiers.external.inhibition_participants[r]
@@ -166,16 +170,5 @@ def _get_participants(identity,graph):
     return participants
 
 
-def _get_name(subject):
-    split_subject = _split(subject)
-    if len(split_subject[-1]) == 1 and split_subject[-1].isdigit():
-        return split_subject[-2]
-    else:
-        return split_subject[-1]
-
-
-def _split(uri):
-    return re.split('#|\/|:', uri)
-
 if __name__ == "__main__":
     summarise_json(sys.argv[1])
\ No newline at end of file
@@ -0,0 +1,125 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from rdflib import URIRef,Literal,RDF
+
+from util.compression import open_source
+
+_rdf = "{" + str(RDF) + "}"
+_root = _rdf + "RDF"
+_description = _rdf + "Description"
+_about = _rdf + "about"
+_resource = _rdf + "resource"
+_datatype = _rdf + "datatype"
+_lang = "{http://www.w3.org/XML/1998/namespace}lang"
+_absolute = re.compile(r'^[A-Za-z][A-Za-z0-9+.\-]*:')
+
+def parse_sbol_xml(source,store):
+    '''
+    Streams the striped RDF/XML written for SBOL2 into store: typed node
+    elements with rdf:about whose property elements hold an rdf:resource,
+    a literal or one nested node element. Elements are cleared as soon as
+    they are read and triples are added in the order the rdflib RDF/XML
+    parser adds them. Returns False as soon as the document uses anything
+    else, the caller then discards the store and uses the generic parser.
+    Compressed files are decompressed as they are read.
+    '''
+    if not isinstance(source,(str,os.PathLike)) or not os.path.isfile(source):
+        return False
+    with open_source(source) as f:
+        return _parse(f,store)
+
+
+def _parse(f,store):
+    # Node elements are held as [subject,language] and
+    # property elements as [predicate,object,datatype,language].
+    stack = []
+    root = None
+    try:
+        for event,elem in ET.iterparse(f,events=("start","end")):
+            depth = len(stack)
+            if event == "start":
+                if depth == 0:
+                    if elem.tag != _root or not _only(elem.attrib,(_lang,)):
+                        return False
+                    root = elem
+                    stack.append([None,elem.get(_lang)])
+                elif depth % 2 == 1:
+                    node = _node_element(elem,stack[-1])
+                    if node is None:
+                        return False
+                    if depth > 1:
+                        if stack[-1][1] is not None:
+                            return False
+                        stack[-1][1] = node[0]
+                    if elem.tag != _description:
+                        store.add((node[0],RDF.type,_tag_uri(elem.tag)))
+                    stack.append(node)
+                else:
+                    prop = _property_element(elem,stack[-1])
+                    if prop is None:
+                        return False
+                    stack.append(prop)
+                continue
+
+            entry = stack.pop()
+            depth -= 1
+            if depth % 2 == 0 and depth > 0:
+                predicate,obj,datatype,language = entry
+                if obj is None:
+                    if len(elem) > 0:
+                        return False
+                    obj = Literal(elem.text or "",None if datatype is not None else language,datatype)
+                store.add((stack[-1][0],predicate,obj))
+                elem.clear()
+            elif depth == 1:
+                root.clear()
+    except ET.ParseError:
+        return False
+    return True
+
+
+def _node_element(elem,parent):
+    if not elem.tag.startswith("{") or (elem.tag.startswith(_rdf) and elem.tag != _description):
+        return None
+    if not _only(elem.attrib,(_about,_lang)):
+        return None
+    subject = elem.get(_about)
+    if subject is None or not _is_absolute(subject):
+        return None
+    return [URIRef(subject),elem.get(_lang,parent[-1])]
+
+
+def _property_element(elem,parent):
+    if not elem.tag.startswith("{") or (elem.tag.startswith(_rdf) and elem.tag != _rdf + "type"):
+        return None
+    if not _only(elem.attrib,(_resource,_datatype,_lang)):
+        return None
+    language = elem.get(_lang,parent[-1])
+    resource = elem.get(_resource)
+    if resource is not None:
+        if _datatype in elem.attrib or not _is_absolute(resource):
+            return None
+        return [_tag_uri(elem.tag),URIRef(resource),None,language]
+    datatype = elem.get(_datatype)
+    if datatype is not None:
+        if not _is_absolute(datatype):
+            return None
+        datatype = URIRef(datatype)
+    return [_tag_uri(elem.tag),None,datatype,language]
+
+
+def _tag_uri(tag):
+    namespace,local = tag[1:].split("}",1)
+    return URIRef(namespace + local)
+
+
+def _is_absolute(uri):
+    # rdflib resolves against the document location, only absolute
+    # URIs outside of the file scheme resolve to themselves.
+    return _absolute.match(uri) is not None and not uri.lower().startswith("file:")
+
+
+def _only(attrib,allowed):
+    return all(a in allowed for a in attrib)
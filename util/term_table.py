@@ -0,0 +1,57 @@
+from rdflib import URIRef
+
+from util.prefix_table import prefix_table
+
+class TermTable:
+    '''
+    Interns RDF terms to small integer codes.
+    Each distinct term is held once and every graph built in the
+    process shares the same canonical term objects and codes.
+    The namespace of each new URI is added to the prefix table.
+    '''
+    def __init__(self):
+        self._codes = {}
+        self._terms = []
+
+    def __len__(self):
+        return len(self._terms)
+
+    def __contains__(self,term):
+        return term in self._codes
+
+    def intern(self,term):
+        '''
+        Returns the canonical instance of term, adding it if unseen.
+        '''
+        return self._terms[self.encode(term)]
+
+    def encode(self,term):
+        '''
+        Returns the code for term, adding it if unseen.
+        '''
+        code = self._codes.get(term)
+        if code is None:
+            code = len(self._terms)
+            self._codes[term] = code
+            self._terms.append(term)
+            if isinstance(term,URIRef):
+                prefix_table.add(term)
+        return code
+
+    def code(self,term):
+        '''
+        Returns the code for term or None if the term has never been seen.
+        '''
+        return self._codes.get(term)
+
+    def decode(self,code):
+        return self._terms[code]
+
+    def encode_triple(self,triple):
+        return tuple(self.encode(t) for t in triple)
+
+    def decode_triple(self,codes):
+        return tuple(self._terms[c] for c in codes)
+
+
+term_table = TermTable()
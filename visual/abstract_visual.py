@@ -1,9 +1,9 @@
 import sys,os
 import math
-import re
 import dash_cytoscape as cyto
 import networkx as nx
 from util.color_manager import StandardPalette
+from util.names import get_name,node_name,edge_name
 from rdflib.namespace import RDF
 
 
@@ -289,9 +289,8 @@ class AbstractVisualiser:
         '''
         if self.node_text_preset == self.add_node_name_labels:
             node_text = []
-            names = nx.get_node_attributes(self.graph_view,"display_name")
-            for v in names.values():
-                node_text.append(v)
+            for node,data in self.graph_view.nodes(data=True):
+                node_text.append(node_name(data))
             return node_text
         else:
             self.node_text_preset = self.add_node_name_labels
@@ -306,7 +305,7 @@ class AbstractVisualiser:
             for node in self.graph_view.nodes:
                 for n,v,e in self._graph.edges(node,keys=True):
                     if e[1] == RDF.type:
-                        node_text.append(self._get_name(str(e[2])))
+                        node_text.append(get_name(str(e[2])))
                         break
                 else:
                     # I think this should only be literals and external identifiers.
@@ -320,6 +319,30 @@ class AbstractVisualiser:
         else:
             self.node_text_preset = self.add_node_type_labels
 
+    def add_node_literal_labels(self):
+        '''
+        Textual data pertaining to a node are the literal
+        properties held on the node when literals are ingested as attributes.
+        '''
+        if self.node_text_preset == self.add_node_literal_labels:
+            node_text = []
+            graph = self._graph.graph
+            for node,data in self.graph_view.nodes(data=True):
+                # Views keep only the literals of predicates they show, labels
+                # read every literal of the entity from the loaded graph.
+                try:
+                    literals = graph.nodes[graph.get_entity_code(data["key"])].get("literals")
+                except ValueError:
+                    literals = None
+                if not literals:
+                    node_text.append(None)
+                    continue
+                node_text.append(", ".join(f'{get_name(str(p))}: {", ".join(str(o) for o in objects)}'
+                                           for p,objects in literals.items()))
+            return node_text
+        else:
+            self.node_text_preset = self.add_node_literal_labels
+
             
 
     # ---------------------- Pick the node color ----------------------
@@ -463,8 +486,8 @@ class AbstractVisualiser:
         '''
         if self.edge_text_preset == self.add_edge_name_labels:
             edge_names = []
-            for edge in self.graph_view.edges(data=True):
-                edge_names.append(edge[2]["display_name"])
+            for n,v,k,data in self.graph_view.edges(keys=True,data=True):
+                edge_names.append(edge_name(k,data))
             return edge_names
         else:
             self.edge_text_preset = self.add_edge_name_labels
@@ -489,7 +512,7 @@ class AbstractVisualiser:
                     shape = shape_map["no_type"]
                     obj_type = "No Type"
                 else:
-                    obj_type = self._get_name(obj_type[1]["key"])
+                    obj_type = get_name(obj_type[1]["key"])
                     if obj_type in shape_map.keys():
                         shape = shape_map[obj_type]
                     else:
@@ -770,23 +793,3 @@ class AbstractVisualiser:
         if len(f_node_sizes) > 0:
             legend_dict["Node Size"] = f_node_sizes
         return legend_dict
-
-
-    def _get_name(self,subject):
-        split_subject = self._split(subject)
-        if len(split_subject[-1]) == 1 and split_subject[-1].isdigit():
-            return split_subject[-2]
-        elif len(split_subject[-1]) == 3 and _isfloat(split_subject[-1]):
-            return split_subject[-2]
-        else:
-            return split_subject[-1]
-
-    def _split(self,uri):
-        return re.split('#|\/|:', uri)
-        
-def _isfloat(x):
-    try:
-        float(x)
-        return True
-    except ValueError:
-        return False
\ No newline at end of file
@@ -1,9 +1,10 @@
 from visual.abstract_visual import AbstractVisualiser
 from builder.knowledge_builder import KnowledgeBuilder
 from util.color_manager import KGClassPalette
+from util.names import get_name
 
 class KnowledgeVisualiser(AbstractVisualiser):
-    def __init__(self, graph = None):
+    def __init__(self, graph = None, literals_as_attributes = False):
         super().__init__()
         if graph is None:
             self._graph = None
@@ -11,7 +12,7 @@ class KnowledgeVisualiser(AbstractVisualiser):
             self._graph = graph
             self.graph_view = self._graph.graph
         else:
-            self._graph = KnowledgeBuilder(graph)
+            self._graph = KnowledgeBuilder(graph,literals_as_attributes=literals_as_attributes)
             self.graph_view = self._graph.graph
     
 
@@ -115,7 +116,7 @@ class KnowledgeVisualiser(AbstractVisualiser):
                 node_type = self._graph.graph.get_rdf_type(node)
                 if node_type is not None:
                     rdf_type = node_type[1]["key"]
-                    rdf_name = self._get_name(rdf_type)
+                    rdf_name = get_name(rdf_type)
                     colors.append({rdf_name : KGClassPalette[rdf_type].value})
                 else:
                     colors.append({"default" : KGClassPalette.default.value})
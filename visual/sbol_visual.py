@@ -8,6 +8,7 @@ from networkx.algorithms.dag import dag_longest_path
 from rdflib import Literal,URIRef,RDF
 
 from util.sbol_identifiers import identifiers
+from util.names import get_name
 from util.color_manager import StandardPalette
 from util.color_manager import SBOLClassPalette
 from util.color_manager import SBOLTypePalette
@@ -20,7 +21,7 @@ from visual.abstract_visual import AbstractVisualiser
 from builder.sbol_builder import SBOLBuilder
 
 class SBOLVisualiser(AbstractVisualiser):
-    def __init__(self, graph = None):
+    def __init__(self, graph = None, literals_as_attributes = False):
         super().__init__()
         if graph is None:
             self._graph = None
@@ -28,7 +29,7 @@ class SBOLVisualiser(AbstractVisualiser):
             self._graph = graph
             self.graph_view = self._graph.graph
         else:
-            self._graph = SBOLBuilder(graph)
+            self._graph = SBOLBuilder(graph,literals_as_attributes=literals_as_attributes)
             self.graph_view = self._graph.graph
 
     # ---------------------- Set Preset (Sets one or more other settings to focus on a specific thing in the graph) ----------------------
@@ -256,7 +257,7 @@ class SBOLVisualiser(AbstractVisualiser):
                     node_texts.append("No Type")
                     continue
                 else:
-                    obj_name = self._get_name(str(obj_type[1]["key"]))
+                    obj_name = get_name(str(obj_type[1]["key"]))
                     node_texts.append(obj_name)
             
             return node_texts
@@ -275,7 +276,7 @@ class SBOLVisualiser(AbstractVisualiser):
                 node_type = self._graph.graph.get_rdf_type(node)
                 if node_type is not None:
                     rdf_type = node_type[1]["key"]
-                    rdf_name = self._get_name(rdf_type)
+                    rdf_name = get_name(rdf_type)
                     colors.append({rdf_name : SBOLClassPalette[rdf_type].value})
                 else:
                     colors.append({"property" : SBOLClassPalette.default.value})
@@ -411,12 +412,12 @@ class SBOLVisualiser(AbstractVisualiser):
 
             for node,data in self.graph_view.nodes(data=True):
                 if node in color_map.keys():
-                    node_name = self._get_name(data["key"])
+                    node_name = get_name(data["key"])
                     colors.append({node_name : color_map[node]})
                 else:
                     p_node = self._graph._find_nearest_object(node,self.graph_view,
                                                         identifiers.objects.top_levels)
-                    p_node_name = self._get_name(self._graph.nodes[p_node]["key"])
+                    p_node_name = get_name(self._graph.nodes[p_node]["key"])
                     colors.append({p_node_name : color_map[p_node]})
             return colors
         else:
@@ -457,7 +458,7 @@ class SBOLVisualiser(AbstractVisualiser):
             for n,v,e in self.graph_view.edges(keys=True):
                 predicate = e[1]
                 try:
-                    edge_name = self._get_name(predicate)
+                    edge_name = get_name(predicate)
                     edge_color = {edge_name : SBOLPredicatePalette[predicate].value}
                 except KeyError:
                     edge_color = {"default" : SBOLPredicatePalette.default.value}
@@ -493,6 +494,6 @@ class SBOLVisualiser(AbstractVisualiser):
     def _translate_role(self,identifier):
         node_type_name = identifiers.translate_role(identifier)
         if node_type_name is None:
-            node_type_name = self._get_name(identifier)
+            node_type_name = get_name(identifier)
         node_type_name = node_type_name.replace(" ","_").lower()
         return node_type_name
\ No newline at end of file